@@ -0,0 +1,13 @@
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class IsInternalUser(BasePermission):
+  """
+  Allows the users listed in settings.INTERNAL_USER_IDS only.
+  """
+
+  def has_permission(self, request, view):
+    user = request.user
+
+    return bool(user and user.is_authenticated() and user.id in settings.INTERNAL_USER_IDS)
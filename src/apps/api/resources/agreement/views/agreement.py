@@ -1,6 +1,5 @@
 import logging
 
-from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes
 from rest_framework.parsers import FileUploadParser
@@ -92,11 +91,7 @@ def _update_agreement_view(request, agreement_id, _dispatcher=None, _aggregate_r
 
   try:
 
-    try:
-      _aggregate_repo.get(Agreement, agreement_id)
-      is_potential_agreement = False
-    except ObjectDoesNotExist:
-      is_potential_agreement = True
+    is_potential_agreement = not _aggregate_repo.exists(Agreement, agreement_id)
 
     agreement_type = request.data[constants.TYPE_ID]
 
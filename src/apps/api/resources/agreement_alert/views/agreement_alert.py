@@ -0,0 +1,30 @@
+import logging
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from src.apps.api.permissions import IsInternalUser
+from src.domain.agreement import alert_forecast
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['GET'])
+@permission_classes((IsInternalUser,))
+def agreement_alert_forecast_view(request, _alert_forecast=None):
+  if not _alert_forecast: _alert_forecast = alert_forecast
+
+  days = request.query_params.get('days')
+  resolution = request.query_params.get('resolution')
+
+  try:
+    days = int(days) if days else None
+    result = _alert_forecast.forecast(days, resolution)
+  except Exception as e:
+    logger.warn("Error forecasting agreement alerts: {0}".format(request.query_params), exc_info=True)
+    response = Response("Error forecasting agreement alerts %s " % e, status.HTTP_400_BAD_REQUEST)
+  else:
+    response = Response(result, status.HTTP_200_OK)
+
+  return response
@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock
+
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from src.apps.api.permissions import IsInternalUser
+from src.apps.api.resources.agreement_alert.views.agreement_alert import agreement_alert_forecast_view
+from src.domain.agreement import alert_forecast
+
+
+def _get_user(user_id, authenticated=True):
+  user = MagicMock(id=user_id)
+  user.is_authenticated = MagicMock(return_value=authenticated)
+
+  return user
+
+
+def _get_response(user, query_string='', _alert_forecast=None):
+  request = APIRequestFactory().get('/internal/agreement-alerts/forecast/' + query_string)
+  force_authenticate(request, user=user)
+
+  return agreement_alert_forecast_view(request, _alert_forecast=_alert_forecast)
+
+
+@override_settings(INTERNAL_USER_IDS=['internal'])
+def test_is_internal_user_allows_the_internal_users_only():
+  permission = IsInternalUser()
+
+  assert permission.has_permission(MagicMock(user=_get_user('internal')), None)
+  assert not permission.has_permission(MagicMock(user=_get_user('other')), None)
+  assert not permission.has_permission(MagicMock(user=_get_user('internal', authenticated=False)), None)
+  assert not permission.has_permission(MagicMock(user=None), None)
+
+
+@override_settings(INTERNAL_USER_IDS=['internal'])
+def test_agreement_alert_forecast_view_returns_the_forecast():
+  alert_forecast_mock = MagicMock(spec=alert_forecast)
+  alert_forecast_mock.forecast = MagicMock(return_value={'bins': []})
+
+  response = _get_response(_get_user('internal'), '?days=3&resolution=day', alert_forecast_mock)
+
+  assert response.status_code == 200
+  assert response.data == {'bins': []}
+  alert_forecast_mock.forecast.assert_called_once_with(3, 'day')
+
+
+@override_settings(INTERNAL_USER_IDS=['internal'])
+def test_agreement_alert_forecast_view_rejects_bad_arguments():
+  alert_forecast_mock = MagicMock(spec=alert_forecast)
+
+  response = _get_response(_get_user('internal'), '?days=many', alert_forecast_mock)
+
+  assert response.status_code == 400
+  assert not alert_forecast_mock.forecast.called
+
+
+@override_settings(INTERNAL_USER_IDS=['internal'])
+def test_agreement_alert_forecast_view_forbids_other_users():
+  alert_forecast_mock = MagicMock(spec=alert_forecast)
+
+  response = _get_response(_get_user('other'), '', alert_forecast_mock)
+
+  assert response.status_code == 403
+  assert not alert_forecast_mock.forecast.called
@@ -2,6 +2,7 @@ from django.conf.urls import url
 
 from src.apps.api.resources.agreement.views.agreement import agreement_create_view, agreement_modify_view, \
   artifact_modify_view, artifact_create_view
+from src.apps.api.resources.agreement_alert.views.agreement_alert import agreement_alert_forecast_view
 from src.apps.api.resources.agreement_type.views.agreement_type import agreement_type_create_view
 from src.apps.api.resources.asset.views.asset import asset_view
 from src.apps.api.resources.payment.views.checkout import checkout_view
@@ -22,4 +23,5 @@ urlpatterns = [
   url(r'^smart-views/$', smart_view_create_view),
   url(r'^smart-views/(?P<smart_view_id>\w+)/$', smart_view_update_view),
   url(r'^checkout/$', checkout_view),
+  url(r'^internal/agreement-alerts/forecast/$', agreement_alert_forecast_view),
 ]
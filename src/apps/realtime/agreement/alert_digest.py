@@ -0,0 +1,55 @@
+import logging
+from collections import OrderedDict
+
+from src.apps.realtime.agreement import tasks
+from src.libs.common_domain.enqueue_buffer import get_buffer
+
+logger = logging.getLogger(__name__)
+
+
+def add_agreement_alerts(agreement_id, _tasks=None, **kwargs):
+  """
+  Saves the alerts sent for an agreement in firebase. While an `enqueue_buffer` is active, ie: the batches of the alert
+  sweep, of the outbox relay or of the projection runner, the alerts are grouped by user and saved with one write per
+  user when the buffer exits.
+  """
+  if not _tasks: _tasks = tasks
+
+  buffer = get_buffer()
+
+  if buffer is None:
+    _tasks.save_agreement_alerts_in_firebase_task.delay(agreement_id, **kwargs)
+    return
+
+  buffer.digest('agreement alerts', lambda: AlertDigest(_tasks)).add(agreement_id, **kwargs)
+
+
+class AlertDigest(object):
+  def __init__(self, _tasks=None):
+    if not _tasks: _tasks = tasks
+
+    self._tasks = _tasks
+    self.alerts = OrderedDict()
+
+  def add(self, agreement_id, user_id, **kwargs):
+    # in the order sent, merged the way the separate writes would have been
+    self.alerts.setdefault(user_id, []).append((agreement_id, kwargs))
+
+  def flush(self):
+    if not self.alerts:
+      return 0
+
+    alert_count = 0
+
+    for user_id, alerts in self.alerts.items():
+      self._tasks.save_user_alerts_in_firebase_task.delay(user_id, alerts)
+      alert_count += len(alerts)
+
+    write_count = len(self.alerts)
+
+    logger.info("Saving %i agreement alerts in %i firebase writes, %i writes saved",
+                alert_count, write_count, alert_count - write_count)
+
+    self.alerts = OrderedDict()
+
+    return alert_count - write_count
@@ -1,9 +1,9 @@
 from django.dispatch import receiver
 
 from src.domain.agreement.events import AgreementCreated1, AgreementAttrsUpdated1, AgreementOutcomeNoticeAlertSent1, \
-  AgreementOutcomeAlertSent1, AgreementDeleted1, ArtifactDeleted1, ArtifactCreated1
+  AgreementOutcomeAlertSent1, AgreementRenewed1, AgreementDeleted1, ArtifactDeleted1, ArtifactCreated1
 from src.domain.potential_agreement.events import PotentialAgreementCreated1
-from src.apps.realtime.agreement import tasks
+from src.apps.realtime.agreement import tasks, alert_digest
 from src.libs.common_domain.decorators import event_idempotent
 
 @event_idempotent
@@ -17,6 +17,7 @@ def execute_save_agreement_edit_from_pa(**kwargs):
 @event_idempotent
 @receiver(AgreementCreated1.event_signal)
 @receiver(AgreementAttrsUpdated1.event_signal)
+@receiver(AgreementRenewed1.event_signal)
 def save_firebase_agreement(**kwargs):
   event = kwargs['event']
   agreement_id = kwargs['aggregate_id']
@@ -32,7 +33,7 @@ def save_firebase_agreement(**kwargs):
 def agreement_alerts_callback(**kwargs):
   agreement_id = kwargs['aggregate_id']
   event = kwargs['event']
-  tasks.save_agreement_alerts_in_firebase_task.delay(agreement_id, **event.data)
+  alert_digest.add_agreement_alerts(agreement_id, **event.data)
 
 
 @event_idempotent
@@ -55,6 +55,8 @@ def save_agreement_detail_in_firebase(agreement_id, _agreement_type_service=None
   data = {}
 
   _provide_params('execution_date', 'execution-date', data, lambda v: get_timestamp_from_datetime(v), **kwargs)
+  # moved on by every renewal, it's no longer the end of the first term
+  _provide_params('outcome_date', 'outcome-date', data, lambda v: get_timestamp_from_datetime(v), **kwargs)
   _provide_params('term_length_time_amount', 'term-length-time-amount', data, **kwargs)
   _provide_params('agreement_type_id', 'type-name', data,
                   lambda v: _agreement_type_service.get_agreement_type_lookup(v).name, **kwargs)
@@ -89,6 +91,7 @@ def save_user_agreement_in_firebase(agreement_id, _agreement_type_service=None,
   user_id = kwargs['user_id']
 
   _provide_params('execution_date', 'execution-date', data, lambda v: get_timestamp_from_datetime(v), **kwargs)
+  _provide_params('outcome_date', 'outcome-date', data, lambda v: get_timestamp_from_datetime(v), **kwargs)
 
   modification_date = get_timestamp_from_datetime(timezone.now())
   data['modification-date'] = modification_date
@@ -119,6 +122,38 @@ def save_agreement_alerts_in_firebase(agreement_id, name,
   if not _firebase_provider: _firebase_provider = firebase_provider
   client = _firebase_provider.get_firebase_client()
 
+  data = _get_alerts_data(agreement_id, name, outcome_alert_created, outcome_date, outcome_notice_alert_created,
+                          outcome_notice_date)
+
+  result = client.patch('users-alerts/{user_id}'.format(user_id=user_id), data)
+
+  return result
+
+
+def save_user_alerts_in_firebase(user_id, alerts, _firebase_provider=None):
+  """
+  Saves the alerts of many of a user's agreements with a single write. `alerts` is a list of
+  (agreement_id, alert data) with the alert data as in `save_agreement_alerts_in_firebase`.
+  """
+  if not _firebase_provider: _firebase_provider = firebase_provider
+  client = _firebase_provider.get_firebase_client()
+
+  data = {}
+
+  for agreement_id, alert in alerts:
+    data.update(_get_alerts_data(agreement_id, alert['name'],
+                                 alert.get('outcome_alert_created'),
+                                 alert.get('outcome_date'),
+                                 alert.get('outcome_notice_alert_created'),
+                                 alert.get('outcome_notice_date')))
+
+  result = client.patch('users-alerts/{user_id}'.format(user_id=user_id), data)
+
+  return result
+
+
+def _get_alerts_data(agreement_id, name, outcome_alert_created, outcome_date, outcome_notice_alert_created,
+                     outcome_notice_date):
   data = {}
 
   if outcome_notice_alert_created:
@@ -141,9 +176,7 @@ def save_agreement_alerts_in_firebase(agreement_id, name,
       'alert-type': 'outcome'
     }
 
-  result = client.patch('users-alerts/{user_id}'.format(user_id=user_id), data)
-
-  return result
+  return data
 
 
 def delete_agreements_in_firebase(agreement_id, user_id, _firebase_provider=None):
@@ -1,6 +1,6 @@
 import logging
 
-from django_rq import job
+from src.libs.common_domain.enqueue_buffer import job
 
 from src.apps.realtime.agreement import services as realtime_agreement_service
 from src.libs.python_utils.logging.logging_utils import log_wrapper
@@ -48,6 +48,16 @@ def save_agreement_alerts_in_firebase_task(agreement_id, **kwargs):
     return realtime_agreement_service.save_agreement_alerts_in_firebase(agreement_id, **kwargs)
 
 
+@job('default')
+def save_user_alerts_in_firebase_task(user_id, alerts):
+  log_message = (
+    "Update alerts for %i agreements in firebase. user_id: %s ", len(alerts), user_id
+  )
+
+  with log_wrapper(logger.info, *log_message):
+    return realtime_agreement_service.save_user_alerts_in_firebase(user_id, alerts)
+
+
 @job('default')
 def delete_agreement_in_firebase_task(agreement_id, user_id, **kwargs):
   log_message = (
@@ -0,0 +1,72 @@
+import datetime
+from unittest.mock import MagicMock
+
+from pytz import UTC
+
+from src.apps.realtime.agreement import alert_digest, services, tasks
+from src.libs.common_domain.enqueue_buffer import enqueue_buffer
+from src.libs.datetime_utils.datetime_utils import get_timestamp_from_datetime
+
+_outcome_date = datetime.datetime(2016, 1, 1, tzinfo=UTC)
+
+
+def test_alert_digest_saves_the_alerts_of_each_user_with_one_write():
+  tasks_mock = MagicMock(spec=tasks)
+  digest = alert_digest.AlertDigest(tasks_mock)
+
+  digest.add('abc', user_id='ann', name='first', outcome_alert_created=True)
+  digest.add('def', user_id='bob', name='second', outcome_alert_created=True)
+  digest.add('ghi', user_id='ann', name='third', outcome_notice_alert_created=True)
+
+  assert digest.flush() == 1
+  assert [c[0] for c in tasks_mock.save_user_alerts_in_firebase_task.delay.call_args_list] == [
+    ('ann', [('abc', {'name': 'first', 'outcome_alert_created': True}),
+             ('ghi', {'name': 'third', 'outcome_notice_alert_created': True})]),
+    ('bob', [('def', {'name': 'second', 'outcome_alert_created': True})]),
+  ]
+  assert digest.flush() == 0
+
+
+def test_alert_digest_saves_an_agreements_alerts_right_away_without_a_buffer():
+  tasks_mock = MagicMock(spec=tasks)
+
+  alert_digest.add_agreement_alerts('abc', tasks_mock, user_id='ann', name='first')
+
+  tasks_mock.save_agreement_alerts_in_firebase_task.delay.assert_called_once_with('abc', user_id='ann', name='first')
+  assert not tasks_mock.save_user_alerts_in_firebase_task.delay.called
+
+
+def test_alert_digest_groups_the_alerts_of_a_buffer():
+  tasks_mock = MagicMock(spec=tasks)
+
+  with enqueue_buffer('test'):
+    alert_digest.add_agreement_alerts('abc', tasks_mock, user_id='ann', name='first')
+    alert_digest.add_agreement_alerts('def', tasks_mock, user_id='ann', name='second')
+
+    assert not tasks_mock.save_user_alerts_in_firebase_task.delay.called
+
+  tasks_mock.save_user_alerts_in_firebase_task.delay.assert_called_once_with(
+    'ann', [('abc', {'name': 'first'}), ('def', {'name': 'second'})]
+  )
+  assert not tasks_mock.save_agreement_alerts_in_firebase_task.delay.called
+
+
+def test_save_user_alerts_in_firebase_merges_the_alerts_in_one_patch():
+  firebase_provider_mock = MagicMock()
+  client = firebase_provider_mock.get_firebase_client.return_value
+
+  services.save_user_alerts_in_firebase('ann', [
+    ('abc', {'name': 'first', 'outcome_alert_created': True, 'outcome_date': _outcome_date}),
+    ('def', {'name': 'second', 'outcome_notice_alert_created': True, 'outcome_notice_date': _outcome_date}),
+  ], firebase_provider_mock)
+
+  client.patch.assert_called_once_with('users-alerts/ann', {
+    'abc-outcome-alert': {
+      'due-date': get_timestamp_from_datetime(_outcome_date), 'agreement-id': 'abc', 'agreement-name': 'first',
+      'alert-type': 'outcome'
+    },
+    'def-outcome-notice-alert': {
+      'due-date': get_timestamp_from_datetime(_outcome_date), 'agreement-id': 'def', 'agreement-name': 'second',
+      'alert-type': 'outcomeNotice'
+    },
+  })
@@ -1,6 +1,6 @@
 import logging
 
-from django_rq import job
+from src.libs.common_domain.enqueue_buffer import job
 
 from src.apps.realtime.smart_view import services
 from src.libs.python_utils.logging.logging_utils import log_wrapper
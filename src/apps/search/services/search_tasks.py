@@ -1,7 +1,7 @@
 from src.domain.user.models import User
 from src.domain.user.services import user_service
 import logging
-from django_rq import job
+from src.libs.common_domain.enqueue_buffer import job
 from src.libs.python_utils.logging.logging_utils import log_wrapper
 
 logger = logging.getLogger(__name__)
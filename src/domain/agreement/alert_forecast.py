@@ -0,0 +1,126 @@
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from pytz import UTC
+
+from src.domain.agreement.models import AgreementAlert
+
+_resolutions = {
+  'hour': ('h', 24),
+  'day': ('D', 1),
+}
+
+# a date column as whole seconds since the epoch, by database vendor
+_epoch_sql = {
+  'postgresql': 'CAST(FLOOR(EXTRACT(EPOCH FROM {0})) AS BIGINT)',
+  'sqlite': "CAST(strftime('%%s', {0}) AS INTEGER)",
+}
+
+
+def get_resolutions():
+  return sorted(_resolutions)
+
+
+def forecast(days=None, resolution=None, now=None, agreement_alerts=None):
+  """
+  Counts the outcome and notice alerts that come due in every hour, or day, of the next `days` days, to tell ahead of
+  time when the alert sweep needs more workers.
+
+  Only the alerts not sent yet that come due before the end of the forecast are read, as arrays, and binned with
+  `searchsorted` and `bincount`. A bin needs a worker for every
+  AGREEMENT_ALERT_BATCH_SIZE alerts, the bins that need more than AGREEMENT_ALERT_MAX_WORKERS are listed in
+  `scale_before`. Alerts already due are counted apart, in `overdue`.
+  """
+  if not days: days = settings.AGREEMENT_ALERT_FORECAST_DAYS
+  if not resolution: resolution = settings.AGREEMENT_ALERT_FORECAST_RESOLUTION
+  if not now: now = timezone.now()
+  if agreement_alerts is None: agreement_alerts = AgreementAlert.objects.all()
+
+  if days < 1:
+    raise ValueError('Forecast at least one day, not: {0}'.format(days))
+
+  if resolution not in _resolutions:
+    raise ValueError('Unknown resolution: {0}. Use one of: {1}'.format(resolution, ', '.join(get_resolutions())))
+
+  unit, bins_per_day = _resolutions[resolution]
+  bin_count = days * bins_per_day
+
+  # the first bin starts at the beginning of the current hour, or day
+  start = _to_datetime64(now).astype('datetime64[{0}]'.format(unit))
+  edges = (start + np.arange(bin_count + 1)).astype('datetime64[s]')
+
+  outcome, notice = _load_alerts(agreement_alerts, _to_datetime(edges[-1].tolist()))
+
+  outcome_counts, outcome_overdue = _count(outcome, edges)
+  notice_counts, notice_overdue = _count(notice, edges)
+
+  totals = outcome_counts + notice_counts
+  batch_size = settings.AGREEMENT_ALERT_BATCH_SIZE
+  workers = (totals + batch_size - 1) // batch_size
+
+  bin_starts = [_to_datetime(d) for d in edges[:-1].tolist()]
+
+  bins = [
+    {'start': bin_start, 'outcome': o, 'notice': n, 'total': t, 'workers': w}
+    for bin_start, o, n, t, w in zip(bin_starts, outcome_counts.tolist(), notice_counts.tolist(), totals.tolist(),
+                                     workers.tolist())
+  ]
+
+  peak = bins[int(np.argmax(totals))]
+  scale_before = [bins[i]['start'] for i in np.flatnonzero(workers > settings.AGREEMENT_ALERT_MAX_WORKERS).tolist()]
+
+  return {
+    'start': bin_starts[0],
+    'days': days,
+    'resolution': resolution,
+    'overdue': {'outcome': outcome_overdue, 'notice': notice_overdue},
+    'bins': bins,
+    'peak': peak,
+    'scale_before': scale_before,
+  }
+
+
+def _load_alerts(agreement_alerts, end):
+  # an agreement's next alert is never after its pending ones, the index on `due_at` narrows the rows down
+  agreement_alerts = agreement_alerts.filter(due_at__lt=end)
+
+  outcome = _get_pending(agreement_alerts, 'outcome_alert', end)
+  notice = _get_pending(agreement_alerts, 'outcome_notice_alert', end)
+
+  return outcome, notice
+
+
+def _get_pending(agreement_alerts, alert, end):
+  # the alerts from `due_at` on are the ones not sent yet, refer to `services.advance_agreement_alerts_due_at`
+  column = '{0}.{1}'.format(AgreementAlert._meta.db_table, AgreementAlert._meta.get_field(alert + '_date').column)
+
+  # the database hands the dates over as epoch seconds, no date object is built for them
+  epochs = agreement_alerts.filter(**{
+    alert + '_enabled': True, alert + '_created': False, alert + '_date__gte': F('due_at'), alert + '_date__lt': end,
+  }).extra(select={'epoch': _epoch_sql[connection.vendor].format(column)}).values_list('epoch', flat=True)
+
+  return np.array(list(epochs), dtype='int64').astype('datetime64[s]')
+
+
+def _count(dates, edges):
+  bin_count = len(edges) - 1
+
+  # the index of the bin each alert falls in, -1 before the first and bin_count from the end of the last one
+  indexes = np.searchsorted(edges, dates, side='right') - 1
+  in_range = (indexes >= 0) & (indexes < bin_count)
+
+  counts = np.bincount(indexes[in_range], minlength=bin_count)
+  overdue = int(np.count_nonzero(indexes < 0))
+
+  return counts, overdue
+
+
+def _to_datetime64(date):
+  # numpy doesn't take timezone aware dates
+  return np.datetime64(date.astimezone(UTC).replace(tzinfo=None), 's')
+
+
+def _to_datetime(date):
+  return date.replace(tzinfo=UTC)
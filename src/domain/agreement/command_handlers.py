@@ -2,7 +2,7 @@ from django.dispatch import receiver
 from django.utils import timezone
 
 from src.domain.agreement.commands import CreateAgreementFromPotentialAgreement, UpdateAgreementAttrs, \
-  SendAgreementAlerts, DeleteAgreement, DeleteArtifact, CreateArtifact
+  SendAgreementAlerts, SendAgreementAlertsBatch, RenewAgreementsBatch, DeleteAgreement, DeleteArtifact, CreateArtifact
 from src.domain.agreement.entities import Agreement
 from src.libs.common_domain import aggregate_repository
 
@@ -53,6 +53,55 @@ def send_agreement_alerts(_aggregate_repository=None, **kwargs):
   _aggregate_repository.save(ag, version)
 
 
+@receiver(SendAgreementAlertsBatch.command_signal)
+def send_agreement_alerts_batch(_aggregate_repository=None, **kwargs):
+  if not _aggregate_repository: _aggregate_repository = aggregate_repository
+
+  command = kwargs['command']
+
+  ags = _aggregate_repository.get_many(Agreement, command.agreement_ids)
+
+  ags_with_versions = []
+
+  for ag in ags.values():
+    version = ag.version
+
+    ag.send_outcome_alert_if_due()
+    ag.send_outcome_notice_alert_if_due()
+
+    ags_with_versions.append((ag, version))
+
+  alerts_sent = sum(len(ag.uncommitted_events) for ag, _ in ags_with_versions)
+
+  # every alert of the batch is committed, or none is
+  _aggregate_repository.save_many(ags_with_versions)
+
+  return {'agreements': len(ags), 'alerts_sent': alerts_sent}
+
+
+@receiver(RenewAgreementsBatch.command_signal)
+def renew_agreements_batch(_aggregate_repository=None, **kwargs):
+  if not _aggregate_repository: _aggregate_repository = aggregate_repository
+
+  command = kwargs['command']
+
+  ags = _aggregate_repository.get_many(Agreement, command.agreement_ids)
+
+  ags_with_versions = []
+
+  for ag in ags.values():
+    version = ag.version
+
+    ag.renew_if_due(command.now)
+
+    if ag.uncommitted_events:
+      ags_with_versions.append((ag, version))
+
+  _aggregate_repository.save_many(ags_with_versions)
+
+  return {'agreements': len(ags), 'renewed': len(ags_with_versions)}
+
+
 @receiver(DeleteAgreement.command_signal)
 def delete_agreement(_aggregate_repository=None, **kwargs):
   if not _aggregate_repository: _aggregate_repository = aggregate_repository
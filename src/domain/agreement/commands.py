@@ -61,6 +61,24 @@ class SendAgreementAlerts():
   command_signal = CommandSignal()
 
 
+class SendAgreementAlertsBatch():
+  # SendAgreementAlerts for many agreements at once. it isn't sent to any one aggregate.
+  command_signal = CommandSignal()
+
+  @initializer
+  def __init__(self, agreement_ids):
+    pass
+
+
+class RenewAgreementsBatch():
+  # renews the expired auto renewing agreements among the given ones. it isn't sent to any one aggregate.
+  command_signal = CommandSignal()
+
+  @initializer
+  def __init__(self, agreement_ids, now):
+    pass
+
+
 class DeleteAgreement():
   command_signal = CommandSignal()
 
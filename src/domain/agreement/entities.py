@@ -2,12 +2,26 @@ from dateutil.relativedelta import relativedelta
 from django.utils import timezone
 
 from src.domain.agreement.events import AgreementCreated1, AgreementAttrsUpdated1, AgreementOutcomeAlertSent1, \
-  AgreementOutcomeNoticeAlertSent1, AgreementDeleted1, ArtifactDeleted1, ArtifactCreated1
-from src.domain.common.value_objects.time_type import TimeType
+  AgreementOutcomeNoticeAlertSent1, AgreementRenewed1, AgreementDeleted1, ArtifactDeleted1, ArtifactCreated1
+from src.domain.common.value_objects.time_type import get_time_type
 from src.libs.common_domain.aggregate_base import AggregateBase
 
 
 class Agreement(AggregateBase):
+  # 2: the renewed terms are counted, `term_count`
+  snapshot_schema_version = 2
+
+  state_fields = (
+    'id', 'system_created_date', 'user_id', 'artifact_ids', 'is_deleted',
+    'name', 'counterparty', 'description', 'execution_date', 'outcome_date', 'agreement_type_id',
+    'term_length_time_amount', 'term_length_time_type', 'term_count', 'auto_renew', 'duration_details',
+    'outcome_notice_time_amount', 'outcome_notice_time_type', 'outcome_notice_date',
+    'outcome_alert_enabled', 'outcome_alert_time_amount', 'outcome_alert_time_type', 'outcome_alert_date',
+    'outcome_alert_created', 'outcome_alert_expired',
+    'outcome_notice_alert_enabled', 'outcome_notice_alert_time_amount', 'outcome_notice_alert_time_type',
+    'outcome_notice_alert_date', 'outcome_notice_alert_created', 'outcome_notice_alert_expired',
+  )
+
   @classmethod
   def from_attrs(cls, **kwargs):
     ret_val = cls()
@@ -73,11 +87,14 @@ class Agreement(AggregateBase):
     self._validate_args(**kwargs)
 
     execution_date = kwargs.get('execution_date')
+    term_length_time_amount = kwargs.get('term_length_time_amount')
 
+    # a renewed agreement stays in its current term, the outcome date is the end of as many terms as it's been renewed
+    # for
     outcome_date = self._get_outcome_date(
       execution_date,
       kwargs.get('term_length_time_type'),
-      kwargs.get('term_length_time_amount')
+      term_length_time_amount and term_length_time_amount * self.term_count
     )
 
     outcome_alert_date = self._get_outcome_alert_date(
@@ -111,7 +128,8 @@ class Agreement(AggregateBase):
     self._raise_event(AgreementAttrsUpdated1(**new_attrs))
 
   def send_outcome_alert_if_due(self):
-    past_due = timezone.now() >= self.outcome_alert_date
+    # a disabled alert has no date
+    past_due = self.outcome_alert_date and timezone.now() >= self.outcome_alert_date
 
     if past_due and self.outcome_alert_enabled and not self.outcome_alert_created:
       self._raise_event(
@@ -123,7 +141,7 @@ class Agreement(AggregateBase):
       )
 
   def send_outcome_notice_alert_if_due(self):
-    past_due = timezone.now() >= self.outcome_notice_alert_date
+    past_due = self.outcome_notice_alert_date and timezone.now() >= self.outcome_notice_alert_date
 
     if past_due and self.outcome_notice_alert_enabled and not self.outcome_notice_alert_created:
       self._raise_event(
@@ -133,6 +151,56 @@ class Agreement(AggregateBase):
         )
       )
 
+  def renew_if_due(self, now=None):
+    if not now: now = timezone.now()
+
+    expired = self.outcome_date and now >= self.outcome_date
+
+    if not (expired and self.auto_renew and self.term_length_time_amount and not self.is_deleted):
+      return
+
+    # the terms are counted from the execution date, the same as the first outcome date, so the day of the month
+    # doesn't drift. an agreement that wasn't renewed for a while is renewed for as many terms as it takes.
+    terms = self.term_count
+    outcome_date = self.outcome_date
+
+    while outcome_date <= now:
+      terms += 1
+      outcome_date = self._get_outcome_date(
+        self.execution_date,
+        self.term_length_time_type.time_type,
+        self.term_length_time_amount * terms
+      )
+
+    outcome_alert_date = self._get_outcome_alert_date(
+      outcome_date,
+      self.outcome_alert_enabled,
+      self.outcome_alert_time_amount,
+      self.outcome_alert_time_type.time_type
+    )
+
+    outcome_notice_date = self._get_outcome_notice_date(
+      outcome_date,
+      self.outcome_notice_alert_time_type.time_type,
+      self.outcome_notice_time_amount
+    )
+
+    outcome_notice_alert_date = self._get_outcome_notice_alert_date(
+      outcome_notice_date,
+      self.outcome_notice_alert_enabled,
+      self.outcome_notice_alert_time_amount,
+      self.outcome_notice_alert_time_type.time_type
+    )
+
+    self._raise_event(
+      AgreementRenewed1(
+        self.name, self.user_id, outcome_date,
+        outcome_alert_date, self.outcome_alert_enabled,
+        outcome_notice_date,
+        outcome_notice_alert_date, self.outcome_notice_alert_enabled,
+      )
+    )
+
   def mark_deleted(self):
     if self.is_deleted:
       raise Exception("agreement {0} is already deleted".format(self.id))
@@ -176,19 +244,19 @@ class Agreement(AggregateBase):
     self.agreement_type_id = data['agreement_type_id']
     self.counterparty = data['counterparty']
     self.term_length_time_amount = data['term_length_time_amount']
-    self.term_length_time_type = TimeType(data['term_length_time_type'])
+    self.term_length_time_type = get_time_type(data['term_length_time_type'])
     self.auto_renew = data['auto_renew']
     self.outcome_notice_time_amount = data['outcome_notice_time_amount']
-    self.outcome_notice_time_type = TimeType(data['outcome_notice_time_type'])
+    self.outcome_notice_time_type = get_time_type(data['outcome_notice_time_type'])
     self.outcome_notice_date = data['outcome_notice_date']
     self.duration_details = data['duration_details']
     self.outcome_alert_enabled = data['outcome_alert_enabled']
     self.outcome_alert_time_amount = data['outcome_alert_time_amount']
-    self.outcome_alert_time_type = TimeType(data['outcome_alert_time_type'])
+    self.outcome_alert_time_type = get_time_type(data['outcome_alert_time_type'])
     self.outcome_alert_date = data['outcome_alert_date']
     self.outcome_notice_alert_enabled = data['outcome_notice_alert_enabled']
     self.outcome_notice_alert_time_amount = data['outcome_notice_alert_time_amount']
-    self.outcome_notice_alert_time_type = TimeType(data['outcome_notice_alert_time_type'])
+    self.outcome_notice_alert_time_type = get_time_type(data['outcome_notice_alert_time_type'])
     self.outcome_notice_alert_date = data['outcome_notice_alert_date']
 
   def _get_outcome_date(self, execution_date, term_length_time_type,
@@ -197,7 +265,7 @@ class Agreement(AggregateBase):
     # execution date + term length.
     # it's probably safe to assume time_type is always specified.
     if term_length_time_amount:
-      outcome_relative_time_modifier = TimeType(term_length_time_type).time_type_date_format
+      outcome_relative_time_modifier = get_time_type(term_length_time_type).time_type_date_format
       kwargs = {outcome_relative_time_modifier: term_length_time_amount}
       outcome_date = execution_date + relativedelta(**kwargs)
     else:
@@ -212,7 +280,7 @@ class Agreement(AggregateBase):
     # if we have an outcome date specified
     # it's probably safe to assume time_type is always specified
     if outcome_alert_enabled and outcome_date:
-      outcome_relative_time_modifier = TimeType(outcome_alert_time_type).time_type_date_format
+      outcome_relative_time_modifier = get_time_type(outcome_alert_time_type).time_type_date_format
       kwargs = {outcome_relative_time_modifier: outcome_alert_time_amount}
       outcome_alert_date = outcome_date - relativedelta(**kwargs)
     else:
@@ -228,7 +296,7 @@ class Agreement(AggregateBase):
     # if we have an outcome_notice date specified
     # it's probably safe to assume time_type is always specified
     if outcome_notice_alert_enabled and outcome_notice_date:
-      outcome_notice_relative_time_modifier = TimeType(outcome_notice_alert_time_type).time_type_date_format
+      outcome_notice_relative_time_modifier = get_time_type(outcome_notice_alert_time_type).time_type_date_format
       kwargs = {outcome_notice_relative_time_modifier: outcome_notice_alert_time_amount}
       outcome_notice_alert_date = outcome_notice_date - relativedelta(**kwargs)
     else:
@@ -241,7 +309,7 @@ class Agreement(AggregateBase):
                                outcome_notice_time_amount):
     # it's probably safe to assume time_type is always specified.
     if outcome_notice_time_amount and outcome_date:
-      outcome_notice_relative_time_modifier = TimeType(outcome_notice_alert_time_type).time_type_date_format
+      outcome_notice_relative_time_modifier = get_time_type(outcome_notice_alert_time_type).time_type_date_format
       kwargs = {outcome_notice_relative_time_modifier: outcome_notice_time_amount}
       outcome_notice_date = outcome_date - relativedelta(**kwargs)
     else:
@@ -249,8 +317,19 @@ class Agreement(AggregateBase):
 
     return outcome_notice_date
 
+  def _get_term_count(self, outcome_date):
+    # the number of terms from the execution date to the outcome date
+    terms = self.term_count
+
+    while self._get_outcome_date(self.execution_date, self.term_length_time_type.time_type,
+                                 self.term_length_time_amount * terms) < outcome_date:
+      terms += 1
+
+    return terms
+
   def _handle_created_1_event(self, event):
     self.is_deleted = False
+    self.term_count = 1
 
     self.outcome_alert_created = event.outcome_alert_created
     self.outcome_alert_expired = event.outcome_alert_expired
@@ -273,6 +352,17 @@ class Agreement(AggregateBase):
   def _handle_outcome_notice_alert_sent_1_event(self, event):
     self.outcome_notice_alert_created = event.outcome_notice_alert_created
 
+  def _handle_renewed_1_event(self, event):
+    self.term_count = self._get_term_count(event.outcome_date)
+    self.outcome_date = event.outcome_date
+    self.outcome_alert_date = event.outcome_alert_date
+    self.outcome_notice_date = event.outcome_notice_date
+    self.outcome_notice_alert_date = event.outcome_notice_alert_date
+
+    # the alerts of the new term are yet to be sent
+    self.outcome_alert_created = False
+    self.outcome_notice_alert_created = False
+
   def _handle_deleted_1_event(self, event):
     self.is_deleted = True
 
@@ -3,7 +3,8 @@ from django.dispatch import receiver
 # from src.apps.read_model.agreement import created, updated_attrs, outcome_alert_sent, \
 #   outcome_notice_alert_sent
 # from src.apps.realtime.agreement.services import agreement_tasks
-from src.domain.agreement.events import AgreementCreated1, AgreementAttrsUpdated1, AgreementDeleted1
+from src.domain.agreement.events import AgreementCreated1, AgreementAttrsUpdated1, AgreementRenewed1, \
+  AgreementDeleted1
 from src.domain.potential_agreement.events import PotentialAgreementCompleted1
 from src.domain.agreement import tasks
 from src.libs.common_domain.decorators import event_idempotent
@@ -32,6 +33,7 @@ def execute_save_agreement_search(**kwargs):
 @event_idempotent
 @receiver(AgreementCreated1.event_signal)
 @receiver(AgreementAttrsUpdated1.event_signal)
+@receiver(AgreementRenewed1.event_signal)
 def execute_create_agreement_alerts(**kwargs):
   agreement_id = kwargs['aggregate_id']
   event = kwargs['event']
@@ -44,6 +46,20 @@ def execute_create_agreement_alerts(**kwargs):
   )
 
 
+@event_idempotent
+@receiver(AgreementCreated1.event_signal)
+@receiver(AgreementAttrsUpdated1.event_signal)
+@receiver(AgreementRenewed1.event_signal)
+def execute_save_agreement_renewal(**kwargs):
+  agreement_id = kwargs['aggregate_id']
+  event = kwargs['event']
+
+  # only auto renewing agreements are renewed
+  auto_renew = True if isinstance(event, AgreementRenewed1) else event.auto_renew
+
+  tasks.save_agreement_renewal_task.delay(agreement_id, auto_renew, event.outcome_date)
+
+
 @event_idempotent
 @receiver(AgreementDeleted1.event_signal)
 def agreement_delete_callback(**kwargs):
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from src.domain.agreement import alert_forecast
+
+
+class Command(BaseCommand):
+  help = 'Prints the number of agreement alerts coming due by hour, or day, and when to scale the alert workers.'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--days', type=int,
+                        help='Number of days to forecast. Defaults to settings.AGREEMENT_ALERT_FORECAST_DAYS.')
+    parser.add_argument('--resolution', choices=alert_forecast.get_resolutions(),
+                        help='Size of the bins. Defaults to settings.AGREEMENT_ALERT_FORECAST_RESOLUTION.')
+    parser.add_argument('--all', action='store_true', default=False,
+                        help='Print the bins without alerts too.')
+
+  def handle(self, *args, **options):
+    try:
+      result = alert_forecast.forecast(options['days'], options['resolution'])
+    except ValueError as e:
+      raise CommandError(str(e))
+
+    self.stdout.write('overdue: {outcome} outcome, {notice} notice alerts'.format(**result['overdue']))
+
+    for b in result['bins']:
+      if b['total'] or options['all']:
+        self.stdout.write('{0:%Y-%m-%d %H:%M}: {1} outcome, {2} notice alerts, {3} workers'.format(
+          b['start'], b['outcome'], b['notice'], b['workers']))
+
+    peak = result['peak']
+    if peak['total']:
+      self.stdout.write('peak: {0} alerts at {1:%Y-%m-%d %H:%M}'.format(peak['total'], peak['start']))
+
+    for start in result['scale_before']:
+      self.stdout.write('scale the alert workers before {0:%Y-%m-%d %H:%M}'.format(start))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+def populate_due_at(apps, schema_editor):
+  AgreementAlert = apps.get_model('agreement', 'AgreementAlert')
+
+  for alert in AgreementAlert.objects.iterator():
+    dates = []
+
+    if alert.outcome_alert_enabled and not alert.outcome_alert_created and alert.outcome_alert_date:
+      dates.append(alert.outcome_alert_date)
+
+    if (alert.outcome_notice_alert_enabled and not alert.outcome_notice_alert_created and
+          alert.outcome_notice_alert_date):
+      dates.append(alert.outcome_notice_alert_date)
+
+    if dates:
+      AgreementAlert.objects.filter(primary_key=alert.primary_key).update(due_at=min(dates))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agreement', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agreementalert',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_due_at, migrations.RunPython.noop),
+        # most agreements have no alert pending, only the ones that do are indexed
+        migrations.RunSQL(
+            ['CREATE INDEX agreement_agreementalert_due_at ON agreement_agreementalert (due_at) '
+             'WHERE due_at IS NOT NULL'],
+            ['DROP INDEX agreement_agreementalert_due_at'],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agreement', '0002_agreementalert_due_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgreementRenewal',
+            fields=[
+                ('primary_key', models.AutoField(primary_key=True, serialize=False)),
+                ('id', models.CharField(max_length=8, unique=True)),
+                ('outcome_date', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -21,6 +21,17 @@ class AgreementAlert(ReadModel):
   outcome_notice_alert_date = models.DateTimeField(blank=True, null=True)
   outcome_notice_alert_enabled = models.BooleanField()
   outcome_notice_alert_created = models.BooleanField()
+  # the date of the next alert to send, null when none is pending. only the alerts due are indexed, refer to the
+  # 0002 migration. workers claim them with `services.claim_due_agreement_ids`.
+  due_at = models.DateTimeField(blank=True, null=True)
 
   def __str__(self):
     return 'AgreementAlert {id}: {name}'.format(id=self.id)
+
+
+class AgreementRenewal(ReadModel):
+  # the auto renewing agreements only, by the date their term ends. refer to `services.get_expired_agreement_ids`.
+  outcome_date = models.DateTimeField(db_index=True)
+
+  def __str__(self):
+    return 'AgreementRenewal {id}: {outcome_date}'.format(id=self.id, outcome_date=self.outcome_date)
@@ -1,24 +1,7 @@
+from django.db import connection
 from django.utils import timezone
 
-from src.domain.agreement.models import AgreementSearch, AgreementAlert
-
-
-def get_agreements_with_due_outcome_alert():
-  ret_val = AgreementAlert.objects.filter(
-    outcome_alert_date__lte=timezone.now(),
-    outcome_alert_enabled=True,
-    outcome_alert_created=False
-  )
-  return ret_val
-
-
-def get_agreements_with_due_outcome_notice_alert():
-  ret_val = AgreementAlert.objects.filter(
-    outcome_notice_alert_date__lte=timezone.now(),
-    outcome_notice_alert_enabled=True,
-    outcome_notice_alert_created=False
-  )
-  return ret_val
+from src.domain.agreement.models import AgreementSearch, AgreementAlert, AgreementRenewal
 
 
 def get_agreement_search(agreement_id):
@@ -53,11 +36,103 @@ def save_agreement_alert(agreement_id,
     'outcome_notice_alert_created': outcome_notice_alert_created,
   }
 
+  data['due_at'] = _get_due_at(data)
+
   obj, _ = AgreementAlert.objects.update_or_create(id=agreement_id, defaults=data)
 
   return obj
 
 
+def count_due_agreement_alerts(now=None):
+  # the claims read the table, so does the count. the partial index on `due_at` covers it.
+  if not now: now = timezone.now()
+
+  return AgreementAlert.objects.filter(due_at__lte=now).count()
+
+
+def can_claim_concurrently():
+  # SKIP LOCKED is only there from postgresql 9.5 on
+  return connection.vendor == 'postgresql' and connection.pg_version >= 90500
+
+
+def claim_due_agreement_ids(batch_size, now=None, exclude_ids=None):
+  """
+  Locks up to `batch_size` of the agreement alerts that are due and returns their agreement ids. The alerts another
+  worker already locked are skipped rather than waited for, refer to `can_claim_concurrently`. Before postgresql 9.5
+  they're waited for, a single worker should claim at a time.
+
+  Has to run in a transaction, the alerts stay locked until it ends.
+  """
+  if not now: now = timezone.now()
+
+  if connection.vendor == 'postgresql':
+    exclude = 'AND NOT id IN %s ' if exclude_ids else ''
+    params = [now] + ([tuple(exclude_ids)] if exclude_ids else []) + [batch_size]
+
+    sql = (
+      'SELECT id FROM {table} WHERE due_at <= %s {exclude}ORDER BY due_at LIMIT %s FOR UPDATE{skip_locked}'
+        .format(table=AgreementAlert._meta.db_table, exclude=exclude,
+                skip_locked=' SKIP LOCKED' if can_claim_concurrently() else '')
+    )
+
+    with connection.cursor() as cursor:
+      cursor.execute(sql, params)
+      ret_val = [row[0] for row in cursor.fetchall()]
+  else:
+    # no SKIP LOCKED, ie: sqlite, which only ever has one writer anyway
+    alerts = AgreementAlert.objects.filter(due_at__lte=now).exclude(id__in=exclude_ids or [])
+    ret_val = list(alerts.order_by('due_at').values_list('id', flat=True)[:batch_size])
+
+  return ret_val
+
+
+def advance_agreement_alerts_due_at(agreement_ids, now):
+  # every alert due by `now` was just handled, what's left is the alerts due after it
+  for alert in AgreementAlert.objects.filter(id__in=agreement_ids):
+    due_at = _get_due_at(alert.__dict__, now)
+    AgreementAlert.objects.filter(primary_key=alert.primary_key).update(due_at=due_at)
+
+
+def save_agreement_renewal(agreement_id, auto_renew, outcome_date):
+  # only the agreements that could be renewed are kept
+  if auto_renew and outcome_date:
+    AgreementRenewal.objects.update_or_create(id=agreement_id, defaults={'outcome_date': outcome_date})
+  else:
+    AgreementRenewal.objects.filter(id=agreement_id).delete()
+
+
+def get_expired_agreement_ids(batch_size, now=None, after_id=None):
+  """
+  Returns up to `batch_size` of the ids of the auto renewing agreements whose term ended by `now`, ordered by id and
+  starting after `after_id`.
+
+  The renewals are paged by id rather than by date, the read model is updated by the renewed events later on (refer
+  to `event_handlers.execute_save_agreement_renewal`) so an agreement just renewed may still show as expired.
+  """
+  if not now: now = timezone.now()
+
+  renewals = AgreementRenewal.objects.filter(outcome_date__lte=now)
+
+  if after_id:
+    renewals = renewals.filter(id__gt=after_id)
+
+  return list(renewals.order_by('id').values_list('id', flat=True)[:batch_size])
+
+
 def delete_agreement(agreement_id):
+  AgreementRenewal.objects.filter(id=agreement_id).delete()
   get_agreement_alert(agreement_id).delete()
   get_agreement_search(agreement_id).delete()
+
+
+def _get_due_at(alert_data, after=None):
+  dates = []
+
+  for alert in ('outcome_alert', 'outcome_notice_alert'):
+    date = alert_data[alert + '_date']
+    pending = alert_data[alert + '_enabled'] and not alert_data[alert + '_created']
+
+    if pending and date and (after is None or date > after):
+      dates.append(date)
+
+  return min(dates) if dates else None
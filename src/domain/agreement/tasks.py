@@ -1,9 +1,16 @@
 import logging
+import math
+import time
+from contextlib import contextmanager
 
-from django.core.exceptions import ObjectDoesNotExist
-from django_rq import job
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
-from src.domain.agreement.commands import CreateAgreementFromPotentialAgreement, SendAgreementAlerts
+from src.libs.common_domain.enqueue_buffer import job, enqueue_buffer
+
+from src.domain.agreement.commands import CreateAgreementFromPotentialAgreement, SendAgreementAlerts, \
+  SendAgreementAlertsBatch, RenewAgreementsBatch
 from src.domain.agreement.entities import Agreement
 from src.domain.agreement import services
 from src.libs.common_domain import aggregate_repository
@@ -21,53 +28,175 @@ def create_agreement_task(_aggregate_repo=None, _dispatcher=None, **kwargs):
   agreement_id = kwargs['aggregate_id']
 
   # check if already exists - idempotent
-  try:
-
-    # pa and agreements share same id
-    agreement = _aggregate_repo.get(Agreement, agreement_id)
-
+  # pa and agreements share same id.
+  if _aggregate_repo.exists(Agreement, agreement_id):
     logger.debug('Agreement already exists: %s', agreement_id)
 
-    return agreement.id
-
-  except ObjectDoesNotExist:
+    return agreement_id
 
-    log_message = ("Create agreement task for id: %s", agreement_id)
+  log_message = ("Create agreement task for id: %s", agreement_id)
 
-    with log_wrapper(logger.debug, *log_message):
-      data = dict({'id': agreement_id}, **kwargs['event'].data)
-      create_agreement = CreateAgreementFromPotentialAgreement(**data)
+  with log_wrapper(logger.debug, *log_message):
+    data = dict({'id': agreement_id}, **kwargs['event'].data)
+    create_agreement = CreateAgreementFromPotentialAgreement(**data)
 
+    try:
       _dispatcher.send_command(agreement_id, create_agreement)
+    except IntegrityError:
+      # another worker created it since the check, its events hold the stream's first version
+      logger.debug('Agreement already exists: %s', agreement_id)
+
+      return agreement_id
 
 
 @job('default')
 def send_alerts_for_agreements_task():
-  # get list of agreements where the flag is enabled, not created, and date has passed
-  agreement_ids_with_due_outcome_alerts = (
-    services
-      .get_agreements_with_due_outcome_alert()
-      .values_list('id', flat=True)
-    # putting values_list here and not in service becuase my thinking is if the service returns a django object list
-    # then we can just return them. if you look at search_service, the service layer actually calls values_list but
-    # this layer is returning a custom object (it includes count, results, etc).
-  )
-
-  agreement_ids_with_due_outcome_notice_alerts = (
-    services
-      .get_agreements_with_due_outcome_notice_alert()
-      .values_list('id', flat=True)
-  )
-
-  outcome_set = set(agreement_ids_with_due_outcome_alerts)
-  outcome_notice_set = set(agreement_ids_with_due_outcome_notice_alerts)
-  ids = outcome_set.union(outcome_notice_set)
-
-  # the reason i'm doing this in one task is that i'm worried about concurrency conflicts.
-  # if we have a bunch of simultaneous tasks modifying the same instances, we could potentially overwrite bool flags
-  # which would result in multiple emails going out.
-  for ag_id in ids:
-    send_alert_for_agreement_task.delay(ag_id)
+  # alerts are claimed with SKIP LOCKED (refer to `services.claim_due_agreement_ids`) so any number of workers can send
+  # them at once. a worker is started for every batch of alerts due, up to AGREEMENT_ALERT_MAX_WORKERS.
+  due_count = services.count_due_agreement_alerts()
+  batch_size = settings.AGREEMENT_ALERT_BATCH_SIZE
+  max_workers = settings.AGREEMENT_ALERT_MAX_WORKERS if services.can_claim_concurrently() else 1
+
+  worker_count = min(int(math.ceil(due_count / batch_size)), max_workers)
+
+  for _ in range(worker_count):
+    claim_agreement_alerts_task.delay()
+
+  logger.info("Started %i alert workers for %i due agreements", worker_count, due_count)
+
+
+@job('default')
+def claim_agreement_alerts_task(_dispatcher=None):
+  if not _dispatcher: _dispatcher = dispatcher
+
+  start = time.time()
+  batch_size = settings.AGREEMENT_ALERT_BATCH_SIZE
+  report = {'batches': 0, 'agreements': 0, 'alerts_sent': 0}
+  failed_ids = set()
+
+  while True:
+    agreement_ids = []
+
+    try:
+      # the claimed alerts stay locked until their events are committed and their due dates moved on
+      with _batch_transaction(SendAgreementAlertsBatch.__name__):
+        now = timezone.now()
+        agreement_ids = services.claim_due_agreement_ids(batch_size, now, failed_ids)
+
+        if not agreement_ids:
+          break
+
+        # the events are appended last, the event positions stay locked from then until the commit
+        services.advance_agreement_alerts_due_at(agreement_ids, now)
+        responses = _dispatcher.send_command(None, SendAgreementAlertsBatch(agreement_ids))
+
+    except Exception:
+      if not agreement_ids:
+        # nothing was claimed, ie: the database is unavailable. trying again right away would only fail again.
+        raise
+
+      # most likely one of the agreements changed since it was loaded. the batch was rolled back, each agreement gets
+      # its own chance. the aggregate's version check keeps an alert from being sent twice.
+      logger.warn("Error sending alerts for a batch of %i agreements, sending them one by one", len(agreement_ids),
+                  exc_info=True)
+
+      for ag_id in agreement_ids:
+        if not _send_alerts_for_agreement(ag_id, _dispatcher):
+          failed_ids.add(ag_id)
+
+      continue
+
+    batch_report = responses[0][1]
+    report['batches'] += 1
+    report['agreements'] += batch_report['agreements']
+    report['alerts_sent'] += batch_report['alerts_sent']
+
+  report['elapsed'] = time.time() - start
+  report['failed'] = len(failed_ids)
+
+  logger.info("Sent %(alerts_sent)i alerts for %(agreements)i agreements in %(batches)i batches in %(elapsed).2fs, "
+              "%(failed)i failed", report)
+
+  return report
+
+
+def _send_alerts_for_agreement(agreement_id, _dispatcher):
+  try:
+    with _batch_transaction(SendAgreementAlerts.__name__):
+      now = timezone.now()
+      services.advance_agreement_alerts_due_at([agreement_id], now)
+      _dispatcher.send_command(agreement_id, SendAgreementAlerts())
+  except Exception:
+    logger.warn("Error sending alerts for agreement: %s", agreement_id, exc_info=True)
+    return False
+
+  return True
+
+
+@contextmanager
+def _batch_transaction(name):
+  # nothing but the database is written while the batch holds its locks: the jobs its events create are pushed to
+  # redis once it's committed, and dropped if it's rolled back.
+  with enqueue_buffer(name) as buffer:
+    try:
+      with transaction.atomic():
+        yield
+    except Exception:
+      buffer.clear()
+      raise
+
+
+@job('default', timeout=3600)
+def renew_agreements_task(now=None, _dispatcher=None):
+  if not _dispatcher: _dispatcher = dispatcher
+  if not now: now = timezone.now()
+
+  start = time.time()
+  batch_size = settings.AGREEMENT_RENEWAL_BATCH_SIZE
+  report = {'batches': 0, 'agreements': 0, 'renewed': 0, 'failed': 0}
+  after_id = None
+
+  while True:
+    agreement_ids = services.get_expired_agreement_ids(batch_size, now, after_id)
+
+    if not agreement_ids:
+      break
+
+    after_id = agreement_ids[-1]
+
+    try:
+      # every renewal of the batch is committed, or none is
+      with _batch_transaction(RenewAgreementsBatch.__name__):
+        responses = _dispatcher.send_command(None, RenewAgreementsBatch(agreement_ids, now))
+      batch_report = responses[0][1]
+
+    except Exception:
+      logger.warn("Error renewing a batch of %i agreements, renewing them one by one", len(agreement_ids),
+                  exc_info=True)
+
+      batch_report = {'agreements': 0, 'renewed': 0}
+
+      for ag_id in agreement_ids:
+        try:
+          with _batch_transaction(RenewAgreementsBatch.__name__):
+            responses = _dispatcher.send_command(None, RenewAgreementsBatch([ag_id], now))
+        except Exception:
+          logger.warn("Error renewing agreement: %s", ag_id, exc_info=True)
+          report['failed'] += 1
+        else:
+          batch_report['agreements'] += responses[0][1]['agreements']
+          batch_report['renewed'] += responses[0][1]['renewed']
+
+    report['batches'] += 1
+    report['agreements'] += batch_report['agreements']
+    report['renewed'] += batch_report['renewed']
+
+  report['elapsed'] = time.time() - start
+
+  logger.info("Renewed %(renewed)i of %(agreements)i expired agreements in %(batches)i batches in %(elapsed).2fs, "
+              "%(failed)i failed", report)
+
+  return report
 
 
 @job('default')
@@ -106,6 +235,14 @@ def save_agreement_search_task(agreement_id, user_id, name, counterparty, agreem
     return services.save_agreement_search(agreement_id, user_id, name, counterparty, agreement_type_id).id
 
 
+@job('high')
+def save_agreement_renewal_task(agreement_id, auto_renew, outcome_date):
+  log_message = ("Save agreement_renewal task for agreement_id: %s", agreement_id)
+
+  with log_wrapper(logger.info, *log_message):
+    return services.save_agreement_renewal(agreement_id, auto_renew, outcome_date)
+
+
 @job('high')
 def delete_agreement_task(agreement_id):
   log_message = ("Delete agreement_search task for agreement_id: %s", agreement_id)
@@ -0,0 +1,22 @@
+import datetime
+
+from pytz import UTC
+
+from src.domain.agreement.entities import Agreement
+
+
+def get_agreement(id='abc', **kwargs):
+  # executed on 2015-01-01 for a year. its outcome alert is due on 2015-12-31 and its notice alert on 2015-11-29.
+  attrs = dict(
+    id=id, user_id='user_id', artifact_ids=['artifact'], system_created_date=datetime.datetime(2015, 1, 1, tzinfo=UTC),
+    name='name', counterparty='counterparty', description='description',
+    execution_date=datetime.datetime(2015, 1, 1, tzinfo=UTC), agreement_type_id='type',
+    term_length_time_amount=1, term_length_time_type='year', auto_renew=True, duration_details='details',
+    outcome_notice_time_amount=1, outcome_notice_time_type='month', outcome_alert_enabled=True,
+    outcome_alert_time_amount=1, outcome_alert_time_type='day', outcome_notice_alert_enabled=True,
+    outcome_notice_alert_time_amount=2, outcome_notice_alert_time_type='day',
+  )
+  agreement = Agreement.from_attrs(**dict(attrs, **kwargs))
+  agreement.mark_events_as_committed()
+
+  return agreement
@@ -0,0 +1,37 @@
+from contextlib import ExitStack
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.agreement import services, tasks
+from src.libs.common_domain import dispatcher
+
+
+def test_claim_agreement_alerts_task_appends_last(monkeypatch):
+  calls = []
+  monkeypatch.setattr(tasks.transaction, 'atomic', ExitStack)
+  monkeypatch.setattr(services, 'claim_due_agreement_ids', MagicMock(side_effect=[['abc'], []]))
+  monkeypatch.setattr(services, 'advance_agreement_alerts_due_at',
+                      MagicMock(side_effect=lambda ids, now: calls.append('advance')))
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  dispatcher_mock.send_command = MagicMock(
+    side_effect=lambda *args: calls.append('send') or [(None, {'agreements': 1, 'alerts_sent': 2})]
+  )
+
+  report = tasks.claim_agreement_alerts_task(dispatcher_mock)
+
+  # the events are appended last
+  assert calls == ['advance', 'send']
+  assert (report['agreements'], report['alerts_sent'], report['failed']) == (1, 2, 0)
+
+
+def test_claim_agreement_alerts_task_fails_when_nothing_could_be_claimed(monkeypatch):
+  monkeypatch.setattr(tasks.transaction, 'atomic', ExitStack)
+  monkeypatch.setattr(services, 'claim_due_agreement_ids', MagicMock(side_effect=[ValueError(), ['abc'], []]))
+  dispatcher_mock = MagicMock(spec=dispatcher)
+
+  with pytest.raises(ValueError):
+    tasks.claim_agreement_alerts_task(dispatcher_mock)
+
+  assert services.claim_due_agreement_ids.call_count == 1
+  assert not dispatcher_mock.send_command.called
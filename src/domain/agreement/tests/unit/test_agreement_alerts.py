@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.agreement import command_handlers
+from src.domain.agreement.commands import SendAgreementAlertsBatch
+from src.domain.agreement.events import AgreementOutcomeAlertSent1, AgreementOutcomeNoticeAlertSent1
+from src.domain.agreement.tests.agreement_test_obj import get_agreement
+from src.libs.common_domain import aggregate_repository, dispatcher
+
+
+def test_send_agreement_alerts_batch_saves_the_alerts_due_together():
+  due = get_agreement('abc')
+  disabled = get_agreement('def', outcome_alert_enabled=False, outcome_notice_alert_enabled=False)
+  aggregate_repo_mock = MagicMock(spec=aggregate_repository)
+  aggregate_repo_mock.get_many = MagicMock(return_value={'abc': due, 'def': disabled})
+
+  report = command_handlers.send_agreement_alerts_batch(aggregate_repo_mock,
+                                                        command=SendAgreementAlertsBatch(['abc', 'def']))
+
+  assert report == {'agreements': 2, 'alerts_sent': 2}
+  assert [type(e) for e in due.uncommitted_events] == [AgreementOutcomeAlertSent1, AgreementOutcomeNoticeAlertSent1]
+  assert not disabled.uncommitted_events
+  aggregate_repo_mock.save_many.assert_called_once_with([(due, 0), (disabled, 0)])
+
+
+def test_send_agreement_alerts_batch_fails_the_whole_batch():
+  aggregate_repo_mock = MagicMock(spec=aggregate_repository)
+  aggregate_repo_mock.get_many = MagicMock(return_value={'abc': get_agreement('abc'), 'def': get_agreement('def')})
+  aggregate_repo_mock.save_many = MagicMock(side_effect=ValueError())
+
+  with pytest.raises(ValueError):
+    command_handlers.send_agreement_alerts_batch(aggregate_repo_mock, command=SendAgreementAlertsBatch(['abc', 'def']))
+
+  assert aggregate_repo_mock.save_many.call_count == 1
+
+
+def test_send_command_returns_the_batch_report(monkeypatch):
+  aggregate_repo_mock = MagicMock(spec=aggregate_repository)
+  aggregate_repo_mock.get_many = MagicMock(return_value={'abc': get_agreement('abc')})
+  monkeypatch.setattr(command_handlers, 'aggregate_repository', aggregate_repo_mock)
+
+  responses = dispatcher.send_command(None, SendAgreementAlertsBatch(['abc']))
+
+  assert responses == [(command_handlers.send_agreement_alerts_batch, {'agreements': 1, 'alerts_sent': 2})]
+  aggregate_repo_mock.get_many.assert_called_once_with(command_handlers.Agreement, ['abc'])
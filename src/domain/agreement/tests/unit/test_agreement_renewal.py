@@ -0,0 +1,92 @@
+import datetime
+from contextlib import ExitStack
+from unittest.mock import MagicMock
+
+from pytz import UTC
+
+from src.domain.agreement import command_handlers, services, tasks
+from src.domain.agreement.commands import RenewAgreementsBatch
+from src.domain.agreement.events import AgreementRenewed1
+from src.domain.agreement.tests.agreement_test_obj import get_agreement
+from src.libs.common_domain import aggregate_repository, dispatcher
+
+
+def _get_attrs(agreement, **kwargs):
+  attrs = {f: getattr(agreement, f) for f in (
+    'name', 'counterparty', 'description', 'execution_date', 'agreement_type_id', 'term_length_time_amount',
+    'auto_renew', 'duration_details', 'outcome_notice_time_amount', 'outcome_alert_enabled',
+    'outcome_alert_time_amount', 'outcome_notice_alert_enabled', 'outcome_notice_alert_time_amount',
+  )}
+  for f in ('term_length_time_type', 'outcome_notice_time_type', 'outcome_alert_time_type',
+            'outcome_notice_alert_time_type'):
+    attrs[f] = getattr(agreement, f).time_type
+
+  return dict(attrs, **kwargs)
+
+
+def test_agreement_renews_for_as_many_terms_as_it_expired():
+  agreement = get_agreement()
+  agreement.outcome_alert_created = True
+
+  agreement.renew_if_due(datetime.datetime(2018, 2, 1, tzinfo=UTC))
+
+  [event] = agreement.uncommitted_events
+  assert isinstance(event, AgreementRenewed1)
+  assert agreement.outcome_date == datetime.datetime(2019, 1, 1, tzinfo=UTC)
+  assert agreement.outcome_alert_date == datetime.datetime(2018, 12, 31, tzinfo=UTC)
+  assert agreement.term_count == 4
+  assert not agreement.outcome_alert_created
+
+
+def test_agreement_only_renews_expired_auto_renewing_agreements():
+  agreement = get_agreement()
+  agreement.renew_if_due(datetime.datetime(2015, 6, 1, tzinfo=UTC))
+
+  not_renewing = get_agreement(auto_renew=False)
+  not_renewing.renew_if_due(datetime.datetime(2016, 6, 1, tzinfo=UTC))
+
+  assert not agreement.uncommitted_events
+  assert not not_renewing.uncommitted_events
+
+
+def test_agreement_keeps_its_renewed_term_when_updated():
+  agreement = get_agreement()
+  agreement.renew_if_due(datetime.datetime(2016, 6, 1, tzinfo=UTC))
+
+  agreement.update_attrs(**_get_attrs(agreement, name='renamed'))
+
+  assert agreement.outcome_date == datetime.datetime(2017, 1, 1, tzinfo=UTC)
+
+  # a longer term is counted from the execution date for the same number of terms
+  agreement.update_attrs(**_get_attrs(agreement, term_length_time_amount=2))
+
+  assert agreement.outcome_date == datetime.datetime(2019, 1, 1, tzinfo=UTC)
+
+
+def test_renew_agreements_batch_saves_the_renewed_agreements():
+  expired = get_agreement('abc')
+  not_renewing = get_agreement('def', auto_renew=False)
+  aggregate_repo_mock = MagicMock(spec=aggregate_repository)
+  aggregate_repo_mock.get_many = MagicMock(return_value={'abc': expired, 'def': not_renewing})
+
+  command = RenewAgreementsBatch(['abc', 'def'], datetime.datetime(2016, 1, 2, tzinfo=UTC))
+  report = command_handlers.renew_agreements_batch(aggregate_repo_mock, command=command)
+
+  assert report == {'agreements': 2, 'renewed': 1}
+  aggregate_repo_mock.save_many.assert_called_once_with([(expired, 0)])
+
+
+def test_renew_agreements_task_renews_a_failed_batch_one_by_one(monkeypatch):
+  monkeypatch.setattr(services, 'get_expired_agreement_ids', MagicMock(side_effect=[['abc', 'def'], []]))
+  monkeypatch.setattr(tasks.transaction, 'atomic', ExitStack)
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  dispatcher_mock.send_command = MagicMock(side_effect=[
+    Exception(), [(None, {'agreements': 1, 'renewed': 1})], Exception()
+  ])
+
+  report = tasks.renew_agreements_task(datetime.datetime(2016, 1, 2, tzinfo=UTC), dispatcher_mock)
+
+  assert (report['agreements'], report['renewed'], report['failed']) == (1, 1, 1)
+  assert [c[0][1].agreement_ids for c in dispatcher_mock.send_command.call_args_list] == [
+    ['abc', 'def'], ['abc'], ['def']
+  ]
@@ -0,0 +1,61 @@
+import calendar
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from django.test.utils import override_settings
+from pytz import UTC
+
+from src.domain.agreement import alert_forecast
+
+_now = datetime.datetime(2016, 1, 1, 10, 30, tzinfo=UTC)
+
+
+def _get_agreement_alerts(outcome_dates, notice_dates):
+  # the queryset of each kind of alert yields the epoch seconds of its dates
+  def extra(select):
+    dates = outcome_dates if 'outcome_alert_date' in select['epoch'] else notice_dates
+    epochs = [calendar.timegm(d.utctimetuple()) for d in dates]
+    return MagicMock(values_list=MagicMock(return_value=epochs))
+
+  agreement_alerts = MagicMock()
+  agreement_alerts.filter = MagicMock(return_value=agreement_alerts)
+  agreement_alerts.extra = MagicMock(side_effect=extra)
+
+  return agreement_alerts
+
+
+@override_settings(AGREEMENT_ALERT_BATCH_SIZE=2, AGREEMENT_ALERT_MAX_WORKERS=1)
+def test_alert_forecast_counts_the_alerts_due_in_every_bin():
+  agreement_alerts = _get_agreement_alerts(
+    [_now - datetime.timedelta(hours=1), _now, _now + datetime.timedelta(minutes=20)],
+    [_now + datetime.timedelta(minutes=10), _now + datetime.timedelta(hours=2)],
+  )
+
+  result = alert_forecast.forecast(1, 'hour', _now, agreement_alerts)
+
+  agreement_alerts.filter.assert_any_call(due_at__lt=datetime.datetime(2016, 1, 2, 10, tzinfo=UTC))
+  assert result['start'] == datetime.datetime(2016, 1, 1, 10, tzinfo=UTC)
+  assert len(result['bins']) == 24
+  assert result['overdue'] == {'outcome': 1, 'notice': 0}
+  assert result['bins'][0] == {'start': result['start'], 'outcome': 2, 'notice': 1, 'total': 3, 'workers': 2}
+  assert result['bins'][2]['notice'] == 1
+  assert result['peak'] == result['bins'][0]
+  assert result['scale_before'] == [result['start']]
+
+
+def test_alert_forecast_without_alerts():
+  result = alert_forecast.forecast(2, 'day', _now, _get_agreement_alerts([], []))
+
+  assert [b['start'] for b in result['bins']] == [datetime.datetime(2016, 1, 1, tzinfo=UTC),
+                                                  datetime.datetime(2016, 1, 2, tzinfo=UTC)]
+  assert result['peak']['total'] == 0
+  assert not result['scale_before']
+
+
+def test_alert_forecast_rejects_bad_arguments():
+  with pytest.raises(ValueError):
+    alert_forecast.forecast(-1, 'hour', _now, _get_agreement_alerts([], []))
+
+  with pytest.raises(ValueError):
+    alert_forecast.forecast(1, 'week', _now, _get_agreement_alerts([], []))
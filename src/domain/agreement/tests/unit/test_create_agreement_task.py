@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock
+
+from django.db import IntegrityError
+
+from src.domain.agreement import tasks
+from src.libs.common_domain import aggregate_repository, dispatcher
+
+
+def _get_kwargs():
+  event = MagicMock()
+  event.data = {'user_id': 'user_id'}
+
+  return {'aggregate_id': 'abc', 'event': event}
+
+
+def test_create_agreement_task_skips_existing_agreements():
+  aggregate_repo_mock = MagicMock(spec=aggregate_repository)
+  aggregate_repo_mock.exists = MagicMock(return_value=True)
+  dispatcher_mock = MagicMock(spec=dispatcher)
+
+  assert tasks.create_agreement_task(aggregate_repo_mock, dispatcher_mock, **_get_kwargs()) == 'abc'
+  assert not dispatcher_mock.send_command.called
+
+
+def test_create_agreement_task_treats_a_duplicate_agreement_as_existing(monkeypatch):
+  monkeypatch.setattr(tasks, 'CreateAgreementFromPotentialAgreement', MagicMock())
+  aggregate_repo_mock = MagicMock(spec=aggregate_repository)
+  aggregate_repo_mock.exists = MagicMock(return_value=False)
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  dispatcher_mock.send_command = MagicMock(side_effect=IntegrityError())
+
+  assert tasks.create_agreement_task(aggregate_repo_mock, dispatcher_mock, **_get_kwargs()) == 'abc'
+  aggregate_repo_mock.exists.assert_called_once_with(tasks.Agreement, 'abc')
+  assert dispatcher_mock.send_command.call_count == 1
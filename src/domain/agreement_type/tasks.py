@@ -2,7 +2,7 @@ import logging
 
 from django.core.exceptions import ObjectDoesNotExist
 
-from django_rq import job
+from src.libs.common_domain.enqueue_buffer import job
 
 from src.domain.agreement_type import services
 from src.libs.python_utils.logging.logging_utils import log_wrapper
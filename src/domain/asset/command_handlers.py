@@ -1,5 +1,4 @@
 from django.conf import settings
-from django.db import transaction
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -36,9 +35,10 @@ def create_asset_from_file(_aggregate_repository=None, **kwargs):
 
   asset = Asset.from_attrs(**data)
 
-  with transaction.atomic():
-    _aggregate_repository.save(asset, -1)
-    _save_file_to_storage(path, file)
+  # the file is uploaded before the asset's events are appended, appending holds up every other append until it's
+  # committed. a failed save leaves a file that nothing refers to rather than an asset without a file.
+  _save_file_to_storage(path, file)
+  _aggregate_repository.save(asset, -1)
 
   # commands typically shouldn't return an object but we're explicitly calling this function from the API
   # and need the return aggregate
@@ -1,12 +1,9 @@
 from src.libs.common_domain.domain_event import DomainEvent
 from src.libs.common_domain.event_signal import EventSignal
-from src.libs.python_utils.objects.object_utils import initializer
 
 
 class AssetCreated1(DomainEvent):
   event_func_name = 'created_1'
   event_signal = EventSignal()
 
-  @initializer
-  def __init__(self, id, path, content_type, original_name, system_created_date):
-    super().__init__()
+  fields = ('id', 'path', 'content_type', 'original_name', 'system_created_date')
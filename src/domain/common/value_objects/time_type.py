@@ -12,3 +12,16 @@ class TimeType():
   def time_type_date_format(self):
     # basically pluralize
     return '{0}s'.format(self.time_type)
+
+
+_time_types = {}
+
+
+def get_time_type(time_type):
+  # a TimeType per value, shared. aggregates rebuild theirs from every event they apply.
+  ret_val = _time_types.get(time_type)
+
+  if ret_val is None:
+    ret_val = _time_types[time_type] = TimeType(time_type)
+
+  return ret_val
@@ -1,4 +1,4 @@
-from src.domain.common.value_objects.time_type import TimeType
+from src.domain.common.value_objects.time_type import get_time_type
 from src.domain.potential_agreement.events import PotentialAgreementCreated1, PotentialAgreementCompleted1
 from src.libs.common_domain.aggregate_base import AggregateBase
 
@@ -63,17 +63,17 @@ class PotentialAgreement(AggregateBase):
     self.agreement_type_id = data['agreement_type_id']
     self.counterparty = data['counterparty']
     self.term_length_time_amount = data['term_length_time_amount']
-    self.term_length_time_type = TimeType(data['term_length_time_type'])
+    self.term_length_time_type = get_time_type(data['term_length_time_type'])
     self.auto_renew = data['auto_renew']
     self.outcome_notice_time_amount = data['outcome_notice_time_amount']
-    self.outcome_notice_time_type = TimeType(data['outcome_notice_time_type'])
+    self.outcome_notice_time_type = get_time_type(data['outcome_notice_time_type'])
     self.duration_details = data['duration_details']
     self.outcome_alert_enabled = data['outcome_alert_enabled']
     self.outcome_alert_time_amount = data['outcome_alert_time_amount']
-    self.outcome_alert_time_type = TimeType(data['outcome_alert_time_type'])
+    self.outcome_alert_time_type = get_time_type(data['outcome_alert_time_type'])
     self.outcome_notice_alert_enabled = data['outcome_notice_alert_enabled']
     self.outcome_notice_alert_time_amount = data['outcome_notice_alert_time_amount']
-    self.outcome_notice_alert_time_type = TimeType(data['outcome_notice_alert_time_type'])
+    self.outcome_notice_alert_time_type = get_time_type(data['outcome_notice_alert_time_type'])
 
     self.completed = True
 
@@ -1 +1 @@
-__author__ = 'scottc'
+default_app_config = 'src.libs.common_domain.common_domain_config.CommonDomainConfig'
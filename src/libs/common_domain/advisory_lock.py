@@ -0,0 +1,31 @@
+import zlib
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def try_lock(name):
+  """
+  Takes the postgresql advisory lock of `name` for the block, without waiting for it. Yields whether it was taken,
+  the block is expected to do nothing when it wasn't.
+
+  The lock is held by the database session, a process that dies releases it with its connection. Databases without
+  advisory locks, ie: sqlite, always take it, they're only ever used by a single process.
+  """
+  if connection.vendor != 'postgresql':
+    yield True
+    return
+
+  key = zlib.crc32(name.encode('utf-8'))
+
+  with connection.cursor() as cursor:
+    cursor.execute('SELECT pg_try_advisory_lock(%s)', [key])
+    locked = cursor.fetchone()[0]
+
+  try:
+    yield locked
+  finally:
+    if locked:
+      with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
@@ -1,7 +1,45 @@
-from abc import ABC, abstractmethod
+import re
+from abc import ABCMeta, abstractmethod
 
+_handler_name = re.compile(r'^_handle_(\w+)_event$')
+
+
+class AggregateMeta(ABCMeta):
+  """
+  Resolves the event handlers of an aggregate class once, when the class is created, instead of looking them up for
+  every event applied.
+
+  A class that declares `state_fields` gets them as `__slots__`, its instances have no `__dict__` and take less memory.
+  The fields are the attrs set by the event handlers.
+  """
+
+  def __new__(mcs, name, bases, namespace):
+    if 'state_fields' in namespace and '__slots__' not in namespace:
+      namespace['__slots__'] = tuple(namespace['state_fields'])
+
+    cls = super().__new__(mcs, name, bases, namespace)
+
+    cls._event_handlers = {}
+    for attr_name in dir(cls):
+      match = _handler_name.match(attr_name)
+      if match:
+        cls._event_handlers[match.group(1)] = getattr(cls, attr_name)
+
+    # the slots of the class and of its bases, they are saved in snapshots along with the __dict__ if there is one
+    cls._state_slots = tuple(
+      slot for klass in reversed(cls.__mro__) for slot in getattr(klass, '__slots__', ())
+      if slot not in ('_uncommitted_events', '__dict__', '__weakref__')
+    )
+
+    return cls
+
+
+class AggregateBase(metaclass=AggregateMeta):
+  __slots__ = ('_uncommitted_events', 'version')
+
+  # bump this whenever the attrs set by the event handlers change. existing snapshots will then be ignored.
+  snapshot_schema_version = 1
 
-class AggregateBase(ABC):
   def __init__(self):
     self._uncommitted_events = []
     self.version = -1
@@ -25,17 +63,35 @@ class AggregateBase(ABC):
     except:
       raise Exception('The domain event is missing the `event_name` class attr')
 
-    event_func_name = "_handle_{0}_event".format(event_name)
-
-    handle_func = getattr(self, event_func_name, None)
+    handle_func = self._event_handlers.get(event_name)
 
     if not handle_func: raise NotImplementedError("{0} must implement {1}".format(
-      self.__class__.__name__, event_func_name))
+      self.__class__.__name__, "_handle_{0}_event".format(event_name)))
 
-    handle_func(event)
+    handle_func(self, event)
 
     self.version += 1
 
+  def to_snapshot(self):
+    # only the state built from committed events belongs in a snapshot
+    state = dict(getattr(self, '__dict__', {}))
+
+    for slot in self._state_slots:
+      if hasattr(self, slot):
+        state[slot] = getattr(self, slot)
+
+    return state
+
+  @classmethod
+  def from_snapshot(cls, state):
+    # the @classmethod from_attrs allows us to call this empty constructor
+    ret_val = cls()
+
+    for name, value in state.items():
+      setattr(ret_val, name, value)
+
+    return ret_val
+
   @classmethod
   @abstractmethod
   def from_attrs(cls, **kwargs):
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+from src.libs.common_domain import snapshot_store
+
+
+class AggregateCache(object):
+  """
+  An LRU cache of hydrated aggregates, keyed by (aggregate class, aggregate id).
+
+  Aggregates are kept serialized so every `get` hands out a private copy (a command that fails halfway can't leak
+  its changes into the cache) and so the cache can be bounded by the number of bytes it holds.
+
+  An entry is never trusted to be current, it's only a starting point. The caller is expected to apply any events
+  newer than the cached aggregate's version.
+  """
+
+  def __init__(self, max_bytes):
+    self.max_bytes = max_bytes
+    self.hits = 0
+    self.misses = 0
+    self._size = 0
+    self._entries = OrderedDict()
+
+  def get(self, aggregate_class, aggregate_id):
+    key = (aggregate_class, aggregate_id)
+    data = self._entries.get(key)
+
+    if data is None:
+      self.misses += 1
+      return None
+
+    self.hits += 1
+    self._entries.move_to_end(key)
+
+    return snapshot_store.deserialize(aggregate_class, data)
+
+  def put(self, aggregate):
+    if not self.max_bytes:
+      return
+
+    self.invalidate(aggregate.__class__, aggregate.id)
+
+    data = snapshot_store.serialize(aggregate)
+
+    if len(data) > self.max_bytes:
+      return
+
+    self._entries[(aggregate.__class__, aggregate.id)] = data
+    self._size += len(data)
+
+    while self._size > self.max_bytes:
+      _, evicted = self._entries.popitem(last=False)
+      self._size -= len(evicted)
+
+  def invalidate(self, aggregate_class, aggregate_id):
+    data = self._entries.pop((aggregate_class, aggregate_id), None)
+
+    if data is not None:
+      self._size -= len(data)
+
+  def clear(self):
+    self._entries.clear()
+    self._size = 0
+
+  @property
+  def stats(self):
+    return {
+      'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self._size,
+      'max_bytes': self.max_bytes,
+    }
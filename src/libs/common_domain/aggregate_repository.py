@@ -1,45 +1,254 @@
+import logging
+from collections import OrderedDict
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+from src.libs.common_domain import event_store, snapshot_store, shared_aggregate_cache
+from src.libs.common_domain import stream_repository, stream_filter
+from src.libs.common_domain.aggregate_cache import AggregateCache
 
-from src.libs.common_domain import event_store
+logger = logging.getLogger(__name__)
 
+# every gunicorn worker and rq work-horse gets its own
+aggregate_cache = AggregateCache(settings.AGGREGATE_CACHE_MAX_BYTES)
 
-def save(aggregate, expected_version, _event_store=None):
+
+def save(aggregate, expected_version, _event_store=None, _snapshot_store=None, _aggregate_cache=None,
+         _shared_cache=None):
   if not _event_store: _event_store = event_store
+  if not _snapshot_store: _snapshot_store = snapshot_store
+  if not _aggregate_cache: _aggregate_cache = aggregate_cache
+  if not _shared_cache: _shared_cache = shared_aggregate_cache
 
   uncommitted_events = aggregate.uncommitted_events
 
   if uncommitted_events:
     # could happen if someone calls `.save` on an aggregate that performed no commands
 
-    if expected_version >= aggregate.version:
-      raise Exception(
-        'Invalid version number. Make sure to capture the version of the aggregate before acting upon it.')
+    _check_expected_version(aggregate, expected_version)
 
     event_type = _get_event_type_from_instance(aggregate)
 
-    _event_store.save_events(aggregate.id, expected_version, event_type, uncommitted_events)
+    try:
+      _event_store.save_events(aggregate.id, expected_version, event_type, uncommitted_events)
+    except Exception:
+      # most likely a concurrency conflict, whatever we had cached is behind.
+      _invalidate(aggregate, _aggregate_cache, _shared_cache)
+      raise
 
-    aggregate.mark_events_as_committed()
+    _mark_as_saved(aggregate, expected_version, event_type, _snapshot_store, _aggregate_cache, _shared_cache)
 
 
-def get(aggregate_class, aggregate_id, _event_store=None):
+def save_many(aggregates, _event_store=None, _snapshot_store=None, _aggregate_cache=None, _shared_cache=None):
+  """
+  The same as `save` for many aggregates, their events are appended in a single transaction. `aggregates` is a list of
+  (aggregate, expected_version).
+  """
   if not _event_store: _event_store = event_store
+  if not _snapshot_store: _snapshot_store = snapshot_store
+  if not _aggregate_cache: _aggregate_cache = aggregate_cache
+  if not _shared_cache: _shared_cache = shared_aggregate_cache
 
-  events = _event_store.load_events(_get_event_type_from_class(aggregate_class), aggregate_id)
+  aggregates = [(aggregate, expected_version) for aggregate, expected_version in aggregates
+                if aggregate.uncommitted_events]
 
-  # the @classmethod from_attrs allows us to call this empty constructor
-  aggregate_instance = aggregate_class()
+  for aggregate, expected_version in aggregates:
+    _check_expected_version(aggregate, expected_version)
 
-  if not events:
-    raise ObjectDoesNotExist("aggregate doesn't exist: {0}".format(aggregate_id))
+  if not aggregates:
+    return
+
+  streams = [
+    (aggregate.id, expected_version, _get_event_type_from_instance(aggregate), aggregate.uncommitted_events)
+    for aggregate, expected_version in aggregates
+    ]
+
+  try:
+    _event_store.save_events_for_streams(streams)
+  except Exception:
+    for aggregate, _ in aggregates:
+      _invalidate(aggregate, _aggregate_cache, _shared_cache)
+    raise
+
+  for (aggregate, expected_version), (_, _, event_type, _) in zip(aggregates, streams):
+    _mark_as_saved(aggregate, expected_version, event_type, _snapshot_store, _aggregate_cache, _shared_cache)
+
+
+def get(aggregate_class, aggregate_id, _event_store=None, _snapshot_store=None, _aggregate_cache=None,
+        _shared_cache=None):
+  if not _event_store: _event_store = event_store
+  if not _snapshot_store: _snapshot_store = snapshot_store
+  if not _aggregate_cache: _aggregate_cache = aggregate_cache
+  if not _shared_cache: _shared_cache = shared_aggregate_cache
+
+  event_type = _get_event_type_from_class(aggregate_class)
+
+  aggregate_instance = _aggregate_cache.get(aggregate_class, aggregate_id)
+
+  if not aggregate_instance:
+    aggregate_instance = _shared_cache.get(aggregate_class, aggregate_id)
+
+  # whenever the aggregate came from either cache, the shared cache is assumed to be at that same version
+  shared_version = aggregate_instance.version if aggregate_instance else None
+
+  if not aggregate_instance:
+    aggregate_instance = _snapshot_store.load_snapshot(aggregate_class, aggregate_id)
+
+  if aggregate_instance:
+    # only the events raised since the cached copy or snapshot was taken need to be applied
+    events = _event_store.load_events(event_type, aggregate_id, aggregate_instance.version)
+  else:
+    events = _event_store.load_events(event_type, aggregate_id)
+
+    if not events:
+      raise ObjectDoesNotExist("aggregate doesn't exist: {0}".format(aggregate_id))
+
+    # the @classmethod from_attrs allows us to call this empty constructor
+    aggregate_instance = aggregate_class()
 
   for event in events:
     domain_event = _event_store.load_domain_event_from_event_record(event)
     aggregate_instance.apply_event(domain_event)
 
+  if not _in_transaction():
+    _aggregate_cache.put(aggregate_instance)
+
+    if aggregate_instance.version != shared_version:
+      _shared_cache.put(aggregate_instance)
+
   return aggregate_instance
 
 
+def get_many(aggregate_class, aggregate_ids, _event_store=None, _aggregate_cache=None):
+  """
+  Loads many aggregates of the same class, reading the events of up to `AGGREGATE_GET_MANY_BATCH_SIZE` of them per
+  query. Returns a dict by id, the ids without events are left out.
+
+  Only the events newer than the aggregates in this process' cache are read. Snapshots and the shared cache aren't
+  used, they'd cost a query per aggregate.
+  """
+  if not _event_store: _event_store = event_store
+  if not _aggregate_cache: _aggregate_cache = aggregate_cache
+
+  event_type = _get_event_type_from_class(aggregate_class)
+  aggregate_ids = list(OrderedDict.fromkeys(aggregate_ids))
+  batch_size = settings.AGGREGATE_GET_MANY_BATCH_SIZE
+
+  ret_val = {}
+
+  for start in range(0, len(aggregate_ids), batch_size):
+    batch_ids = aggregate_ids[start:start + batch_size]
+    cached = {}
+
+    for aggregate_id in batch_ids:
+      aggregate_instance = _aggregate_cache.get(aggregate_class, aggregate_id)
+
+      if aggregate_instance:
+        cached[aggregate_id] = aggregate_instance
+
+    # ordered by stream and sequence so every stream's events are contiguous
+    events = _event_store.load_events_for_streams(
+      event_type, batch_ids, {aggregate_id: aggregate.version for aggregate_id, aggregate in cached.items()}
+    )
+
+    # the cached aggregates without newer events are current
+    ret_val.update(cached)
+
+    for aggregate_id, stream_events in groupby(events, key=attrgetter('stream_id')):
+      aggregate_instance = cached.get(aggregate_id) or aggregate_class()
+
+      for event in stream_events:
+        domain_event = _event_store.load_domain_event_from_event_record(event)
+        aggregate_instance.apply_event(domain_event)
+
+      ret_val[aggregate_id] = aggregate_instance
+
+      if not _in_transaction():
+        _aggregate_cache.put(aggregate_instance)
+
+  return ret_val
+
+
+def exists(aggregate_class, aggregate_id, use_filter=False, _stream_repository=None, _stream_filter=None):
+  """
+  Whether the aggregate has any events, without loading it.
+
+  `use_filter` lets the stream filter answer when the aggregate doesn't exist, refer to `stream_filter` for when that
+  answer can be wrong.
+  """
+  if not _stream_repository: _stream_repository = stream_repository
+  if not _stream_filter: _stream_filter = stream_filter
+
+  event_type = _get_event_type_from_class(aggregate_class)
+
+  if use_filter and not _stream_filter.might_exist(event_type, aggregate_id):
+    return False
+
+  return _stream_repository.get_version(event_type, aggregate_id) is not None
+
+
+def get_version(aggregate_class, aggregate_id, _stream_repository=None):
+  """
+  The current version of the aggregate, without loading it.
+  """
+  if not _stream_repository: _stream_repository = stream_repository
+
+  version = _stream_repository.get_version(_get_event_type_from_class(aggregate_class), aggregate_id)
+
+  if version is None:
+    raise ObjectDoesNotExist("aggregate doesn't exist: {0}".format(aggregate_id))
+
+  return version
+
+
+def get_cache_stats(_aggregate_cache=None):
+  if not _aggregate_cache: _aggregate_cache = aggregate_cache
+
+  return _aggregate_cache.stats
+
+
+def _check_expected_version(aggregate, expected_version):
+  if expected_version >= aggregate.version:
+    raise Exception(
+      'Invalid version number. Make sure to capture the version of the aggregate before acting upon it.')
+
+
+def _mark_as_saved(aggregate, expected_version, event_type, _snapshot_store, _aggregate_cache, _shared_cache):
+  aggregate.mark_events_as_committed()
+
+  stream_filter.add(event_type, aggregate.id)
+
+  if _in_transaction():
+    # the caller's transaction can still roll the events back, the next load reads them from the event store
+    _aggregate_cache.invalidate(aggregate.__class__, aggregate.id)
+    _shared_cache.invalidate(aggregate.__class__, aggregate.id)
+  else:
+    _aggregate_cache.put(aggregate)
+    _shared_cache.put(aggregate)
+
+  if _snapshot_store.should_take_snapshot(expected_version, aggregate.version):
+    try:
+      _snapshot_store.save_snapshot(aggregate)
+    except Exception:
+      # the events are already committed, a missing snapshot only means a slower load.
+      logger.warn("Error saving snapshot for: %s", aggregate.id, exc_info=True)
+
+
+def _invalidate(aggregate, _aggregate_cache, _shared_cache):
+  _aggregate_cache.invalidate(aggregate.__class__, aggregate.id)
+  _shared_cache.invalidate(aggregate.__class__, aggregate.id)
+
+
+def _in_transaction():
+  # the caches are only written with committed events. an aggregate loaded or saved in a transaction may hold events
+  # that are rolled back with it.
+  return transaction.get_connection().in_atomic_block
+
+
 def _get_event_type_from_instance(aggregate):
   return aggregate.__class__.__name__
 
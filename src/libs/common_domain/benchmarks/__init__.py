@@ -0,0 +1,21 @@
+# micro-benchmarks for the event store. run them as modules so django gets configured first, ie:
+# python -m src.libs.common_domain.benchmarks.event_hydration
+import os
+import timeit
+
+import django
+
+
+def setup():
+  os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.settings.dev_testing")
+  django.setup()
+
+
+def report(name, func, number, repeat=3):
+  # best of `repeat` runs, reported per call
+  best = min(timeit.repeat(func, number=1, repeat=repeat))
+  per_call = best / number * 1000000
+
+  print('{0:<40} {1:>10.2f} us/record {2:>12.0f} records/s'.format(name, per_call, number / best))
+
+  return best
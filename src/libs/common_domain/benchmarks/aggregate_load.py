@@ -0,0 +1,87 @@
+from src.libs.common_domain.benchmarks import setup, report
+
+setup()
+
+from django.db import transaction
+from django.utils import timezone
+
+from src.domain.agreement.entities import Agreement
+from src.domain.agreement.events import AgreementCreated1, AgreementAttrsUpdated1
+from src.libs.common_domain import event_repository, event_service
+from src.libs.common_domain.models import Event
+
+STREAM_ID = 'benchmark'
+
+
+def _get_events(count):
+  now = timezone.now()
+  attrs = dict(
+    name='name', counterparty='counterparty', description='description', execution_date=now, outcome_date=now,
+    agreement_type_id='type', term_length_time_amount=1, term_length_time_type='year', auto_renew=True,
+    outcome_notice_time_amount=1, outcome_notice_time_type='month', outcome_notice_date=now,
+    duration_details='details', outcome_alert_enabled=True, outcome_alert_time_amount=1,
+    outcome_alert_time_type='day', outcome_alert_date=now, outcome_notice_alert_enabled=True,
+    outcome_notice_alert_time_amount=1, outcome_notice_alert_time_type='day', outcome_notice_alert_date=now,
+  )
+
+  events = [AgreementCreated1(
+    id=STREAM_ID, user_id='user_id', artifact_ids=['artifact'], system_created_date=now,
+    outcome_alert_created=False, outcome_alert_expired=False, outcome_notice_alert_created=False,
+    outcome_notice_alert_expired=False, **attrs
+  )]
+  events.extend(AgreementAttrsUpdated1(user_id='user_id', **attrs) for _ in range(count - 1))
+
+  return events
+
+
+def _load(events):
+  aggregate = Agreement()
+
+  for event in events:
+    aggregate.apply_event(event_service.load_domain_event_from_event_record(event))
+
+  return aggregate
+
+
+def _get_models():
+  # the way the stream was read before `EventRecord`s
+  return Event.objects.filter(event_type='Agreement', stream_id=STREAM_ID).order_by('event_sequence', 'id')
+
+
+def _read_models():
+  return [e.event_data for e in _get_models()]
+
+
+def _read_records():
+  return event_repository.get_event_records_for_stream('Agreement', STREAM_ID)
+
+
+def _load_with_models():
+  return _load(_get_models())
+
+
+def _load_with_records():
+  return _load(event_repository.get_event_records_for_stream('Agreement', STREAM_ID))
+
+
+def run(count=10000):
+  # the stream is only there for the benchmark, it's rolled back at the end
+  with transaction.atomic():
+    event_repository.create_events(STREAM_ID, -1, 'Agreement', _get_events(count))
+
+    print('Agreement, {0} events, read'.format(count))
+    models = report('  Event instances', _read_models, count)
+    records = report('  EventRecord tuples', _read_records, count)
+    print('  speedup: {0:.2f}x'.format(models / records))
+
+    # most of a load is parsing the dates of the events
+    print('Agreement, {0} events, read and applied'.format(count))
+    models = report('  Event instances', _load_with_models, count)
+    records = report('  EventRecord tuples', _load_with_records, count)
+    print('  speedup: {0:.2f}x'.format(models / records))
+
+    transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+  run()
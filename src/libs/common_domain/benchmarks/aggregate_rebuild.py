@@ -0,0 +1,97 @@
+from src.libs.common_domain.benchmarks import setup, report
+
+setup()
+
+import tracemalloc
+
+from django.utils import timezone
+
+from src.domain.agreement import entities
+from src.domain.agreement.entities import Agreement
+from src.domain.agreement.events import AgreementCreated1, AgreementAttrsUpdated1
+from src.domain.common.value_objects.time_type import TimeType
+from src.libs.common_domain.aggregate_base import AggregateBase
+
+
+def _get_dict_agreement_class():
+  # Agreement as it was: instances with a __dict__, handlers looked up by name for every event, and new TimeTypes
+  namespace = {
+    k: v for k, v in Agreement.__dict__.items()
+    if k not in ('__slots__', 'state_fields', '_event_handlers', '_state_slots') and k not in Agreement.__slots__
+  }
+
+  def apply_event(self, event):
+    handle_func = getattr(self, "_handle_{0}_event".format(event.__class__.event_func_name), None)
+    handle_func(event)
+    self.version += 1
+
+  namespace['apply_event'] = apply_event
+
+  return type('DictAgreement', (AggregateBase,), namespace)
+
+
+def _get_events(count):
+  now = timezone.now()
+  attrs = dict(
+    name='name', counterparty='counterparty', description='description', execution_date=now, outcome_date=now,
+    agreement_type_id='type', term_length_time_amount=1, term_length_time_type='year', auto_renew=True,
+    outcome_notice_time_amount=1, outcome_notice_time_type='month', outcome_notice_date=now,
+    duration_details='details', outcome_alert_enabled=True, outcome_alert_time_amount=1,
+    outcome_alert_time_type='day', outcome_alert_date=now, outcome_notice_alert_enabled=True,
+    outcome_notice_alert_time_amount=1, outcome_notice_alert_time_type='day', outcome_notice_alert_date=now,
+  )
+
+  events = [AgreementCreated1(
+    id='abcdefgh', user_id='user_id', artifact_ids=['artifact'], system_created_date=now,
+    outcome_alert_created=False, outcome_alert_expired=False, outcome_notice_alert_created=False,
+    outcome_notice_alert_expired=False, **attrs
+  )]
+  events.extend(AgreementAttrsUpdated1(user_id='user_id', **attrs) for _ in range(count - 1))
+
+  return events
+
+
+def _rebuild(aggregate_class, events):
+  aggregate = aggregate_class()
+
+  for event in events:
+    aggregate.apply_event(event)
+
+  return aggregate
+
+
+def _measure(aggregate_class, events, count):
+  tracemalloc.start()
+  aggregates = [_rebuild(aggregate_class, events) for _ in range(count)]
+  size, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  del aggregates
+
+  return size / count
+
+
+def run(count=10000, aggregate_count=1000):
+  dict_agreement = _get_dict_agreement_class()
+  events = _get_events(count)
+
+  print('Agreement, {0} events'.format(count))
+
+  get_time_type = entities.get_time_type
+  entities.get_time_type = TimeType
+
+  try:
+    before = report('  __dict__, getattr, new TimeTypes', lambda: _rebuild(dict_agreement, events), count)
+    before_size = _measure(dict_agreement, events[:1], aggregate_count)
+  finally:
+    entities.get_time_type = get_time_type
+
+  after = report('  slots, handler table, shared TimeTypes', lambda: _rebuild(Agreement, events), count)
+  after_size = _measure(Agreement, events[:1], aggregate_count)
+
+  print('  speedup: {0:.2f}x'.format(before / after))
+  print('  memory per aggregate: {0:.0f} bytes before, {1:.0f} bytes after'.format(before_size, after_size))
+
+
+if __name__ == '__main__':
+  run()
@@ -0,0 +1,65 @@
+from src.libs.common_domain.benchmarks import setup, report
+
+setup()
+
+import gc
+import tracemalloc
+
+from django.utils import timezone
+
+from src.domain.agreement.events import AgreementCreated1
+from src.libs.common_domain.domain_event import DomainEvent
+from src.libs.python_utils.objects.object_utils import initializer
+
+
+def _get_initializer_class(event_class):
+  # the event as it was: an `initializer` constructor and a __dict__
+  source = 'def __init__(self, {0}):\n  pass\n'.format(', '.join(event_class.fields))
+  code = {}
+  exec(source, {}, code)
+
+  return type('Initializer' + event_class.__name__, (DomainEvent,), {'__init__': initializer(code['__init__'])})
+
+
+def _get_data(event_class):
+  # what the hydrator hands the constructor, the dates already parsed
+  now = timezone.now()
+  return {f: now if f.endswith('_date') else f for f in event_class.fields}
+
+
+def _build(event_class, data, count):
+  for _ in range(count):
+    event_class(**data)
+
+
+def _measure(event_class, data, count):
+  gc.collect()
+  tracemalloc.start()
+  events = [event_class(**data) for _ in range(count)]
+  size, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  del events
+
+  return size / count
+
+
+def run(count=1000000, retained_count=100000):
+  event_class = AgreementCreated1
+  legacy_class = _get_initializer_class(event_class)
+  data = _get_data(event_class)
+
+  print('{0}, {1} fields, {2} events'.format(event_class.__name__, len(event_class.fields), count))
+
+  before = report('  initializer, __dict__', lambda: _build(legacy_class, data, count), count, repeat=1)
+  after = report('  generated __init__, slots', lambda: _build(event_class, data, count), count, repeat=1)
+
+  before_size = _measure(legacy_class, data, retained_count)
+  after_size = _measure(event_class, data, retained_count)
+
+  print('  speedup: {0:.2f}x'.format(before / after))
+  print('  allocated per event: {0:.0f} bytes before, {1:.0f} bytes after'.format(before_size, after_size))
+
+
+if __name__ == '__main__':
+  run()
@@ -0,0 +1,63 @@
+from src.libs.common_domain.benchmarks import setup, report
+
+setup()
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+import json
+
+from src.domain.agreement.events import AgreementCreated1, ArtifactCreated1
+from src.libs.common_domain import event_service, event_registry
+from src.libs.common_domain.models import Event
+from src.libs.python_utils.types.type_utils import load_object
+
+
+def _get_records(event, count):
+  # what the json field hands back: dates are strings
+  event_data = json.loads(json.dumps(event.data, cls=DjangoJSONEncoder))
+  event_name = event_registry.get_event_name(event.__class__)
+
+  return [
+    Event(stream_id='abcdefgh', event_type='Agreement', event_name=event_name, event_sequence=i,
+          event_data=dict(event_data))
+    for i in range(count)
+    ]
+
+
+def _load_with_reflection(records):
+  # the path used before the registry: import the event class and inspect every key of every record
+  for record in records:
+    load_object(record.event_name).hydrate(**record.event_data)
+
+
+def _load_with_registry(records):
+  for record in records:
+    event_service.load_domain_event_from_event_record(record)
+
+
+def run(count=10000):
+  event_registry.build_registry()
+  now = timezone.now()
+
+  events = [
+    # 29 fields, 6 of them dates. parsing the dates is most of the cost.
+    AgreementCreated1(
+      'abcdefgh', 'name', 'counterparty', 'description', 'user_id', ['artifact'], now, now, 'type', 1, 'year', True,
+      1, 'month', now, 'details', True, 1, 'day', now, False, False, True, 1, 'day', now, False, False, now
+    ),
+    # no dates, what's left is the per record reflection
+    ArtifactCreated1('artifact', ['artifact'], 'user_id'),
+  ]
+
+  for event in events:
+    records = _get_records(event, count)
+    print(event.__class__.__name__)
+
+    reflection = report('  load_object + DomainEvent.hydrate', lambda: _load_with_reflection(records), count)
+    registry = report('  event_registry hydrator', lambda: _load_with_registry(records), count)
+
+    print('  speedup: {0:.2f}x'.format(reflection / registry))
+
+
+if __name__ == '__main__':
+  run()
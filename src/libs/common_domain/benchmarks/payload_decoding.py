@@ -0,0 +1,54 @@
+from src.libs.common_domain.benchmarks import setup, report
+
+setup()
+
+import json
+
+from django.utils import timezone
+from jsonfield.encoder import JSONEncoder
+
+from src.domain.agreement.events import AgreementCreated1, ArtifactCreated1
+from src.libs.common_domain import event_registry, event_service, payload_codec
+from src.libs.common_domain.event_repository import EventRecord, _load_payload
+
+
+def _dumps(value):
+  # the column as jsonfield writes it
+  return json.dumps(value, cls=JSONEncoder, separators=(',', ':'))
+
+
+def _load(rows):
+  # what replay does per event: decode the column and build the domain event
+  for event_name, event_data in rows:
+    record = EventRecord(1, 'abcdefgh', 'Agreement', 0, event_name, _load_payload(event_name, event_data, None))
+    event_service.load_domain_event_from_event_record(record)
+
+
+def run(count=100000):
+  event_registry.build_registry()
+  now = timezone.now()
+
+  events = [
+    AgreementCreated1(
+      'abcdefgh', 'name', 'counterparty', 'description', 'user_id', ['artifact'], now, now, 'type', 1, 'year', True,
+      1, 'month', now, 'details', True, 1, 'day', now, False, False, True, 1, 'day', now, False, False, now
+    ),
+    ArtifactCreated1('artifact', ['artifact'], 'user_id'),
+  ]
+
+  for event in events:
+    event_name = event_registry.get_event_name(event.__class__)
+
+    legacy_rows = [(event_name, _dumps(event.data))] * count
+    codec_rows = [(event_name, _dumps(payload_codec.encode(event.data)))] * count
+
+    print(event.__class__.__name__)
+
+    legacy = report('  legacy payload, dateutil', lambda: _load(legacy_rows), count)
+    codec = report('  payload codec', lambda: _load(codec_rows), count)
+
+    print('  speedup: {0:.2f}x'.format(legacy / codec))
+
+
+if __name__ == '__main__':
+  run()
@@ -0,0 +1,35 @@
+import hashlib
+import math
+
+
+class BloomFilter(object):
+  """
+  A set that answers "definitely not in it" or "probably in it" in a fixed amount of memory.
+
+  Sized for `capacity` keys with a false positive rate of `error_rate`, ie: 1M keys at 1% is about 1.2MB.
+  """
+
+  def __init__(self, capacity, error_rate=0.01):
+    self.capacity = capacity
+    self.error_rate = error_rate
+    self.bit_count = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    self.hash_count = max(1, int(round(self.bit_count / capacity * math.log(2))))
+    self.bits = bytearray((self.bit_count + 7) // 8)
+    self.count = 0
+
+  def add(self, key):
+    for index in self._get_indexes(key):
+      self.bits[index >> 3] |= 1 << (index & 7)
+
+    self.count += 1
+
+  def __contains__(self, key):
+    return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._get_indexes(key))
+
+  def _get_indexes(self, key):
+    # double hashing, the k indexes are derived from the two halves of a single digest
+    digest = hashlib.md5(key.encode('utf-8')).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+
+    return ((h1 + i * h2) % self.bit_count for i in range(self.hash_count))
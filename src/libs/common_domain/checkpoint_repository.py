@@ -0,0 +1,20 @@
+from django.utils import timezone
+
+from src.libs.common_domain.models import Checkpoint
+
+
+def get_position(name, default=0):
+  checkpoint = Checkpoint.objects.filter(name=name).first()
+
+  return checkpoint.position if checkpoint else default
+
+
+def save_position(name, position):
+  checkpoint, _ = Checkpoint.objects.update_or_create(
+    name=name, defaults=dict(position=position, system_modified_date=timezone.now())
+  )
+  return checkpoint
+
+
+def delete_checkpoint(name):
+  Checkpoint.objects.filter(name=name).delete()
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class CommonDomainConfig(AppConfig):
+  name = 'src.libs.common_domain'
+
+  def ready(self):
+    from src.libs.common_domain import event_registry
+
+    # this app is installed last so every domain app has imported its events by now
+    event_registry.build_registry()
+
+    # registers the upcasters of every app, refer to `upcaster_registry`
+    autodiscover_modules('upcasters')
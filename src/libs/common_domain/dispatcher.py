@@ -1,14 +1,20 @@
 import logging
 
+from src.libs.common_domain.enqueue_buffer import enqueue_buffer
+
 logger = logging.getLogger(__name__)
 
 
 # these two methods should probably be split. their signatures may change throughout the future.
 def send_command(aggregate_id, command):
   command_data = {'aggregate_id': aggregate_id, 'command': command}
-  command.__class__.command_signal.send(None, **command_data)
+
+  # the jobs of the event handlers are pushed to redis together once the command is handled
+  with enqueue_buffer(command.__class__.__name__):
+    return command.__class__.command_signal.send(None, **command_data)
 
 
-def publish_event(aggregate_id, event, version):
+def publish_event(aggregate_id, event, version, receivers=None, robust=False, exclude_receivers=None):
   event_data = {'aggregate_id': aggregate_id, 'event': event, 'version': version}
-  event.__class__.event_signal.send(None, **event_data)
+  return event.__class__.event_signal.send(None, only_receivers=receivers, exclude_receivers=exclude_receivers,
+                                           robust=robust, **event_data)
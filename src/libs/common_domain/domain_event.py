@@ -1,4 +1,5 @@
-from abc import ABC
+from abc import ABCMeta
+from keyword import iskeyword
 
 from src.libs.datetime_utils.datetime_utils import get_date_from_string
 
@@ -12,12 +13,66 @@ def normalize(k, v):
   return k, value
 
 
-class DomainEvent(ABC):
+class DomainEventMeta(ABCMeta):
+  """
+  Builds the events that declare their `fields`: the fields are the event's `__slots__`, and its `__init__`, `to_dict`
+  and `__reduce__` are generated once, when the class is created, as plain code assigning and reading each field.
+  """
+
+  def __new__(mcs, name, bases, namespace):
+    fields = namespace.get('fields')
+
+    if fields is not None:
+      fields = namespace['fields'] = tuple(fields)
+
+      for field in fields:
+        if not field.isidentifier() or iskeyword(field) or field.startswith('_'):
+          raise TypeError('{0} has an invalid field name: {1}'.format(name, field))
+
+      namespace.setdefault('__slots__', fields)
+
+      for func_name, source in _get_sources(fields).items():
+        if func_name not in namespace:
+          code = {}
+          exec(source, {}, code)
+          code[func_name].__qualname__ = '{0}.{1}'.format(name, func_name)
+          namespace[func_name] = code[func_name]
+
+    return super().__new__(mcs, name, bases, namespace)
+
+
+class DomainEvent(metaclass=DomainEventMeta):
+  __slots__ = ()
+
+  # the names of the event's fields, in the order of its constructor's params. events that don't declare them set
+  # their attrs in their own __init__.
+  fields = None
+
   @property
   def data(self):
-    return self.__dict__
+    if self.fields is None:
+      return self.__dict__
+
+    return self.to_dict()
+
+  def to_dict(self):
+    return dict(self.__dict__)
 
   @classmethod
   def hydrate(cls, **kwargs):
     hydrated_data = dict([normalize(k, v) for k, v in kwargs.items()])
     return cls(**hydrated_data)
+
+
+def _get_sources(fields):
+  params = ''.join(', ' + f for f in fields)
+  assignments = ''.join('\n  self.{0} = {0}'.format(f) for f in fields) or '\n  pass'
+  items = ', '.join("'{0}': self.{0}".format(f) for f in fields)
+  values = ''.join('self.{0}, '.format(f) for f in fields)
+
+  return {
+    '__init__': 'def __init__(self{0}):{1}\n'.format(params, assignments),
+    'to_dict': 'def to_dict(self):\n  return {{{0}}}\n'.format(items),
+    # slotted instances have no __dict__ to pickle, ie: when an event is passed to a job
+    '__reduce__': 'def __reduce__(self):\n  return self.__class__, ({0})\n'.format(values),
+  }
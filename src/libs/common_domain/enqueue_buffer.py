@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+import django_rq
+from rq.job import JobStatus
+from rq.utils import utcnow
+from rq.worker import DEFAULT_RESULT_TTL
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def job(func_or_queue, timeout=None, result_ttl=DEFAULT_RESULT_TTL):
+  """
+  The same as django_rq's job decorator, except that `.delay` only collects the job while an `enqueue_buffer` is
+  active, the jobs are pushed to redis when the buffer is flushed, and that it runs the job right away while
+  `run_inline` is active.
+  """
+  if callable(func_or_queue):
+    return job('default')(func_or_queue)
+
+  queue_name = func_or_queue
+
+  def decorator(func):
+    func = django_rq.job(queue_name, timeout=timeout, result_ttl=result_ttl)(func)
+    enqueue = func.delay
+
+    @wraps(enqueue)
+    def delay(*args, **kwargs):
+      if getattr(_local, 'inline', False) and 'depends_on' not in kwargs:
+        # the jobs this one creates are enqueued as usual
+        _local.inline = False
+        try:
+          return func(*args, **kwargs)
+        except Exception:
+          logger.warn("Error running %s inline, enqueuing it instead", func.__name__, exc_info=True)
+        finally:
+          _local.inline = True
+
+      buffer = getattr(_local, 'buffer', None)
+
+      # dependent jobs need the state of their dependency at enqueue time
+      if buffer is None or 'depends_on' in kwargs:
+        return enqueue(*args, **kwargs)
+
+      return buffer.add(django_rq.get_queue(queue_name), func, args, kwargs, timeout, result_ttl)
+
+    func.delay = delay
+    return func
+
+  return decorator
+
+
+@contextmanager
+def enqueue_buffer(name):
+  """
+  Collects the jobs created with `.delay` in the block and pushes them to redis when it exits, with a single pipeline
+  per connection. Nested blocks are flushed by the outermost one.
+  """
+  if getattr(_local, 'buffer', None) is not None:
+    yield _local.buffer
+    return
+
+  buffer = _local.buffer = EnqueueBuffer()
+
+  try:
+    yield buffer
+  finally:
+    try:
+      # the jobs the digests create join the buffer
+      buffer.flush_digests()
+    finally:
+      _local.buffer = None
+
+    # without the buffer the jobs created before an error would have been enqueued already, so they still are
+    buffer.flush(name)
+
+
+def get_buffer():
+  """
+  Returns the active `EnqueueBuffer`, if any.
+  """
+  return getattr(_local, 'buffer', None)
+
+
+@contextmanager
+def run_inline():
+  """
+  Runs the jobs created with `.delay` in the block right away, in this process. A job that fails is logged and
+  enqueued as usual instead, so it fails, and is retried, on its own.
+  """
+  previous = getattr(_local, 'inline', False)
+  _local.inline = True
+
+  try:
+    yield
+  finally:
+    _local.inline = previous
+
+
+class EnqueueBuffer(object):
+  def __init__(self):
+    self.jobs = []
+    self.digests = OrderedDict()
+
+  def add(self, queue, func, args, kwargs, timeout, result_ttl):
+    job = queue.job_class.create(
+      func, args, kwargs, connection=queue.connection, result_ttl=result_ttl, status=JobStatus.QUEUED,
+      timeout=timeout or queue._default_timeout, origin=queue.name
+    )
+
+    self.jobs.append((queue, job))
+    return job
+
+  def digest(self, name, factory):
+    """
+    Returns the digest registered under `name`, creating it with `factory` on first use. A digest collects work to
+    merge it, its `flush` is called before the buffer is flushed.
+    """
+    if name not in self.digests:
+      self.digests[name] = factory()
+
+    return self.digests[name]
+
+  def clear(self):
+    """
+    Drops the jobs and digests collected so far, ie: when the transaction that created them was rolled back.
+    """
+    self.jobs = []
+    self.digests.clear()
+
+  def flush_digests(self):
+    while self.digests:
+      _, digest = self.digests.popitem(last=False)
+      digest.flush()
+
+  def flush(self, name):
+    if not self.jobs:
+      return
+
+    start = time.time()
+    pipelines = {}
+
+    for queue, job in self.jobs:
+      # a synchronous queue (ie: tests) runs the job instead of storing it
+      if not queue._async:
+        queue.enqueue_job(job)
+        continue
+
+      connection_id = id(queue.connection)
+      if connection_id not in pipelines:
+        pipelines[connection_id] = queue.connection._pipeline()
+
+      pipeline = pipelines[connection_id]
+      pipeline.sadd(queue.redis_queues_keys, queue.key)
+
+      job.enqueued_at = utcnow()
+      if job.timeout is None:
+        job.timeout = queue.DEFAULT_TIMEOUT
+
+      job.save(pipeline=pipeline)
+      queue.push_job_id(job.id, pipeline=pipeline)
+
+    for pipeline in pipelines.values():
+      pipeline.execute()
+
+    logger.info("Enqueued %i jobs for %s in %.1fms", len(self.jobs), name, (time.time() - start) * 1000)
+
+    self.jobs = []
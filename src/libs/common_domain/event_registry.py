@@ -0,0 +1,109 @@
+import inspect
+
+from src.libs.common_domain import upcaster_registry
+from src.libs.common_domain.domain_event import DomainEvent
+from src.libs.datetime_utils.datetime_utils import get_date_from_string
+from src.libs.python_utils.types.type_utils import load_object
+
+_hydrators = {}
+
+
+class EventHydrator(object):
+  """
+  Builds domain events of a single class from stored event data.
+
+  Which fields hold dates is worked out once, from the event's constructor, instead of inspecting every key of every
+  record.
+  """
+
+  def __init__(self, event_class):
+    self.event_class = event_class
+
+    field_names = _get_field_names(event_class)
+
+    if field_names is None:
+      # the constructor accepts anything so we can't know the fields up front
+      self.date_fields = None
+    else:
+      self.date_fields = tuple(f for f in field_names if f.endswith('_date'))
+
+  def build(self, event_data):
+    # data decoded by the payload codec already holds its dates
+    return self.event_class(**event_data)
+
+  def hydrate(self, event_data):
+    # legacy payloads, the dates are strings
+    if self.date_fields is None:
+      return self.event_class.hydrate(**event_data)
+
+    hydrated_data = dict(event_data)
+
+    for field in self.date_fields:
+      value = hydrated_data.get(field)
+      if value:
+        hydrated_data[field] = get_date_from_string(value)
+
+    return self.event_class(**hydrated_data)
+
+
+def get_event_name(event_class):
+  return event_class.__module__ + '.' + event_class.__name__
+
+
+def register(event_class):
+  hydrator = EventHydrator(event_class)
+  _hydrators[get_event_name(event_class)] = hydrator
+  return hydrator
+
+
+def build_registry():
+  for event_class in _get_subclasses(DomainEvent):
+    register(event_class)
+
+
+def get_hydrator(event_name):
+  hydrator = _hydrators.get(event_name)
+
+  if not hydrator:
+    # an event whose module wasn't imported when the registry was built
+    hydrator = register(load_object(event_name))
+
+  return hydrator
+
+
+def get_event_class(event_name):
+  return get_hydrator(event_name).event_class
+
+
+def get_event_names_for_receivers(receivers):
+  # the names of the events whose signal any of the receivers is connected to
+  ret_val = []
+
+  for event_name, hydrator in sorted(_hydrators.items()):
+    live_receivers = hydrator.event_class.event_signal._live_receivers(None)
+
+    if any(r in live_receivers for r in receivers):
+      ret_val.append(event_name)
+
+  # the events whose rows haven't been upcast yet are loaded as the events the receivers handle
+  ret_val.extend(n for n in upcaster_registry.get_source_event_names(ret_val) if n not in ret_val)
+
+  return ret_val
+
+
+def _get_subclasses(cls):
+  for subclass in cls.__subclasses__():
+    yield subclass
+    yield from _get_subclasses(subclass)
+
+
+def _get_field_names(event_class):
+  if event_class.fields is not None:
+    return list(event_class.fields)
+
+  parameters = list(inspect.signature(event_class.__init__).parameters.values())[1:]
+
+  if any(p.kind in (p.VAR_KEYWORD, p.VAR_POSITIONAL) for p in parameters):
+    return None
+
+  return [p.name for p in parameters]
@@ -1,33 +1,234 @@
+import operator
+from collections import namedtuple
+from functools import reduce
+
+from django.conf import settings
 from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from src.libs.common_domain import payload_codec
+from src.libs.common_domain.event_registry import get_event_class, get_event_name
+from src.libs.common_domain.models import Event, EventPosition, OutboxEvent, Stream
+
+EVENT_POSITION_ID = 1
+
+# a lightweight, read-only stand-in for an `Event` model instance
+EventRecord = namedtuple('EventRecord', ['position', 'stream_id', 'event_type', 'event_sequence', 'event_name',
+                                         'event_data'])
+
+# the columns an `EventRecord` is read from, a payload is in either of the last two
+_RECORD_COLUMNS = EventRecord._fields + ('event_data_bin',)
+
+
+def get_event_records_for_stream(event_type, stream_id, after_sequence=None):
+  """
+  The events of a stream, as `EventRecord`s. Only the columns of the record are read and the event data is decoded
+  once, without building `Event` instances.
+  """
+  events = Event.objects.filter(event_type=event_type, stream_id=stream_id)
+
+  if after_sequence is not None:
+    events = events.filter(event_sequence__gt=after_sequence)
+
+  return _get_records(events.order_by('event_sequence', 'id'))
+
+
+def get_event_records_for_streams(event_type, stream_ids, after_sequences=None):
+  """
+  The events of many streams, ordered by stream and sequence. `after_sequences` is a dict of the sequence to read a
+  stream's events after, by stream id, the streams left out are read whole.
+  """
+  if not after_sequences: after_sequences = {}
+
+  streams = [Q(stream_id=stream_id, event_sequence__gt=after_sequence)
+             for stream_id, after_sequence in after_sequences.items()]
+
+  whole_ids = [stream_id for stream_id in stream_ids if stream_id not in after_sequences]
+  if whole_ids:
+    streams.append(Q(stream_id__in=whole_ids))
+
+  if not streams:
+    return []
+
+  events = Event.objects.filter(reduce(operator.or_, streams), event_type=event_type)
 
-from src.libs.common_domain.models import Event
+  return _get_records(events.order_by('stream_id', 'event_sequence'))
 
 
-def get_events():
-  return Event.objects.order_by('event_sequence', 'id')
+def get_event_records(after_position=0, batch_size=1000, event_names=None):
+  """
+  Yields an `EventRecord` for every event after the given position, in the order they were appended.
 
+  Events are read in batches keyed by position (rather than offset) so every batch costs the same and only one batch
+  is held in memory at a time.
+  """
+  events = Event.objects.order_by('position')
 
-def get_events_for_stream(event_type, stream_id):
-  return get_events().filter(event_type=event_type, stream_id=stream_id)
+  if event_names is not None:
+    events = events.filter(event_name__in=event_names)
 
+  while True:
+    batch = list(
+      events
+        .filter(position__gt=after_position)
+        .values_list(*_RECORD_COLUMNS)[:batch_size]
+    )
 
-def create_events(stream_id, starting_sequence, event_type, events):
-  version = starting_sequence
+    for position, stream_id, event_type, event_sequence, event_name, event_data, event_data_bin in batch:
+      yield EventRecord(position, stream_id, event_type, event_sequence, event_name,
+                        _load_payload(event_name, event_data, event_data_bin))
+
+    if len(batch) < batch_size:
+      break
+
+    after_position = batch[-1][0]
+
+
+def get_json_payload_batches(after_position=0, batch_size=1000):
+  """
+  Yields the events whose payload is still json, a batch at a time, after the given position. Each batch is a list of
+  (`EventRecord`, size of the json payload in bytes).
+  """
+  events = Event.objects.filter(event_data_bin__isnull=True).order_by('position')
+
+  while True:
+    batch = list(events.filter(position__gt=after_position).values_list(*EventRecord._fields)[:batch_size])
+    ret_val = []
+
+    for position, stream_id, event_type, event_sequence, event_name, event_data in batch:
+      record = EventRecord(position, stream_id, event_type, event_sequence, event_name,
+                           _load_payload(event_name, event_data, None))
+      ret_val.append((record, len(event_data.encode('utf-8'))))
+
+    if ret_val:
+      yield ret_val
+
+    if len(batch) < batch_size:
+      break
+
+    after_position = batch[-1][0]
+
+
+def save_binary_payloads(payloads):
+  """
+  `payloads` is a list of (position, event name, binary payload), the json payloads are dropped. The name is the one
+  of the event the payload was encoded with, which isn't the row's when the event was upcast as it was loaded.
+  """
+  with transaction.atomic():
+    for position, event_name, event_data_bin in payloads:
+      Event.objects.filter(position=position).update(event_name=event_name, event_data=None,
+                                                     event_data_bin=event_data_bin)
+
+
+def save_upcast_events(events):
+  # `events` is a list of (position, domain event), every row is rewritten as its event
+  with transaction.atomic():
+    for position, event in events:
+      Event.objects.filter(position=position).update(event_name=get_event_name(event.__class__), **_get_payload(event))
+
+
+def get_event_records_at(positions):
+  return _get_records(Event.objects.filter(position__in=positions).order_by('position'))
+
+
+def get_last_position():
+  return EventPosition.objects.get(id=EVENT_POSITION_ID).last_position
+
+
+def create_events(stream_id, starting_sequence, event_type, events, outbox=False):
+  return create_events_for_streams([(stream_id, starting_sequence, event_type, events)], outbox)[0]
+
+
+def create_events_for_streams(streams, outbox=False):
+  """
+  Appends the events of many streams in a single transaction. `streams` is a list of
+  (stream_id, starting_sequence, event_type, events), the events created are returned in a list per stream.
+  """
+  # the rows are built, and their payloads encoded, before the transaction
+  event_data = [
+    Event(stream_id=stream_id, event_type=event_type, event_name=get_event_name(e.__class__),
+          event_sequence=version + i, **_get_payload(e))
+    for stream_id, version, event_type, events in streams
+    for i, e in enumerate(events, 1)
+    ]
 
   with transaction.atomic():
     # the event store had a unique constraint on stream_id and version
     # which handles concurrency conflicts
 
-    event_data = [
-      Event(stream_id=stream_id, event_type=event_type, event_name=_get_event_fqn(e), event_sequence=version + i,
-            event_data=e.data)
-      for i, e in enumerate(events, 1)
-      ]
+    _save_streams([
+      (stream_id, event_type, version + len(events)) for stream_id, version, event_type, events in streams
+      ])
+
+    # every append waits on the reserved positions until this transaction ends, they're reserved last
+    for e, position in zip(event_data, _reserve_positions(len(event_data))):
+      e.position = position
+
+    created = Event.objects.bulk_create(event_data)
+
+    if outbox:
+      OutboxEvent.objects.bulk_create([OutboxEvent(position=e.position) for e in created])
+
+  ret_val = []
+  start = 0
+
+  for _, _, _, events in streams:
+    ret_val.append(created[start:start + len(events)])
+    start += len(events)
+
+  return ret_val
+
+
+def _get_records(events):
+  return [
+    EventRecord(position, stream_id, event_type, event_sequence, event_name,
+                _load_payload(event_name, event_data, event_data_bin))
+    for position, stream_id, event_type, event_sequence, event_name, event_data, event_data_bin in
+    events.values_list(*_RECORD_COLUMNS)
+    ]
+
+
+def _load_payload(event_name, event_data, event_data_bin):
+  if event_data_bin is not None:
+    # the driver returns a memoryview
+    return payload_codec.decode_binary(get_event_class(event_name), bytes(event_data_bin))
+
+  # `values_list` skips the json field's decoding, the payload is decoded once, the codec's values included
+  return payload_codec.loads(event_data)
+
+
+def _get_payload(event):
+  # the payload columns of the event's row
+  if settings.EVENT_PAYLOAD_STORAGE == 'binary' and event.fields is not None:
+    return {'event_data': None, 'event_data_bin': payload_codec.encode_binary(event.__class__, event.data)}
+
+  if settings.EVENT_PAYLOAD_CODEC_ENABLED:
+    return {'event_data': payload_codec.encode(event.data), 'event_data_bin': None}
+
+  return {'event_data': event.data, 'event_data_bin': None}
+
+
+def _save_streams(streams):
+  now = timezone.now()
+  new_streams = []
+
+  for stream_id, event_type, version in streams:
+    updated = Stream.objects.filter(stream_id=stream_id, event_type=event_type).update(
+      version=version, system_modified_date=now
+    )
+
+    if not updated:
+      new_streams.append(Stream(stream_id=stream_id, event_type=event_type, version=version,
+                                system_created_date=now, system_modified_date=now))
 
-  events = Event.objects.bulk_create(event_data)
+  if new_streams:
+    Stream.objects.bulk_create(new_streams)
 
-  return events
 
+def _reserve_positions(count):
+  # the update locks the row until the transaction ends. refer to `EventPosition`.
+  EventPosition.objects.filter(id=EVENT_POSITION_ID).update(last_position=F('last_position') + count)
+  last_position = get_last_position()
 
-def _get_event_fqn(event):
-  return event.__module__ + '.' + event.__class__.__name__
+  return range(last_position - count + 1, last_position + 1)
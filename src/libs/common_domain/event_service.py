@@ -1,14 +1,29 @@
-from src.libs.python_utils.types.type_utils import load_object
+from src.libs.common_domain import event_registry, payload_codec, upcaster_registry
+from src.libs.common_domain.domain_event import normalize
 
 
-def load_domain_event_from_event_record(event_record):
-  event_name = event_record.event_name
-  event_data = event_record.event_data
+def load_domain_event_from_event_record(event_record, _event_registry=None, _upcaster_registry=None):
+  if not _event_registry: _event_registry = event_registry
+  if not _upcaster_registry: _upcaster_registry = upcaster_registry
 
-  domain_event_class = load_object(event_name)
+  event_name = event_record.event_name
+  event_data, typed = payload_codec.decode(event_record.event_data)
 
   try:
-    domain_event = domain_event_class.hydrate(**event_data)
+    if _upcaster_registry.get_chain(event_name) is not None:
+      if not typed:
+        # upcasters get parsed dates, a legacy payload's are found by their key
+        event_data = dict(normalize(k, v) for k, v in event_data.items())
+        typed = True
+
+      event_name, event_data = _upcaster_registry.upcast(event_name, event_data)
+
+    hydrator = _event_registry.get_hydrator(event_name)
+
+    if typed:
+      domain_event = hydrator.build(event_data)
+    else:
+      domain_event = hydrator.hydrate(event_data)
   except Exception as e:
     raise Exception('Unable to load events for event: {0}.'.format(event_record)).with_traceback(e.__traceback__)
 
@@ -3,7 +3,8 @@ from django.dispatch.dispatcher import NO_RECEIVERS
 
 
 class EventSignal(Signal):
-  def send(self, sender, allow_non_idempotent=True, **named):
+  def send(self, sender, allow_non_idempotent=True, only_receivers=None, exclude_receivers=None, robust=False,
+           **named):
     """
     Send signal from sender to all connected receivers.
 
@@ -16,6 +17,19 @@ class EventSignal(Signal):
         sender
             The sender of the signal Either a specific object or None.
 
+        allow_non_idempotent
+            When False, only receivers marked with @event_idempotent are called.
+
+        only_receivers
+            When given, only these receivers are called. ie: a replay that rebuilds a single projection.
+
+        exclude_receivers
+            When given, these receivers aren't called. ie: the ones a subscription feeds.
+
+        robust
+            When True, an error raised by a receiver is returned as its response, like Signal.send_robust, and the
+            rest of the receivers are still called.
+
         named
             Named arguments which will be passed to receivers.
 
@@ -36,7 +50,20 @@ class EventSignal(Signal):
         if not getattr(receiver, 'is_idempotent', False):
           continue
 
-      response = receiver(signal=self, sender=sender, **named)
+      if only_receivers is not None and receiver not in only_receivers:
+        continue
+
+      if exclude_receivers and receiver in exclude_receivers:
+        continue
+
+      if robust:
+        try:
+          response = receiver(signal=self, sender=sender, **named)
+        except Exception as err:
+          response = err
+      else:
+        response = receiver(signal=self, sender=sender, **named)
+
       responses.append((receiver, response))
 
     return responses
@@ -1,27 +1,66 @@
 import logging
 
-from src.libs.common_domain import dispatcher, event_service
-from src.libs.common_domain import event_repository
-from src.libs.django_utils.query.query_utils import batch_qs
+from django.conf import settings
+
+from src.libs.common_domain import dispatcher, event_service, event_registry
+from src.libs.common_domain import event_repository, checkpoint_repository, subscriptions
 
 logger = logging.getLogger(__name__)
 
 
 def save_events(stream_id, starting_sequence, event_type, events, _event_repository=None, _event_dispatcher=None):
+  """
+  Appends the events to the stream and publishes them.
+
+  With `EVENT_OUTBOX_ENABLED` the events are only written to the outbox, in the same transaction, and the outbox
+  relay (manage.py relay_outbox) publishes them. Otherwise they are published right away, before this returns.
+  """
   if not _event_repository:    _event_repository = event_repository
   if not _event_dispatcher:    _event_dispatcher = dispatcher
 
+  if settings.EVENT_OUTBOX_ENABLED:
+    _event_repository.create_events(stream_id, starting_sequence, event_type, events, outbox=True)
+    return
+
   event_records = _event_repository.create_events(stream_id, starting_sequence, event_type, events)
   event_objs = zip(events, event_records)
 
   for e in event_objs:
-    _event_dispatcher.publish_event(stream_id, e[0], e[1].event_sequence)
+    _event_dispatcher.publish_event(stream_id, e[0], e[1].event_sequence,
+                                    exclude_receivers=subscriptions.get_live_excluded_receivers(e[1].position))
+
+
+def save_events_for_streams(streams, _event_repository=None, _event_dispatcher=None):
+  """
+  The same as `save_events` for many streams at once, in a single transaction. `streams` is a list of
+  (stream_id, starting_sequence, event_type, events).
+  """
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_dispatcher:    _event_dispatcher = dispatcher
+
+  if settings.EVENT_OUTBOX_ENABLED:
+    _event_repository.create_events_for_streams(streams, outbox=True)
+    return
+
+  event_records = _event_repository.create_events_for_streams(streams)
 
+  for (stream_id, _, _, events), stream_records in zip(streams, event_records):
+    for e in zip(events, stream_records):
+      _event_dispatcher.publish_event(stream_id, e[0], e[1].event_sequence,
+                                      exclude_receivers=subscriptions.get_live_excluded_receivers(e[1].position))
 
-def load_events(event_type, stream_id, _event_repository=None):
+
+def load_events(event_type, stream_id, after_sequence=None, _event_repository=None):
   if not _event_repository:    _event_repository = event_repository
 
-  events = _event_repository.get_events_for_stream(event_type, stream_id)
+  events = _event_repository.get_event_records_for_stream(event_type, stream_id, after_sequence)
+  return events
+
+
+def load_events_for_streams(event_type, stream_ids, after_sequences=None, _event_repository=None):
+  if not _event_repository:    _event_repository = event_repository
+
+  events = _event_repository.get_event_records_for_streams(event_type, stream_ids, after_sequences)
   return events
 
 
@@ -32,34 +71,55 @@ def load_domain_event_from_event_record(event_record, _event_service=None):
   return domain_event
 
 
-def replay_events(_event_repository=None, _event_service=None, _event_dispatcher=None):
+def replay_events(receivers=None, checkpoint_name=None, checkpoint_every=1000, _event_repository=None,
+                  _event_service=None, _event_dispatcher=None, _event_registry=None, _checkpoint_repository=None):
+  """
+  Publishes every event in the store again.
+
+  When `receivers` are given, only they are called and only the events they are connected to are read. When a
+  `checkpoint_name` is given, the position of the last event replayed is saved as the replay goes so an interrupted
+  replay picks up where it stopped. The checkpoint is removed once the replay completes.
+  """
   counter = 0
   if not _event_repository:    _event_repository = event_repository
   if not _event_service:    _event_service = event_service
 
   if not _event_dispatcher:    _event_dispatcher = dispatcher
+  if not _event_registry:    _event_registry = event_registry
+  if not _checkpoint_repository:    _checkpoint_repository = checkpoint_repository
+
+  event_names = None
+  if receivers is not None:
+    event_names = _event_registry.get_event_names_for_receivers(receivers)
+    logger.debug("Replay events: %s", event_names)
+
+  position = 0
+  if checkpoint_name:
+    position = _checkpoint_repository.get_position(checkpoint_name)
+    logger.debug("Resume replay %s from position: %i", checkpoint_name, position)
 
-  events = _event_repository.get_events()
+  logger.debug("Replay events up to position: %i", _event_repository.get_last_position())
 
-  logger.debug("Replay %i events", events.count())
+  for event in _event_repository.get_event_records(position, event_names=event_names):
 
-  for event_batch in batch_qs(events):
-    logger.debug("starting batch : %s", event_batch[0])
+    event_name = event.event_name
+    event_data = event.event_data
+    event_version = event.event_sequence
 
-    events = event_batch[3]
+    domain_event = _event_service.load_domain_event_from_event_record(event)
 
-    for event in events:
+    try:
+      _event_dispatcher.publish_event(event.stream_id, domain_event, event_version, receivers)
+    except Exception:
+      logger.warn("Error sending signal for: %s Data: %s", event_name, event_data, exc_info=True)
 
-      event_name = event.event_name
-      event_data = event.event_data
-      event_version = event.event_sequence
+    counter += 1
+    logger.debug("Sending signal #%i: %s : %s : %i", counter, event_name, event.stream_id, event.position)
 
-      domain_event = _event_service.load_domain_event_from_event_record(event)
+    if checkpoint_name and counter % checkpoint_every == 0:
+      _checkpoint_repository.save_position(checkpoint_name, event.position)
 
-      try:
-        _event_dispatcher.publish_event(event.stream_id, domain_event, event_version)
-      except Exception:
-        logger.warn("Error sending signal for: %s Data: %s", event_name, event_data, exc_info=True)
+  if checkpoint_name:
+    _checkpoint_repository.delete_checkpoint(checkpoint_name)
 
-      counter += 1
-      logger.debug("Sending signal #%i: %s : %s", counter, event_name, event.stream_id)
+  return counter
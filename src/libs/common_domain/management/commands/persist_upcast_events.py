@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from src.libs.common_domain import upcast_persister, upcaster_registry
+
+
+class Command(BaseCommand):
+  help = 'Rewrites the events that are upcast as they are loaded as the events they are upcast to.'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='The number of events rewritten together in a single transaction.')
+    parser.add_argument('--background', action='store_true', default=False,
+                        help='Enqueue a job that rewrites the events instead.')
+
+  def handle(self, *args, **options):
+    event_names = upcaster_registry.get_upcast_event_names()
+
+    for event_name in event_names:
+      self.stdout.write('{0} -> {1}'.format(event_name, upcaster_registry.get_chain(event_name).event_name))
+
+    if options['background']:
+      upcast_persister.persist_upcast_events_task.delay(options['batch_size'])
+      self.stdout.write('job enqueued')
+      return
+
+    count = upcast_persister.persist_upcast_events(options['batch_size'])
+    self.stdout.write('{0} events rewritten'.format(count))
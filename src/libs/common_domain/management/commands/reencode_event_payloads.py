@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from src.libs.common_domain import payload_reencoder
+
+
+class Command(BaseCommand):
+  help = 'Re-encodes the json event payloads as binary payloads and reports the space saved.'
+
+  def add_arguments(self, parser):
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='The number of events re-encoded together in a single transaction.')
+    parser.add_argument('--dry-run', action='store_true', default=False,
+                        help='Only report the space that would be saved.')
+
+  def handle(self, *args, **options):
+    dry_run = options['dry_run']
+
+    report = payload_reencoder.reencode_payloads(options['batch_size'], dry_run)
+
+    json_size = report['json_size']
+    saved = json_size - report['binary_size']
+
+    self.stdout.write('{0} events {1}re-encoded, {2} without declared fields skipped, {3} failed'.format(
+      report['events'], 'would be ' if dry_run else '', report['skipped'], report['failed']
+    ))
+    self.stdout.write('{0} bytes of json, {1} bytes binary: {2} bytes ({3:.1f}%) saved'.format(
+      json_size, report['binary_size'], saved, 100.0 * saved / json_size if json_size else 0
+    ))
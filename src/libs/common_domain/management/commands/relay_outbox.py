@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from src.libs.common_domain import outbox_relay, outbox_repository
+
+
+class Command(BaseCommand):
+  def add_arguments(self, parser):
+    parser.add_argument('--once', action='store_true', default=False,
+                        help='Drain the outbox and exit instead of polling.')
+    parser.add_argument('--batch-size', type=int, dest='batch_size',
+                        help='Number of events published per batch.')
+    parser.add_argument('--interval', type=float,
+                        help='Seconds to wait between polls when the outbox is empty.')
+    parser.add_argument('--status', action='store_true', default=False,
+                        help='Print the number of events waiting to be published and exit.')
+    parser.add_argument('--retry-failed', action='store_true', default=False,
+                        help='Publish the events moved aside after failing too many times again.')
+
+  def handle(self, *args, **options):
+    if options['status']:
+      self.stdout.write('{0} events waiting to be published, {1} failed'.format(
+        outbox_repository.get_pending_count(), outbox_repository.get_failed_count()
+      ))
+      return
+
+    if options['retry_failed']:
+      self.stdout.write('{0} failed events will be published again'.format(outbox_repository.retry_failed()))
+
+    outbox_relay.run(options['batch_size'], options['interval'], options['once'])
@@ -1,7 +1,60 @@
-from django.core.management.base import NoArgsCommand
-from src.libs.common_domain import event_store
+from django.core.management.base import BaseCommand, CommandError
 
+from src.libs.common_domain import event_store, parallel_replay, checkpoint_repository
+from src.libs.python_utils.types.type_utils import load_object
 
-class Command(NoArgsCommand):
-  def handle_noargs(self, **options):
-    event_store.replay_events()
+
+class Command(BaseCommand):
+  def add_arguments(self, parser):
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Replay with this many processes. Streams are partitioned between them.')
+    parser.add_argument('--handler', action='append', dest='handlers', default=[],
+                        help='Dotted path of an event handler. Only the given handlers are called and only the events '
+                             'they handle are read. Can be repeated.')
+    parser.add_argument('--checkpoint', dest='checkpoint',
+                        help='Name of the checkpoint used to resume an interrupted replay. Defaults to the handlers.')
+    parser.add_argument('--reset', action='store_true', default=False,
+                        help='Discard the checkpoint and replay from the first event.')
+
+  def handle(self, *args, **options):
+    workers = options['workers']
+    handlers = options['handlers']
+
+    # the parallel replay reads every event it's given in a single pass, it isn't resumed
+    if workers > 1 and (options['checkpoint'] or options['reset']):
+      raise CommandError('--checkpoint and --reset only apply to a replay with a single worker')
+
+    receivers = [load_object(h) for h in handlers] if handlers else None
+
+    checkpoint_name = options['checkpoint']
+    if not checkpoint_name and handlers and workers == 1:
+      checkpoint_name = 'replay:' + ','.join(sorted(handlers))
+
+    if checkpoint_name and options['reset']:
+      checkpoint_repository.delete_checkpoint(checkpoint_name)
+
+    if workers > 1:
+      report = parallel_replay.replay_events(workers, receivers)
+      self._write_report(report)
+    else:
+      count = event_store.replay_events(receivers, checkpoint_name)
+      self.stdout.write('replayed {0} events'.format(count))
+
+  def _write_report(self, report):
+    for worker in report['workers']:
+      elapsed = worker['elapsed']
+      throughput = worker['count'] / elapsed if elapsed else 0
+
+      self.stdout.write(
+        'worker {partition}: {count} events, {streams} streams, {errors} errors in {elapsed:.1f}s '
+        '({throughput:.0f} events/s)'.format(throughput=throughput, **worker)
+      )
+
+    self.stdout.write('read {read} events, dispatched {dispatched}, {errors} errors'.format(**report))
+
+    if report['problems']:
+      for problem in report['problems']:
+        self.stderr.write(problem)
+      self.stderr.write('verification FAILED')
+    else:
+      self.stdout.write('verification OK')
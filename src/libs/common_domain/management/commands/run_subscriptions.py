@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from src.libs.common_domain import subscriptions
+
+
+class Command(BaseCommand):
+  def add_arguments(self, parser):
+    parser.add_argument('names', nargs='*',
+                        help='Names of the subscriptions to run, from settings.EVENT_SUBSCRIPTIONS. Defaults to all.')
+    parser.add_argument('--once', action='store_true', default=False,
+                        help='Catch up once and exit instead of polling.')
+    parser.add_argument('--interval', type=float,
+                        help='Seconds to wait between polls when there is nothing to catch up.')
+    parser.add_argument('--status', action='store_true', default=False,
+                        help='Print the checkpoint and the lag of the subscriptions and exit.')
+    parser.add_argument('--reset', action='store_true', default=False,
+                        help='Move the checkpoints back so the subscriptions are rebuilt from the first event. '
+                             'A subscription that has not started otherwise starts from the last event.')
+
+  def handle(self, *args, **options):
+    names = options['names'] or subscriptions.get_subscription_names()
+
+    unknown = set(names) - set(subscriptions.get_subscription_names())
+    if unknown:
+      raise CommandError('Unknown subscriptions: {0}'.format(', '.join(sorted(unknown))))
+
+    if options['status']:
+      for name in names:
+        position, lag = subscriptions.get_lag(name)
+        self.stdout.write('{0}: position {1}, {2} events behind'.format(name, position, lag))
+      return
+
+    if options['reset']:
+      for name in names:
+        subscriptions.reset(name)
+
+    subscriptions.run(names, options['interval'], options['once'])
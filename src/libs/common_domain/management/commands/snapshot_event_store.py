@@ -0,0 +1,42 @@
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.libs.common_domain import aggregate_repository, snapshot_repository, snapshot_store
+from src.libs.python_utils.types.type_utils import load_object
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+  help = 'Backfills aggregate snapshots for existing streams.'
+
+  def add_arguments(self, parser):
+    parser.add_argument('aggregate_classes', nargs='+',
+                        help='Full path of the aggregates to snapshot, ie: src.domain.agreement.entities.Agreement')
+    parser.add_argument('--min-events', type=int, default=settings.AGGREGATE_SNAPSHOT_INTERVAL,
+                        help='Only snapshot streams with at least this many events.')
+
+  def handle(self, *args, **options):
+    min_events = options['min_events']
+
+    for aggregate_class_path in options['aggregate_classes']:
+      aggregate_class = load_object(aggregate_class_path)
+      event_type = aggregate_class.__name__
+
+      counter = 0
+
+      for stream_id, version in snapshot_repository.get_stream_versions(event_type):
+        if version + 1 < min_events:
+          continue
+
+        try:
+          aggregate = aggregate_repository.get(aggregate_class, stream_id)
+          snapshot_store.save_snapshot(aggregate)
+        except Exception:
+          logger.warn("Error snapshotting %s: %s", event_type, stream_id, exc_info=True)
+        else:
+          counter += 1
+
+      self.stdout.write('{0}: {1} snapshots saved'.format(event_type, counter))
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Snapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('stream_id', models.CharField(max_length=255)),
+                ('event_type', models.CharField(max_length=1024)),
+                ('version', models.PositiveIntegerField()),
+                ('schema_version', models.PositiveIntegerField()),
+                ('snapshot_data', models.BinaryField()),
+                ('system_created_date', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='snapshot',
+            unique_together=set([('stream_id', 'event_type', 'schema_version', 'version')]),
+        ),
+    ]
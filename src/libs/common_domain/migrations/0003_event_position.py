@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.db.models import F, Max
+
+
+def populate_positions(apps, schema_editor):
+  Event = apps.get_model('common_domain', 'Event')
+  EventPosition = apps.get_model('common_domain', 'EventPosition')
+
+  # ids were handed out in the order events were appended
+  Event.objects.update(position=F('id'))
+
+  last_position = Event.objects.aggregate(last_position=Max('position'))['last_position'] or 0
+  EventPosition.objects.create(id=1, last_position=last_position)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0002_snapshot'),
+    ]
+
+    # the default agreement types are created through the event store so it has to be up to date first
+    run_before = [
+        ('agreement_type', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventPosition',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('last_position', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='position',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(populate_positions),
+        migrations.AlterField(
+            model_name='event',
+            name='position',
+            field=models.BigIntegerField(unique=True),
+        ),
+    ]
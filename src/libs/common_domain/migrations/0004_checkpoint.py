@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0003_event_position'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Checkpoint',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('name', models.CharField(max_length=1024, unique=True)),
+                ('position', models.BigIntegerField(default=0)),
+                ('system_modified_date', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='event',
+            index_together=set([('event_name', 'position')]),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0004_checkpoint'),
+    ]
+
+    # agreement_type's data migration appends events, which writes to the outbox when it's enabled
+    run_before = [
+        ('agreement_type', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('position', models.BigIntegerField(unique=True)),
+                ('system_created_date', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.db.models import Max, Min
+import django.utils.timezone
+
+
+def populate_streams(apps, schema_editor):
+  Event = apps.get_model('common_domain', 'Event')
+  Stream = apps.get_model('common_domain', 'Stream')
+
+  streams = (
+    Event.objects
+      .values('stream_id', 'event_type')
+      .annotate(version=Max('event_sequence'), created=Min('system_created_date'), modified=Max('system_created_date'))
+  )
+
+  Stream.objects.bulk_create(
+    (Stream(stream_id=s['stream_id'], event_type=s['event_type'], version=s['version'],
+            system_created_date=s['created'], system_modified_date=s['modified']) for s in streams.iterator()),
+    batch_size=1000
+  )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0005_outbox_event'),
+    ]
+
+    # agreement_type's data migration appends events, which keeps the streams table up to date
+    run_before = [
+        ('agreement_type', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Stream',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('stream_id', models.CharField(max_length=255)),
+                ('event_type', models.CharField(max_length=1024)),
+                ('version', models.PositiveIntegerField()),
+                ('system_created_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('system_modified_date', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='stream',
+            unique_together=set([('stream_id', 'event_type')]),
+        ),
+        migrations.RunPython(populate_streams),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0006_stream'),
+    ]
+
+    # agreement_type's data migration appends events, which writes the binary payload column
+    run_before = [
+        ('agreement_type', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='event_data_bin',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='event_data',
+            field=jsonfield.fields.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common_domain', '0007_binary_payload'),
+    ]
+
+    # agreement_type's data migration appends events, which writes to the outbox when it's enabled
+    run_before = [
+        ('agreement_type', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='outboxevent',
+            name='failed_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
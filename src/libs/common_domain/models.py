@@ -6,13 +6,82 @@ from jsonfield import JSONField
 class Event(models.Model):
   stream_id = models.CharField(max_length=255)
   event_sequence = models.PositiveIntegerField()
+  # the order in which events were appended to the store, across all streams. refer to `EventPosition`.
+  position = models.BigIntegerField(unique=True)
   event_type = models.CharField(max_length=1024)
   event_name = models.CharField(max_length=1024)
-  event_data = JSONField()
+  # an event's payload is in one of these, `event_data_bin` when EVENT_PAYLOAD_STORAGE is binary. refer to
+  # `payload_codec.encode_binary`.
+  event_data = JSONField(null=True, blank=True)
+  event_data_bin = models.BinaryField(null=True)
   system_created_date = models.DateTimeField(default=timezone.now)
 
   class Meta:
     unique_together = ("stream_id", "event_type", "event_sequence")
+    # reading only some kinds of events, in order. ie: a selective replay
+    index_together = [("event_name", "position")]
 
   def __str__(self):
     return '{0}:{1}:{2}:{3}'.format(self.event_type, self.stream_id, self.event_sequence, self.event_name)
+
+
+class Stream(models.Model):
+  # one per stream in the event store, kept up to date on every append. refer to `event_repository.create_events`.
+  stream_id = models.CharField(max_length=255)
+  event_type = models.CharField(max_length=1024)
+  version = models.PositiveIntegerField()
+  system_created_date = models.DateTimeField(default=timezone.now)
+  system_modified_date = models.DateTimeField(default=timezone.now)
+
+  class Meta:
+    unique_together = ("stream_id", "event_type")
+
+  def __str__(self):
+    return '{0}:{1}:{2}'.format(self.event_type, self.stream_id, self.version)
+
+
+class EventPosition(models.Model):
+  # a single row holding the last position handed out to an event. appending events locks this row so positions are
+  # always committed in order, readers paging by position will never skip an event that is committed late.
+  last_position = models.BigIntegerField(default=0)
+
+
+class Snapshot(models.Model):
+  stream_id = models.CharField(max_length=255)
+  event_type = models.CharField(max_length=1024)
+  # the version of the aggregate (the event_sequence of the last event applied) when the snapshot was taken
+  version = models.PositiveIntegerField()
+  # aggregates can bump their `snapshot_schema_version` whenever their state changes shape. snapshots of an older
+  # schema are ignored and the aggregate is rebuilt from its events.
+  schema_version = models.PositiveIntegerField()
+  snapshot_data = models.BinaryField()
+  system_created_date = models.DateTimeField(default=timezone.now)
+
+  class Meta:
+    unique_together = ("stream_id", "event_type", "schema_version", "version")
+
+  def __str__(self):
+    return '{0}:{1}:{2}'.format(self.event_type, self.stream_id, self.version)
+
+
+class Checkpoint(models.Model):
+  # the position of the last event processed by a long running reader of the event store, ie: a replay
+  name = models.CharField(max_length=1024, unique=True)
+  position = models.BigIntegerField(default=0)
+  system_modified_date = models.DateTimeField(default=timezone.now)
+
+  def __str__(self):
+    return '{0}:{1}'.format(self.name, self.position)
+
+
+class OutboxEvent(models.Model):
+  # an event appended to the store that the outbox relay hasn't published yet. written in the same transaction as the
+  # event so an event is never lost nor published before it's committed.
+  position = models.BigIntegerField(unique=True)
+  # the events that failed to publish EVENT_OUTBOX_MAX_ATTEMPTS times are moved aside, the relay no longer retries them
+  attempts = models.IntegerField(default=0)
+  failed_date = models.DateTimeField(null=True, blank=True)
+  system_created_date = models.DateTimeField(default=timezone.now)
+
+  def __str__(self):
+    return str(self.position)
@@ -0,0 +1,103 @@
+import logging
+import time
+
+from django.conf import settings
+
+from src.libs.common_domain import advisory_lock, dispatcher, event_service
+from src.libs.common_domain import event_repository, outbox_repository, projection_runner, subscriptions
+from src.libs.common_domain.enqueue_buffer import enqueue_buffer
+
+logger = logging.getLogger(__name__)
+
+
+def relay_batch(batch_size=None, _outbox_repository=None, _event_repository=None, _event_service=None,
+                _event_dispatcher=None, _projection_runner=None, _advisory_lock=None):
+  """
+  Publishes the oldest events of the outbox, in position order, and removes them from it. Returns the number of
+  events published.
+
+  The jobs of the whole batch are enqueued with a single redis pipeline. Publishing stops at the first event that
+  fails, the events published until then are removed and the rest are retried on the next batch. An event that failed
+  EVENT_OUTBOX_MAX_ATTEMPTS times is moved aside so it doesn't hold up the ones after it, `retry_failed` puts it back.
+  An event may be published twice if the relay dies before removing it, which the idempotent handlers tolerate.
+
+  A single relay publishes at a time, the others skip the batch until it's done.
+
+  With `EVENT_PROJECTION_RUNNER_ENABLED` the batch is published by jobs that run all the handlers of a chunk of
+  EVENT_PROJECTION_RUNNER_CHUNK_SIZE events each, refer to `projection_runner`.
+  """
+  if not _outbox_repository:    _outbox_repository = outbox_repository
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_service:    _event_service = event_service
+  if not _event_dispatcher:    _event_dispatcher = dispatcher
+  if not _projection_runner:    _projection_runner = projection_runner
+  if not _advisory_lock:    _advisory_lock = advisory_lock
+
+  if not batch_size: batch_size = settings.EVENT_OUTBOX_BATCH_SIZE
+
+  with _advisory_lock.try_lock('outbox_relay') as locked:
+    if not locked:
+      logger.debug("Another outbox relay is publishing")
+      return 0
+
+    positions = _outbox_repository.get_pending_positions(batch_size)
+    if not positions:
+      return 0
+
+    published = []
+    failed_position = None
+
+    with enqueue_buffer('outbox relay'):
+      if settings.EVENT_PROJECTION_RUNNER_ENABLED:
+        # small chunks so a job runs well within its timeout, the events are out of the outbox once it's enqueued
+        chunk_size = settings.EVENT_PROJECTION_RUNNER_CHUNK_SIZE
+
+        for i in range(0, len(positions), chunk_size):
+          _projection_runner.run_projections_task.delay(positions[i:i + chunk_size])
+
+        published = list(positions)
+
+      else:
+        for event in _event_repository.get_event_records_at(positions):
+          try:
+            domain_event = _event_service.load_domain_event_from_event_record(event)
+            _event_dispatcher.publish_event(event.stream_id, domain_event, event.event_sequence,
+                                            exclude_receivers=subscriptions.get_live_excluded_receivers(event.position))
+          except Exception:
+            logger.warn("Error publishing outbox event: %s", event.position, exc_info=True)
+            failed_position = event.position
+            break
+
+          published.append(event.position)
+
+    # only once their jobs are in redis. if that fails the whole batch is retried.
+    if published:
+      _outbox_repository.delete_positions(published)
+
+    if failed_position is not None:
+      if _outbox_repository.record_failure(failed_position, settings.EVENT_OUTBOX_MAX_ATTEMPTS):
+        logger.error("Outbox event %i failed %i times, it's moved aside", failed_position,
+                     settings.EVENT_OUTBOX_MAX_ATTEMPTS)
+
+  logger.debug("Published %i of %i outbox events", len(published), len(positions))
+
+  return len(published)
+
+
+def run(batch_size=None, poll_interval=None, once=False, _sleep=None):
+  if not poll_interval: poll_interval = settings.EVENT_OUTBOX_POLL_INTERVAL
+  if not _sleep: _sleep = time.sleep
+
+  while True:
+    try:
+      published = relay_batch(batch_size)
+    except Exception:
+      logger.warn("Error relaying the outbox", exc_info=True)
+      published = 0
+
+    if once and not published:
+      return
+
+    # keep draining without waiting while there is a backlog
+    if not published:
+      _sleep(poll_interval)
@@ -0,0 +1,44 @@
+from django.db.models import F
+from django.utils import timezone
+
+from src.libs.common_domain.models import OutboxEvent
+
+
+def get_pending_positions(batch_size):
+  return list(
+    OutboxEvent.objects
+      .filter(failed_date__isnull=True)
+      .order_by('position')
+      .values_list('position', flat=True)[:batch_size]
+  )
+
+
+def delete_positions(positions):
+  OutboxEvent.objects.filter(position__in=positions).delete()
+
+
+def record_failure(position, max_attempts):
+  """
+  Counts a failed attempt to publish an event. Returns whether the event failed `max_attempts` times and was moved
+  aside.
+  """
+  OutboxEvent.objects.filter(position=position).update(attempts=F('attempts') + 1)
+
+  return bool(
+    OutboxEvent.objects
+      .filter(position=position, attempts__gte=max_attempts)
+      .update(failed_date=timezone.now())
+  )
+
+
+def retry_failed():
+  # the events moved aside are published again, from their first attempt
+  return OutboxEvent.objects.filter(failed_date__isnull=False).update(attempts=0, failed_date=None)
+
+
+def get_pending_count():
+  return OutboxEvent.objects.filter(failed_date__isnull=True).count()
+
+
+def get_failed_count():
+  return OutboxEvent.objects.filter(failed_date__isnull=False).count()
@@ -0,0 +1,189 @@
+import logging
+import multiprocessing
+import queue
+import time
+import zlib
+
+from django.db import connections
+
+from src.libs.common_domain import dispatcher, event_service, event_registry
+from src.libs.common_domain import event_repository
+
+logger = logging.getLogger(__name__)
+
+
+def replay_events(worker_count, receivers=None, batch_size=500, _event_repository=None, _event_registry=None):
+  """
+  Replays the event store with a pool of processes. `receivers` works the same as in `event_store.replay_events`.
+
+  Events are read once, in position order, and every stream is routed to the same worker so the events of a stream
+  are always dispatched in order. Returns a report with the throughput of every worker and the result of verifying
+  that every event that was read was dispatched, in order.
+  """
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_registry:    _event_registry = event_registry
+
+  event_names = None
+  if receivers is not None:
+    event_names = _event_registry.get_event_names_for_receivers(receivers)
+
+  # the workers are forked, they can't share the parent's database connections
+  for connection in connections.all():
+    connection.close()
+
+  # bounded so the reader can't get too far ahead of a slow worker
+  work_queues = [multiprocessing.Queue(maxsize=10) for _ in range(worker_count)]
+  result_queue = multiprocessing.Queue()
+
+  workers = [
+    multiprocessing.Process(target=replay_partition,
+                            args=(partition, work_queues[partition], result_queue, receivers,
+                                  event_names is not None))
+    for partition in range(worker_count)
+    ]
+
+  for worker in workers:
+    worker.start()
+
+  read_counts = [0] * worker_count
+  batches = [[] for _ in range(worker_count)]
+
+  try:
+    for event in _event_repository.get_event_records(event_names=event_names):
+      partition = get_partition(event.stream_id, worker_count)
+
+      read_counts[partition] += 1
+      batches[partition].append(event)
+
+      if len(batches[partition]) >= batch_size:
+        _put(work_queues[partition], workers[partition], batches[partition])
+        batches[partition] = []
+
+  finally:
+    for partition, batch in enumerate(batches):
+      if batch:
+        _put(work_queues[partition], workers[partition], batch)
+
+      # tells the worker there's nothing left
+      _put(work_queues[partition], workers[partition], None)
+
+  worker_reports = _collect_worker_reports(workers, result_queue)
+
+  for worker in workers:
+    worker.join()
+
+  return _verify(read_counts, worker_reports)
+
+
+def get_partition(stream_id, worker_count):
+  # python's hash() is randomized per process, crc32 is the same everywhere
+  return zlib.crc32(stream_id.encode('utf-8')) % worker_count
+
+
+def replay_partition(partition, work_queue, result_queue, receivers=None, filtered=False, _event_service=None,
+                     _event_dispatcher=None):
+  if not _event_service:    _event_service = event_service
+  if not _event_dispatcher:    _event_dispatcher = dispatcher
+
+  report = {'partition': partition, 'count': 0, 'errors': 0, 'streams': 0, 'out_of_order': 0, 'failed': False}
+  last_sequences = {}
+  start = time.time()
+
+  try:
+    while True:
+      batch = work_queue.get()
+
+      if batch is None:
+        break
+
+      for event in batch:
+        stream_key = (event.event_type, event.stream_id)
+
+        # every stream starts at 0 and increases by 1. when only some events are read the skipped ones leave gaps,
+        # the sequences still increase.
+        last_sequence = last_sequences.get(stream_key, -1)
+
+        if filtered and event.event_sequence <= last_sequence:
+          report['out_of_order'] += 1
+        elif not filtered and last_sequence + 1 != event.event_sequence:
+          report['out_of_order'] += 1
+
+        last_sequences[stream_key] = event.event_sequence
+
+        try:
+          domain_event = _event_service.load_domain_event_from_event_record(event)
+          _event_dispatcher.publish_event(event.stream_id, domain_event, event.event_sequence, receivers)
+        except Exception:
+          report['errors'] += 1
+          logger.warn("Error sending signal for: %s Data: %s", event.event_name, event.event_data, exc_info=True)
+
+        report['count'] += 1
+
+  except Exception:
+    report['failed'] = True
+    logger.exception("Replay worker %i failed", partition)
+
+  report['streams'] = len(last_sequences)
+  report['elapsed'] = time.time() - start
+
+  result_queue.put(report)
+
+
+def _put(work_queue, worker, item, timeout=1):
+  # a worker that died stops reading its queue, the reader would block on it forever. its events are still counted as
+  # read so `_verify` reports them.
+  while worker.is_alive():
+    try:
+      work_queue.put(item, timeout=timeout)
+      return True
+    except queue.Full:
+      pass
+
+  # don't wait for the queue's buffered batches to be flushed to a reader that's gone when the replay exits
+  work_queue.cancel_join_thread()
+
+  return False
+
+
+def _collect_worker_reports(workers, result_queue):
+  reports = {}
+
+  while len(reports) < len(workers):
+    try:
+      report = result_queue.get(timeout=1)
+    except queue.Empty:
+      dead = [i for i, w in enumerate(workers) if not w.is_alive() and i not in reports]
+
+      for partition in dead:
+        # the process died without reporting
+        reports[partition] = {'partition': partition, 'count': 0, 'errors': 0, 'streams': 0, 'out_of_order': 0,
+                              'failed': True, 'elapsed': 0}
+    else:
+      reports[report['partition']] = report
+
+  return [reports[partition] for partition in range(len(workers))]
+
+
+def _verify(read_counts, worker_reports):
+  problems = []
+
+  for report in worker_reports:
+    partition = report['partition']
+
+    if report['failed']:
+      problems.append('worker {0} failed'.format(partition))
+
+    if report['count'] != read_counts[partition]:
+      problems.append('worker {0} dispatched {1} of {2} events'.format(partition, report['count'],
+                                                                       read_counts[partition]))
+
+    if report['out_of_order']:
+      problems.append('worker {0} saw {1} out of order events'.format(partition, report['out_of_order']))
+
+  return {
+    'workers': worker_reports,
+    'read': sum(read_counts),
+    'dispatched': sum(r['count'] for r in worker_reports),
+    'errors': sum(r['errors'] for r in worker_reports),
+    'problems': problems,
+  }
@@ -0,0 +1,184 @@
+import datetime
+import decimal
+import json
+import struct
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from jsonfield.encoder import JSONEncoder
+from pytz import UTC
+
+# the payload of an event written by the codec: {'_codec': 1, 'data': {...}}, with the values json can't represent
+# replaced by a dict tagged with their type, ie: {'$dt': '2015-09-01T10:30:00.000000Z'}. the keys of the data that
+# start with a $ are escaped with another one so they're never taken for a tag. anything else is a payload from before
+# the codec, whose dates are strings to be guessed from the `_date` suffix of their key.
+CODEC_VERSION = 1
+
+_VERSION_KEY = '_codec'
+_DATA_KEY = 'data'
+
+# how the json of a payload written by the codec starts, the version key is written first
+_JSON_PREFIX = '{"_codec":'
+
+_DATETIME_TAG = '$dt'
+_DATE_TAG = '$d'
+_DECIMAL_TAG = '$dec'
+
+# a binary payload: a format byte, the crc32 of the event class's key dictionary (its `fields`) and the json array of
+# the encoded values, in the order of the keys. the array is compressed when it's at least
+# EVENT_PAYLOAD_COMPRESS_MIN_BYTES long.
+_BINARY_PLAIN = 1
+_BINARY_ZLIB = 2
+
+_binary_header = struct.Struct('>BI')
+_key_checksums = {}
+
+
+def encode(data):
+  return OrderedDict(((_VERSION_KEY, CODEC_VERSION), (_DATA_KEY, _encode_value(data))))
+
+
+def loads(value):
+  """
+  Reads the json of a payload, decoding the tagged values only when it was written by the codec. The tags aren't
+  escaped in a legacy payload, so its data is read as-is.
+  """
+  if value.startswith(_JSON_PREFIX):
+    return json.loads(value, object_hook=object_hook)
+
+  ret_val = json.loads(value)
+
+  # written by the codec but not by the json field, ie: with other separators
+  if isinstance(ret_val, dict) and _VERSION_KEY in ret_val:
+    ret_val = json.loads(value, object_hook=object_hook)
+
+  return ret_val
+
+
+def decode(payload):
+  """
+  Returns the data of a payload read with `object_hook`, and whether it was written by the codec. The data of a
+  legacy payload is returned as-is.
+  """
+  if _VERSION_KEY in payload:
+    version = payload[_VERSION_KEY]
+
+    if version != CODEC_VERSION:
+      raise ValueError('Unknown event payload codec version: {0}'.format(version))
+
+    return payload[_DATA_KEY], True
+
+  return payload, False
+
+
+def encode_binary(event_class, data):
+  keys = event_class.fields
+
+  if keys is None:
+    raise ValueError('{0} declares no fields, its payload can only be written as json'.format(event_class.__name__))
+
+  values = json.dumps([_encode_value(data[k]) for k in keys], cls=JSONEncoder, separators=(',', ':')).encode('utf-8')
+  binary_format = _BINARY_PLAIN
+
+  if len(values) >= settings.EVENT_PAYLOAD_COMPRESS_MIN_BYTES:
+    values = zlib.compress(values)
+    binary_format = _BINARY_ZLIB
+
+  return _binary_header.pack(binary_format, _get_key_checksum(keys)) + values
+
+
+def decode_binary(event_class, value):
+  """
+  Returns the payload written by `encode_binary` as the codec's json payload read with `object_hook`, ready for
+  `decode`.
+  """
+  binary_format, key_checksum = _binary_header.unpack_from(value)
+  keys = event_class.fields
+
+  if keys is None or key_checksum != _get_key_checksum(keys):
+    raise ValueError('The fields of {0} are not the ones its payload was written with'.format(event_class.__name__))
+
+  values = value[_binary_header.size:]
+
+  if binary_format == _BINARY_ZLIB:
+    values = zlib.decompress(values)
+  elif binary_format != _BINARY_PLAIN:
+    raise ValueError('Unknown binary event payload format: {0}'.format(binary_format))
+
+  values = json.loads(values.decode('utf-8'), object_hook=object_hook)
+
+  return {_VERSION_KEY: CODEC_VERSION, _DATA_KEY: dict(zip(keys, values))}
+
+
+def object_hook(obj):
+  # for json.loads of a payload written by the codec, the tagged values are decoded as the json is parsed
+  if len(obj) == 1:
+    if _DATETIME_TAG in obj:
+      return _parse_datetime(obj[_DATETIME_TAG])
+    if _DATE_TAG in obj:
+      return _parse_date(obj[_DATE_TAG])
+    if _DECIMAL_TAG in obj:
+      return decimal.Decimal(obj[_DECIMAL_TAG])
+
+  for k in obj:
+    if k[:1] == '$':
+      return {(k[1:] if k[:1] == '$' else k): v for k, v in obj.items()}
+
+  return obj
+
+
+def _encode_value(value):
+  if isinstance(value, dict):
+    return {_escape_key(k): _encode_value(v) for k, v in value.items()}
+
+  if isinstance(value, (list, tuple)):
+    return [_encode_value(v) for v in value]
+
+  # datetime is a date, it's checked first
+  if isinstance(value, datetime.datetime):
+    return {_DATETIME_TAG: _format_datetime(value)}
+
+  if isinstance(value, datetime.date):
+    return {_DATE_TAG: value.isoformat()}
+
+  if isinstance(value, decimal.Decimal):
+    return {_DECIMAL_TAG: str(value)}
+
+  return value
+
+
+def _escape_key(key):
+  if isinstance(key, str) and key[:1] == '$':
+    return '$' + key
+
+  return key
+
+
+def _get_key_checksum(keys):
+  ret_val = _key_checksums.get(keys)
+
+  if ret_val is None:
+    ret_val = _key_checksums[keys] = zlib.crc32(','.join(keys).encode('utf-8'))
+
+  return ret_val
+
+
+def _format_datetime(value):
+  # a fixed format, always with the microseconds. aware dates are written in utc, with a Z.
+  if value.tzinfo is None:
+    return '{0:%Y-%m-%dT%H:%M:%S.%f}'.format(value)
+
+  return '{0:%Y-%m-%dT%H:%M:%S.%f}Z'.format(value.astimezone(UTC))
+
+
+def _parse_datetime(value):
+  # only ever the format written by `_format_datetime`: YYYY-MM-DDTHH:MM:SS.ffffff[Z]
+  return datetime.datetime(
+    int(value[0:4]), int(value[5:7]), int(value[8:10]), int(value[11:13]), int(value[14:16]), int(value[17:19]),
+    int(value[20:26]), UTC if len(value) == 27 else None
+  )
+
+
+def _parse_date(value):
+  return datetime.date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
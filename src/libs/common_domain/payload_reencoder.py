@@ -0,0 +1,48 @@
+import logging
+
+from src.libs.common_domain import event_registry, event_repository, event_service, payload_codec
+
+logger = logging.getLogger(__name__)
+
+
+def reencode_payloads(batch_size=1000, dry_run=False, _event_repository=None, _event_service=None):
+  """
+  Re-encodes the json event payloads as binary payloads, a batch per transaction. Returns a report of the events
+  re-encoded and of the space saved.
+
+  Events are loaded the way they're read, legacy payloads normalized and upcast events upcast, and every row is
+  rewritten as the event its payload was encoded with, its name included.
+  """
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_service:    _event_service = event_service
+
+  report = {'events': 0, 'skipped': 0, 'failed': 0, 'json_size': 0, 'binary_size': 0}
+
+  for batch in _event_repository.get_json_payload_batches(batch_size=batch_size):
+    payloads = []
+
+    for record, size in batch:
+      try:
+        domain_event = _event_service.load_domain_event_from_event_record(record)
+
+        if domain_event.fields is None:
+          report['skipped'] += 1
+          continue
+
+        event_name = event_registry.get_event_name(domain_event.__class__)
+        event_data_bin = payload_codec.encode_binary(domain_event.__class__, domain_event.data)
+      except Exception:
+        logger.warn("Error re-encoding event: %s", record.position, exc_info=True)
+        report['failed'] += 1
+      else:
+        payloads.append((record.position, event_name, event_data_bin))
+        report['json_size'] += size
+        report['binary_size'] += len(event_data_bin)
+
+    if payloads and not dry_run:
+      _event_repository.save_binary_payloads(payloads)
+
+    report['events'] += len(payloads)
+    logger.debug("Re-encoded %i events, up to position: %i", report['events'], batch[-1][0].position)
+
+  return report
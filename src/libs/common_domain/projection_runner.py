@@ -0,0 +1,77 @@
+import logging
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from src.libs.common_domain import dispatcher, event_service
+from src.libs.common_domain import event_repository, subscriptions
+from src.libs.common_domain.enqueue_buffer import job, run_inline, enqueue_buffer
+from src.libs.python_utils.types.type_utils import load_object
+
+logger = logging.getLogger(__name__)
+
+
+# a chunk of EVENT_PROJECTION_RUNNER_CHUNK_SIZE events runs well within it
+@job('high', timeout=600)
+def run_projections_task(positions, _event_repository=None, _event_service=None, _event_dispatcher=None):
+  """
+  Publishes committed events, in position order, in this work-horse, running the jobs their handlers create inline
+  rather than as a job each. The outbox relay hands its batches over in chunks, so the digests of an
+  `enqueue_buffer`, ie: the realtime app's alert digest, merge the work of every event of the chunk.
+
+  Every handler and every job runs on its own, one failing doesn't keep the rest from running. A job that fails is
+  enqueued as usual. A handler that fails is enqueued on its own for its event with `run_projection_task`, the
+  handlers that succeeded aren't run again.
+  """
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_service:    _event_service = event_service
+  if not _event_dispatcher:    _event_dispatcher = dispatcher
+
+  records = _event_repository.get_event_records_at(positions)
+
+  missing = set(positions) - set(r.position for r in records)
+  if missing:
+    raise ObjectDoesNotExist('Events not found at positions: {0}'.format(sorted(missing)))
+
+  failed = []
+  count = 0
+
+  # the digests are flushed before the buffer exits, their jobs run inline too
+  with run_inline(), enqueue_buffer('projections'):
+    for event in records:
+      domain_event = _event_service.load_domain_event_from_event_record(event)
+      responses = _event_dispatcher.publish_event(
+        event.stream_id, domain_event, event.event_sequence, robust=True,
+        exclude_receivers=subscriptions.get_live_excluded_receivers(event.position)
+      )
+
+      for receiver, response in responses:
+        if isinstance(response, Exception):
+          logger.warn("Error running %s for event: %s, enqueuing it instead", receiver.__name__, event.position,
+                      exc_info=(type(response), response, response.__traceback__))
+          failed.append((event.position, receiver.__module__ + '.' + receiver.__name__))
+
+      count += len(responses)
+
+  # outside of run_inline so they're retried by rq rather than right away
+  with enqueue_buffer('projection retries'):
+    for position, receiver_path in failed:
+      run_projection_task.delay(position, receiver_path)
+
+  return count
+
+
+@job('high')
+def run_projection_task(position, receiver_path, _event_repository=None, _event_service=None,
+                        _event_dispatcher=None):
+  # runs a single handler for an event, the one that failed in `run_projections_task`
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_service:    _event_service = event_service
+  if not _event_dispatcher:    _event_dispatcher = dispatcher
+
+  records = _event_repository.get_event_records_at([position])
+  if not records:
+    raise ObjectDoesNotExist('Event not found at position: {0}'.format(position))
+
+  event = records[0]
+  domain_event = _event_service.load_domain_event_from_event_record(event)
+  _event_dispatcher.publish_event(event.stream_id, domain_event, event.event_sequence, [load_object(receiver_path)])
@@ -0,0 +1,73 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from src.libs.common_domain import snapshot_store
+
+logger = logging.getLogger(__name__)
+
+
+# this cache is shared by every gunicorn worker and rq work-horse. an entry is tagged with the aggregate version it
+# was built from and the repository always tops it up with the newer events from the event store. a stale entry
+# costs an extra event or two, it's never used as-is.
+
+
+def get(aggregate_class, aggregate_id, _cache=None):
+  if not settings.AGGREGATE_SHARED_CACHE_ENABLED:
+    return None
+
+  if not _cache: _cache = _get_cache()
+
+  try:
+    entry = _cache.get(_get_key(aggregate_class, aggregate_id))
+
+    if not entry:
+      return None
+
+    # an entry another release wrote may not deserialize, it's read from the event store instead
+    version, data = entry
+    aggregate = snapshot_store.deserialize(aggregate_class, data)
+  except Exception:
+    logger.warn("Error reading shared aggregate cache for: %s", aggregate_id, exc_info=True)
+    return None
+
+  if aggregate.version != version:
+    logger.warn("Discarding shared aggregate cache entry with a mismatched version: %s", aggregate_id)
+    return None
+
+  return aggregate
+
+
+def put(aggregate, _cache=None):
+  if not settings.AGGREGATE_SHARED_CACHE_ENABLED:
+    return
+
+  if not _cache: _cache = _get_cache()
+
+  entry = (aggregate.version, snapshot_store.serialize(aggregate))
+
+  try:
+    _cache.set(_get_key(aggregate.__class__, aggregate.id), entry, settings.AGGREGATE_SHARED_CACHE_TIMEOUT)
+  except Exception:
+    logger.warn("Error writing shared aggregate cache for: %s", aggregate.id, exc_info=True)
+
+
+def invalidate(aggregate_class, aggregate_id, _cache=None):
+  if not settings.AGGREGATE_SHARED_CACHE_ENABLED:
+    return
+
+  if not _cache: _cache = _get_cache()
+
+  try:
+    _cache.delete(_get_key(aggregate_class, aggregate_id))
+  except Exception:
+    logger.warn("Error invalidating shared aggregate cache for: %s", aggregate_id, exc_info=True)
+
+
+def _get_cache():
+  return caches[settings.AGGREGATE_SHARED_CACHE_ALIAS]
+
+
+def _get_key(aggregate_class, aggregate_id):
+  return 'aggregate:{0}:{1}:{2}'.format(aggregate_class.__name__, aggregate_class.snapshot_schema_version, aggregate_id)
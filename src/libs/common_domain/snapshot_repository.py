@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models import Max
+
+from src.libs.common_domain.models import Snapshot, Event
+
+
+def get_latest_snapshot(event_type, stream_id, schema_version):
+  ret_val = (
+    Snapshot.objects
+      .filter(event_type=event_type, stream_id=stream_id, schema_version=schema_version)
+      .order_by('-version')
+      .first()
+  )
+  return ret_val
+
+
+def create_snapshot(stream_id, event_type, schema_version, version, snapshot_data):
+  # the savepoint keeps a duplicate snapshot (another process got there first) from breaking an outer transaction
+  with transaction.atomic():
+    snapshot, _ = Snapshot.objects.get_or_create(
+      stream_id=stream_id, event_type=event_type, schema_version=schema_version, version=version,
+      defaults=dict(snapshot_data=snapshot_data)
+    )
+
+  return snapshot
+
+
+def get_stream_versions(event_type):
+  # returns a (stream_id, latest event_sequence) tuple per stream
+  ret_val = (
+    Event.objects
+      .filter(event_type=event_type)
+      .values('stream_id')
+      .annotate(version=Max('event_sequence'))
+      .order_by('stream_id')
+      .values_list('stream_id', 'version')
+  )
+  return ret_val
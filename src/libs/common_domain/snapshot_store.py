@@ -0,0 +1,57 @@
+import logging
+import pickle
+
+from django.conf import settings
+
+from src.libs.common_domain import snapshot_repository
+
+logger = logging.getLogger(__name__)
+
+
+def serialize(aggregate):
+  return pickle.dumps(aggregate.to_snapshot(), pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize(aggregate_class, data):
+  return aggregate_class.from_snapshot(pickle.loads(data))
+
+
+def save_snapshot(aggregate, _snapshot_repository=None):
+  if not _snapshot_repository: _snapshot_repository = snapshot_repository
+
+  aggregate_class = aggregate.__class__
+  snapshot_data = serialize(aggregate)
+
+  return _snapshot_repository.create_snapshot(
+    aggregate.id, aggregate_class.__name__, aggregate_class.snapshot_schema_version, aggregate.version, snapshot_data
+  )
+
+
+def load_snapshot(aggregate_class, aggregate_id, _snapshot_repository=None):
+  if not _snapshot_repository: _snapshot_repository = snapshot_repository
+
+  snapshot = _snapshot_repository.get_latest_snapshot(
+    aggregate_class.__name__, aggregate_id, aggregate_class.snapshot_schema_version
+  )
+
+  if not snapshot:
+    return None
+
+  try:
+    ret_val = deserialize(aggregate_class, bytes(snapshot.snapshot_data))
+  except Exception:
+    # a snapshot is only ever an optimization, the events are the source of truth
+    logger.warn("Unable to load snapshot: %s", snapshot, exc_info=True)
+    ret_val = None
+
+  return ret_val
+
+
+def should_take_snapshot(previous_version, current_version):
+  # take one each time the number of events in the stream crosses a multiple of the interval
+  interval = settings.AGGREGATE_SNAPSHOT_INTERVAL
+
+  if not interval:
+    return False
+
+  return (current_version + 1) // interval > (previous_version + 1) // interval
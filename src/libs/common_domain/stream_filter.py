@@ -0,0 +1,61 @@
+"""
+An optional, per-process Bloom filter of the streams in the event store, so asking whether a stream exists on a hot
+path doesn't cost a query when it doesn't.
+
+The filter is rebuilt from the streams table every `AGGREGATE_EXISTENCE_FILTER_REFRESH_INTERVAL` seconds and the streams
+this process appends to are added as they are saved. A stream another process created since the last rebuild reads as
+missing until the next one, so only use it where a wrong "missing" is caught anyway. ie: creating the aggregate with an
+expected version of -1 fails on the event store's unique constraint.
+"""
+import logging
+import time
+
+from django.conf import settings
+
+from src.libs.common_domain import stream_repository
+from src.libs.common_domain.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+_filter = None
+_refreshed_at = None
+
+
+def might_exist(event_type, stream_id, _stream_repository=None, _time=None):
+  if not settings.AGGREGATE_EXISTENCE_FILTER_ENABLED:
+    return True
+
+  if not _time: _time = time.time
+
+  if _filter is None or _time() - _refreshed_at > settings.AGGREGATE_EXISTENCE_FILTER_REFRESH_INTERVAL:
+    refresh(_stream_repository, _time)
+
+  return _get_key(event_type, stream_id) in _filter
+
+
+def add(event_type, stream_id):
+  if _filter is not None:
+    _filter.add(_get_key(event_type, stream_id))
+
+
+def refresh(_stream_repository=None, _time=None):
+  global _filter, _refreshed_at
+
+  if not _stream_repository: _stream_repository = stream_repository
+  if not _time: _time = time.time
+
+  refreshed_at = _time()
+  bloom_filter = BloomFilter(settings.AGGREGATE_EXISTENCE_FILTER_CAPACITY)
+
+  for event_type, stream_id in _stream_repository.get_stream_ids():
+    bloom_filter.add(_get_key(event_type, stream_id))
+
+  if bloom_filter.count > bloom_filter.capacity:
+    logger.warn("The stream filter holds %i streams, more than its capacity of %i. Its false positive rate goes up.",
+                bloom_filter.count, bloom_filter.capacity)
+
+  _filter, _refreshed_at = bloom_filter, refreshed_at
+
+
+def _get_key(event_type, stream_id):
+  return '{0}:{1}'.format(event_type, stream_id)
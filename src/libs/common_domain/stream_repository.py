@@ -0,0 +1,16 @@
+from src.libs.common_domain.models import Stream
+
+
+def get_version(event_type, stream_id):
+  version = Stream.objects.filter(stream_id=stream_id, event_type=event_type).values_list('version', flat=True)
+
+  return version[0] if version else None
+
+
+def get_stream_ids(event_type=None):
+  streams = Stream.objects.all()
+
+  if event_type is not None:
+    streams = streams.filter(event_type=event_type)
+
+  return streams.values_list('event_type', 'stream_id').iterator()
@@ -0,0 +1,205 @@
+import logging
+import time
+
+from django.conf import settings
+
+from src.libs.common_domain import advisory_lock, dispatcher, event_service, event_registry
+from src.libs.common_domain import event_repository, checkpoint_repository
+from src.libs.python_utils.types.type_utils import load_object
+
+logger = logging.getLogger(__name__)
+
+_receivers = {}
+
+# the position every subscription started from, by name. it never changes once the subscription started.
+_start_positions = {}
+_start_positions_checked = {}
+
+
+def get_subscription_names():
+  return sorted(settings.EVENT_SUBSCRIPTIONS)
+
+
+def get_receivers(name):
+  if name not in _receivers:
+    _receivers[name] = [load_object(path) for path in settings.EVENT_SUBSCRIPTIONS[name]]
+
+  return _receivers[name]
+
+
+def get_checkpoint_name(name):
+  return 'subscription:' + name
+
+
+def get_start_checkpoint_name(name):
+  return 'subscription-start:' + name
+
+
+def get_live_excluded_receivers(position, _checkpoint_repository=None):
+  """
+  The receivers live dispatch (the event store, the outbox relay and the projection runner) leaves out of the event at
+  `position`: with `EVENT_SUBSCRIPTIONS_ENABLED` a subscription's worker is the only one to feed its receivers the
+  events after the position it started from. Until it starts they're dispatched live.
+
+  The start of a subscription that hasn't started is looked up again every EVENT_SUBSCRIPTION_POLL_INTERVAL. An event
+  it catches up that was dispatched live in the meantime is dispatched twice, which its idempotent receivers tolerate.
+  """
+  if not _checkpoint_repository:    _checkpoint_repository = checkpoint_repository
+
+  if not settings.EVENT_SUBSCRIPTIONS_ENABLED:
+    return []
+
+  ret_val = []
+
+  for name in get_subscription_names():
+    start_position = _get_start_position(name, _checkpoint_repository)
+
+    if start_position is not None and position > start_position:
+      ret_val.extend(get_receivers(name))
+
+  return ret_val
+
+
+def _get_start_position(name, _checkpoint_repository):
+  if name in _start_positions:
+    return _start_positions[name]
+
+  now = time.time()
+
+  if now - _start_positions_checked.get(name, 0) < settings.EVENT_SUBSCRIPTION_POLL_INTERVAL:
+    return None
+
+  _start_positions_checked[name] = now
+  start_position = _checkpoint_repository.get_position(get_start_checkpoint_name(name), None)
+
+  if start_position is not None:
+    _start_positions[name] = start_position
+
+  return start_position
+
+
+def catch_up(name, batch_size=None, _event_repository=None, _event_service=None, _event_dispatcher=None,
+             _event_registry=None, _checkpoint_repository=None, _advisory_lock=None):
+  """
+  Feeds a subscription the events appended since its checkpoint, saving the checkpoint after every batch. A single
+  worker catches a subscription up at a time, the others skip it until it's done.
+
+  A subscription that hasn't started starts from the last event, the events until it were dispatched live. From then
+  on its receivers only get events from it, refer to `get_live_excluded_receivers`, so its checkpoint tells which of
+  them it handled. Rebuilding a projection from the first event is what `reset` is for.
+
+  Subscriptions are delivered at least once so only idempotent receivers should be subscribed. A subscription stops at
+  the first event that fails, the checkpoint is left before it so it's retried on the next catch up. Returns the number
+  of events processed.
+  """
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_service:    _event_service = event_service
+  if not _event_dispatcher:    _event_dispatcher = dispatcher
+  if not _event_registry:    _event_registry = event_registry
+  if not _checkpoint_repository:    _checkpoint_repository = checkpoint_repository
+  if not _advisory_lock:    _advisory_lock = advisory_lock
+
+  if not batch_size: batch_size = settings.EVENT_SUBSCRIPTION_BATCH_SIZE
+
+  checkpoint_name = get_checkpoint_name(name)
+
+  with _advisory_lock.try_lock(checkpoint_name) as locked:
+    if not locked:
+      logger.debug("Subscription %s is caught up by another worker", name)
+      return 0
+
+    return _catch_up(name, checkpoint_name, batch_size, _event_repository, _event_service, _event_dispatcher,
+                     _event_registry, _checkpoint_repository)
+
+
+def _catch_up(name, checkpoint_name, batch_size, _event_repository, _event_service, _event_dispatcher, _event_registry,
+              _checkpoint_repository):
+  receivers = get_receivers(name)
+  event_names = _event_registry.get_event_names_for_receivers(receivers)
+
+  # positions are handed out in commit order, every event up to here is visible. the checkpoint moves up to it even
+  # when none of the events are for this subscription
+  last_position = _event_repository.get_last_position()
+
+  start_checkpoint_name = get_start_checkpoint_name(name)
+
+  if _checkpoint_repository.get_position(start_checkpoint_name, None) is None:
+    # a checkpoint from before the subscription started, ie: a manual run, is behind the events dispatched live
+    _checkpoint_repository.save_position(checkpoint_name, last_position)
+    _checkpoint_repository.save_position(start_checkpoint_name, last_position)
+    logger.info("Subscription %s starts from position: %i", name, last_position)
+    return 0
+
+  position = saved_position = _checkpoint_repository.get_position(checkpoint_name)
+
+  counter = 0
+
+  for event in _event_repository.get_event_records(position, batch_size, event_names):
+    try:
+      domain_event = _event_service.load_domain_event_from_event_record(event)
+      _event_dispatcher.publish_event(event.stream_id, domain_event, event.event_sequence, receivers)
+    except Exception:
+      # the events after it wait, skipping it would leave the projection behind for good
+      if position != saved_position:
+        _checkpoint_repository.save_position(checkpoint_name, position)
+
+      logger.error("Error sending %s to subscription %s: %s", event.event_name, name, event.position)
+      raise
+
+    position = event.position
+    counter += 1
+
+    if counter % batch_size == 0:
+      saved_position = _checkpoint_repository.save_position(checkpoint_name, position).position
+
+  position = max(position, last_position)
+  if position != saved_position:
+    _checkpoint_repository.save_position(checkpoint_name, position)
+
+  if counter:
+    logger.info("Subscription %s caught up %i events to position: %i", name, counter, position)
+
+  return counter
+
+
+def reset(name, _event_repository=None, _checkpoint_repository=None):
+  # the subscription is rebuilt from the first event. one that hasn't started starts here so the catch up doesn't skip
+  # to the last event
+  if not _event_repository:    _event_repository = event_repository
+  if not _checkpoint_repository:    _checkpoint_repository = checkpoint_repository
+
+  _checkpoint_repository.save_position(get_checkpoint_name(name), 0)
+
+  start_checkpoint_name = get_start_checkpoint_name(name)
+  if _checkpoint_repository.get_position(start_checkpoint_name, None) is None:
+    _checkpoint_repository.save_position(start_checkpoint_name, _event_repository.get_last_position())
+
+
+def get_lag(name, _event_repository=None, _checkpoint_repository=None):
+  if not _event_repository:    _event_repository = event_repository
+  if not _checkpoint_repository:    _checkpoint_repository = checkpoint_repository
+
+  position = _checkpoint_repository.get_position(get_checkpoint_name(name))
+
+  return position, _event_repository.get_last_position() - position
+
+
+def run(names, poll_interval=None, once=False, _sleep=None):
+  if not poll_interval: poll_interval = settings.EVENT_SUBSCRIPTION_POLL_INTERVAL
+  if not _sleep: _sleep = time.sleep
+
+  while True:
+    processed = 0
+
+    for name in names:
+      try:
+        processed += catch_up(name)
+      except Exception:
+        logger.warn("Error catching up subscription: %s", name, exc_info=True)
+
+    if once:
+      return
+
+    # keep going without waiting while there is a backlog
+    if not processed:
+      _sleep(poll_interval)
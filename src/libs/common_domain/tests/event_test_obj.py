@@ -19,3 +19,13 @@ class DummyCreated1(DomainEvent):
     super().__init__()
     self.id = id
     self.name = name
+
+
+class DummyScheduled1(DomainEvent):
+  event_func_name = 'scheduled_1'
+  event_signal = EventSignal()
+
+  def __init__(self, name, due_date):
+    super().__init__()
+    self.name = name
+    self.due_date = due_date
@@ -1,5 +1,8 @@
+import pytest
+
+from src.libs.common_domain.aggregate_base import AggregateBase
 from src.libs.common_domain.tests.aggregate_test_obj import DummyAggregate
-from src.libs.common_domain.tests.event_test_obj import DummyChangedName1
+from src.libs.common_domain.tests.event_test_obj import DummyChangedName1, DummyCreated1
 
 
 def test_aggregate_base_handles_event():
@@ -18,3 +21,47 @@ def test_aggregate_base_sends_events():
   aggregate_test.change_name('hello')
 
   assert aggregate_test.name == 'hello'
+
+
+
+def test_aggregate_base_resolves_handlers_when_the_class_is_created():
+  assert set(DummyAggregate._event_handlers) == {'created_1', 'changed_name_1'}
+
+
+def test_aggregate_base_raises_for_events_without_handler():
+  class NoHandlerAggregate(AggregateBase):
+    @classmethod
+    def from_attrs(cls):
+      return cls()
+
+  with pytest.raises(NotImplementedError):
+    NoHandlerAggregate.from_attrs().apply_event(DummyChangedName1('hello'))
+
+
+def test_aggregate_base_slotted_state_round_trips_snapshots():
+  class SlottedAggregate(AggregateBase):
+    state_fields = ('id', 'name')
+
+    @classmethod
+    def from_attrs(cls, id, name):
+      ret_val = cls()
+      ret_val._raise_event(DummyCreated1(id, name))
+      return ret_val
+
+    def _handle_created_1_event(self, event):
+      self.id = event.id
+      self.name = event.name
+
+    def _handle_changed_name_1_event(self, event):
+      self.name = event.name
+
+  aggregate_test = SlottedAggregate.from_attrs('12345', 'test')
+  aggregate_test.apply_event(DummyChangedName1('hello'))
+
+  assert not hasattr(aggregate_test, '__dict__')
+
+  state = aggregate_test.to_snapshot()
+  assert state == {'id': '12345', 'name': 'hello', 'version': 1}
+
+  loaded = SlottedAggregate.from_snapshot(state)
+  assert (loaded.id, loaded.name, loaded.version, loaded.uncommitted_events) == ('12345', 'hello', 1, [])
@@ -0,0 +1,29 @@
+from src.libs.common_domain.aggregate_cache import AggregateCache
+from src.libs.common_domain.tests.aggregate_test_obj import DummyAggregate
+
+
+def test_aggregate_cache_returns_copies():
+  aggregate_cache = AggregateCache(1024)
+  aggregate_cache.put(DummyAggregate.from_attrs('12345', 'hello'))
+
+  aggregate_test = aggregate_cache.get(DummyAggregate, '12345')
+  aggregate_test.change_name('world')
+
+  assert aggregate_cache.get(DummyAggregate, '12345').name == 'hello'
+  assert aggregate_cache.get(DummyAggregate, 'abcde') is None
+  assert aggregate_cache.stats['hits'] == 2
+  assert aggregate_cache.stats['misses'] == 1
+
+
+def test_aggregate_cache_evicts_least_recently_used():
+  aggregate_cache = AggregateCache(1024)
+  aggregate_cache.put(DummyAggregate.from_attrs('12345', 'hello'))
+  aggregate_cache.max_bytes = aggregate_cache.stats['bytes'] * 2
+
+  aggregate_cache.put(DummyAggregate.from_attrs('abcde', 'hello'))
+  aggregate_cache.get(DummyAggregate, '12345')
+  aggregate_cache.put(DummyAggregate.from_attrs('fghij', 'hello'))
+
+  assert aggregate_cache.get(DummyAggregate, 'abcde') is None
+  assert aggregate_cache.get(DummyAggregate, '12345').id == '12345'
+  assert aggregate_cache.stats['entries'] == 2
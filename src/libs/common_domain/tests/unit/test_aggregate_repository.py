@@ -1,8 +1,15 @@
 from unittest.mock import MagicMock
 
-from src.libs.common_domain import event_store
-from src.libs.common_domain import aggregate_repository
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test.utils import override_settings
+
+from src.libs.common_domain import event_store, snapshot_store, shared_aggregate_cache
+from src.libs.common_domain import aggregate_repository, stream_repository, stream_filter
+from src.libs.common_domain.aggregate_cache import AggregateCache
 from src.libs.common_domain.tests.aggregate_test_obj import DummyAggregate
+from src.libs.common_domain.event_repository import EventRecord
+from src.libs.common_domain.tests.event_test_obj import DummyChangedName1, DummyCreated1
 
 
 def test_aggregate_repository_marks_events_as_committed():
@@ -13,3 +20,184 @@ def test_aggregate_repository_marks_events_as_committed():
   aggregate_repository.save(aggregate_test, -1, event_store_mock)
 
   assert len(aggregate_test._uncommitted_events) == 0
+
+
+def test_aggregate_repository_loads_events_after_snapshot():
+  snapshot = DummyAggregate.from_attrs('12345', 'hello')
+  snapshot.mark_events_as_committed()
+  snapshot_store_mock = MagicMock(spec=snapshot_store)
+  snapshot_store_mock.load_snapshot = MagicMock(return_value=snapshot)
+  event_store_mock = MagicMock(spec=event_store)
+  event_store_mock.load_events = MagicMock(return_value=['record'])
+  event_store_mock.load_domain_event_from_event_record = MagicMock(return_value=DummyChangedName1('world'))
+
+  aggregate_test = aggregate_repository.get(DummyAggregate, '12345', event_store_mock, snapshot_store_mock,
+                                            AggregateCache(1024))
+
+  event_store_mock.load_events.assert_called_once_with('DummyAggregate', '12345', 0)
+  assert aggregate_test.name == 'world'
+  assert aggregate_test.version == 1
+
+
+@override_settings(AGGREGATE_SNAPSHOT_INTERVAL=2)
+def test_aggregate_repository_saves_snapshot_at_interval():
+  aggregate_test = DummyAggregate.from_attrs('12345', 'hello')
+  aggregate_test.change_name('world')
+  event_store_mock = MagicMock(spec=event_store)
+  snapshot_store_mock = MagicMock(spec=snapshot_store)
+  snapshot_store_mock.should_take_snapshot = snapshot_store.should_take_snapshot
+
+  aggregate_repository.save(aggregate_test, -1, event_store_mock, snapshot_store_mock)
+
+  snapshot_store_mock.save_snapshot.assert_called_once_with(aggregate_test)
+
+
+def test_aggregate_repository_loads_events_after_cached_aggregate():
+  aggregate_cache = AggregateCache(1024)
+  aggregate_test = DummyAggregate.from_attrs('12345', 'hello')
+  event_store_mock = MagicMock(spec=event_store)
+  snapshot_store_mock = MagicMock(spec=snapshot_store)
+  snapshot_store_mock.should_take_snapshot = MagicMock(return_value=False)
+  aggregate_repository.save(aggregate_test, -1, event_store_mock, snapshot_store_mock, aggregate_cache)
+  event_store_mock.load_events = MagicMock(return_value=[])
+
+  aggregate_test = aggregate_repository.get(DummyAggregate, '12345', event_store_mock, snapshot_store_mock,
+                                            aggregate_cache)
+
+  event_store_mock.load_events.assert_called_once_with('DummyAggregate', '12345', 0)
+  assert not snapshot_store_mock.load_snapshot.called
+  assert aggregate_test.name == 'hello'
+
+
+@override_settings(AGGREGATE_SHARED_CACHE_ENABLED=True)
+def test_aggregate_repository_tops_up_shared_cache_entry():
+  shared_cache = LocMemCache('aggregates', {})
+  shared_cache_mock = MagicMock(spec=shared_aggregate_cache)
+  shared_cache_mock.get = lambda *args: shared_aggregate_cache.get(*args, _cache=shared_cache)
+  shared_cache_mock.put = lambda *args: shared_aggregate_cache.put(*args, _cache=shared_cache)
+  aggregate_test = DummyAggregate.from_attrs('12345', 'hello')
+  aggregate_test.mark_events_as_committed()
+  shared_cache_mock.put(aggregate_test)
+  event_store_mock = MagicMock(spec=event_store)
+  event_store_mock.load_events = MagicMock(return_value=['record'])
+  event_store_mock.load_domain_event_from_event_record = MagicMock(return_value=DummyChangedName1('world'))
+  snapshot_store_mock = MagicMock(spec=snapshot_store)
+
+  aggregate_test = aggregate_repository.get(DummyAggregate, '12345', event_store_mock, snapshot_store_mock,
+                                            AggregateCache(1024), shared_cache_mock)
+
+  event_store_mock.load_events.assert_called_once_with('DummyAggregate', '12345', 0)
+  assert aggregate_test.name == 'world'
+  assert shared_cache_mock.get(DummyAggregate, '12345').version == 1
+
+
+@override_settings(AGGREGATE_SHARED_CACHE_ENABLED=True)
+def test_aggregate_repository_shared_cache_skips_an_entry_it_cant_read():
+  shared_cache = LocMemCache('aggregates', {})
+  shared_cache.set(shared_aggregate_cache._get_key(DummyAggregate, '12345'), (0, b'not a snapshot'))
+
+  assert shared_aggregate_cache.get(DummyAggregate, '12345', _cache=shared_cache) is None
+
+
+def test_aggregate_repository_invalidates_both_caches_when_the_save_fails():
+  aggregate_test = DummyAggregate.from_attrs('12345', 'hello')
+  event_store_mock = MagicMock(spec=event_store)
+  event_store_mock.save_events = MagicMock(side_effect=ValueError())
+  event_store_mock.save_events_for_streams = MagicMock(side_effect=ValueError())
+  aggregate_cache_mock = MagicMock(spec=AggregateCache)
+  shared_cache_mock = MagicMock(spec=shared_aggregate_cache)
+
+  with pytest.raises(ValueError):
+    aggregate_repository.save(aggregate_test, -1, event_store_mock, MagicMock(spec=snapshot_store),
+                              aggregate_cache_mock, shared_cache_mock)
+
+  with pytest.raises(ValueError):
+    aggregate_repository.save_many([(aggregate_test, -1)], event_store_mock, MagicMock(spec=snapshot_store),
+                                   aggregate_cache_mock, shared_cache_mock)
+
+  assert aggregate_cache_mock.invalidate.call_count == 2
+  assert shared_cache_mock.invalidate.call_count == 2
+  shared_cache_mock.invalidate.assert_called_with(DummyAggregate, '12345')
+  assert not shared_cache_mock.put.called
+
+
+@override_settings(AGGREGATE_EXISTENCE_FILTER_ENABLED=True)
+def test_aggregate_repository_exists_skips_the_query_for_filtered_out_streams():
+  stream_repo_mock = MagicMock(spec=stream_repository)
+  stream_repo_mock.get_stream_ids = MagicMock(return_value=[('DummyAggregate', '12345')])
+  stream_repo_mock.get_version = MagicMock(return_value=3)
+  stream_filter.refresh(stream_repo_mock)
+
+  try:
+    assert aggregate_repository.exists(DummyAggregate, '12345', True, stream_repo_mock)
+    assert not aggregate_repository.exists(DummyAggregate, '67890', True, stream_repo_mock)
+    assert aggregate_repository.exists(DummyAggregate, '67890', False, stream_repo_mock)
+  finally:
+    stream_filter._filter = None
+
+  assert stream_repo_mock.get_version.call_count == 2
+
+
+def test_aggregate_repository_gets_many_with_one_query():
+  cached = DummyAggregate.from_attrs('abc', 'hello')
+  cached.mark_events_as_committed()
+  current = DummyAggregate.from_attrs('jkl', 'hello')
+  current.mark_events_as_committed()
+  aggregate_cache = AggregateCache(1024 * 1024)
+  aggregate_cache.put(cached)
+  # without newer events
+  aggregate_cache.put(current)
+
+  event_store_mock = MagicMock(spec=event_store)
+  event_store_mock.load_events_for_streams = MagicMock(return_value=[
+    EventRecord(4, 'abc', 'DummyAggregate', 1, 'changed_name', None),
+    EventRecord(2, 'def', 'DummyAggregate', 0, 'created', None),
+  ])
+  event_store_mock.load_domain_event_from_event_record = MagicMock(side_effect=[
+    DummyChangedName1('world'), DummyCreated1('def', 'other')
+  ])
+
+  aggregates = aggregate_repository.get_many(DummyAggregate, ['abc', 'def', 'ghi', 'abc', 'jkl'], event_store_mock,
+                                             aggregate_cache)
+
+  # only the events after the cached versions are read
+  event_store_mock.load_events_for_streams.assert_called_once_with('DummyAggregate', ['abc', 'def', 'ghi', 'jkl'],
+                                                                   {'abc': 0, 'jkl': 0})
+  assert sorted(aggregates) == ['abc', 'def', 'jkl']
+  assert (aggregates['abc'].name, aggregates['abc'].version) == ('world', 1)
+  assert (aggregates['def'].name, aggregates['def'].version) == ('other', 0)
+  assert (aggregates['jkl'].name, aggregates['jkl'].version) == ('hello', 0)
+
+
+def test_aggregate_repository_saves_many_in_one_call():
+  first = DummyAggregate.from_attrs('abc', 'hello')
+  second = DummyAggregate.from_attrs('def', 'hello')
+  second.change_name('world')
+  untouched = DummyAggregate.from_attrs('ghi', 'hello')
+  untouched.mark_events_as_committed()
+  event_store_mock = MagicMock(spec=event_store)
+
+  aggregate_repository.save_many([(first, -1), (second, -1), (untouched, 0)], event_store_mock,
+                                 MagicMock(spec=snapshot_store), AggregateCache(1024 * 1024))
+
+  streams = event_store_mock.save_events_for_streams.call_args[0][0]
+  assert [(s[0], s[1], s[2]) for s in streams] == [('abc', -1, 'DummyAggregate'), ('def', -1, 'DummyAggregate')]
+  assert not first.uncommitted_events and not second.uncommitted_events
+
+
+def test_aggregate_repository_leaves_caches_alone_in_a_transaction(monkeypatch):
+  monkeypatch.setattr(aggregate_repository, '_in_transaction', lambda: True)
+  aggregate_cache = AggregateCache(1024 * 1024)
+  shared_cache_mock = MagicMock(spec=shared_aggregate_cache)
+  aggregate_test = DummyAggregate.from_attrs('12345', 'hello')
+  aggregate_test.mark_events_as_committed()
+  aggregate_cache.put(aggregate_test)
+  aggregate_test.change_name('world')
+
+  aggregate_repository.save(aggregate_test, 0, MagicMock(spec=event_store), MagicMock(spec=snapshot_store),
+                            aggregate_cache, shared_cache_mock)
+
+  # the events may still be rolled back, the aggregate is read from the event store until they're committed
+  assert aggregate_cache.get(DummyAggregate, '12345') is None
+  shared_cache_mock.invalidate.assert_called_once_with(DummyAggregate, '12345')
+  assert not shared_cache_mock.put.called
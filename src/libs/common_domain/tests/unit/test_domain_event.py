@@ -0,0 +1,45 @@
+import pickle
+
+import pytest
+
+from src.libs.common_domain.domain_event import DomainEvent
+from src.libs.common_domain.event_signal import EventSignal
+
+
+class DummyRenamed1(DomainEvent):
+  event_func_name = 'renamed_1'
+  event_signal = EventSignal()
+
+  fields = ('name', 'previous_name')
+
+
+def test_domain_event_generates_init_from_fields():
+  event = DummyRenamed1('hello', previous_name='test')
+
+  assert (event.name, event.previous_name) == ('hello', 'test')
+  assert not hasattr(event, '__dict__')
+
+  with pytest.raises(TypeError):
+    DummyRenamed1('hello')
+
+
+def test_domain_event_data_is_a_copy_of_the_fields():
+  event = DummyRenamed1('hello', 'test')
+
+  data = event.data
+  data['name'] = 'changed'
+
+  assert data == {'name': 'changed', 'previous_name': 'test'}
+  assert event.to_dict() == {'name': 'hello', 'previous_name': 'test'}
+
+
+def test_domain_event_pickles():
+  event = pickle.loads(pickle.dumps(DummyRenamed1('hello', 'test'), 0))
+
+  assert event.to_dict() == {'name': 'hello', 'previous_name': 'test'}
+
+
+def test_domain_event_rejects_invalid_field_names():
+  with pytest.raises(TypeError):
+    class InvalidEvent1(DomainEvent):
+      fields = ('name', 'class')
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import django_rq
+from redis import StrictRedis
+from rq.job import Job
+
+from src.libs.common_domain.enqueue_buffer import job, enqueue_buffer
+
+
+def _get_queue_mock(connection):
+  def get_queue(name):
+    queue = MagicMock(job_class=Job, connection=connection, _async=True, _default_timeout=None, DEFAULT_TIMEOUT=180)
+    queue.name = name
+    return queue
+
+  return get_queue
+
+
+def test_enqueue_buffer_pushes_all_jobs_with_one_pipeline(monkeypatch):
+  connection = MagicMock(spec=StrictRedis)
+  connection._pipeline = MagicMock()
+  monkeypatch.setattr(django_rq, 'get_queue', _get_queue_mock(connection))
+
+  @job('high')
+  def high_task(x):
+    pass
+
+  @job('default')
+  def default_task(x):
+    pass
+
+  with enqueue_buffer('test'):
+    high_task.delay(1)
+    default_task.delay(2)
+
+    with enqueue_buffer('nested'):
+      high_task.delay(3)
+
+    assert not connection._pipeline.called
+
+  connection._pipeline.assert_called_once_with()
+  pipeline = connection._pipeline.return_value
+  assert pipeline.execute.call_count == 1
+  assert connection.rpush.call_count == 0
+
+
+def test_enqueue_buffer_flushes_digests_into_the_buffer(monkeypatch):
+  connection = MagicMock(spec=StrictRedis)
+  connection._pipeline = MagicMock()
+  monkeypatch.setattr(django_rq, 'get_queue', _get_queue_mock(connection))
+
+  @job('default')
+  def merged_task(items):
+    pass
+
+  class Digest(object):
+    def __init__(self):
+      self.items = []
+
+    def add(self, item):
+      self.items.append(item)
+
+    def flush(self):
+      merged_task.delay(self.items)
+
+  with enqueue_buffer('test') as buffer:
+    digest = buffer.digest('test digest', Digest)
+    digest.add(1)
+
+    with enqueue_buffer('nested') as nested_buffer:
+      nested_buffer.digest('test digest', Digest).add(2)
+
+    assert not buffer.jobs
+
+  assert digest.items == [1, 2]
+  # the merged job was pushed with the buffer's pipeline
+  pipeline = connection._pipeline.return_value
+  assert pipeline.execute.call_count == 1
+  assert not buffer.digests
+
+
+def test_enqueue_buffer_pushes_nothing_once_cleared(monkeypatch):
+  connection = MagicMock(spec=StrictRedis)
+  connection._pipeline = MagicMock()
+  monkeypatch.setattr(django_rq, 'get_queue', _get_queue_mock(connection))
+
+  @job('default')
+  def default_task(x):
+    pass
+
+  with enqueue_buffer('test') as buffer:
+    default_task.delay(1)
+    buffer.clear()
+
+  assert not connection._pipeline.called
@@ -0,0 +1,22 @@
+import datetime
+
+from src.libs.common_domain import event_registry
+from src.libs.common_domain.tests.event_test_obj import DummyScheduled1
+
+
+def test_event_registry_hydrates_date_fields():
+  event_name = event_registry.get_event_name(DummyScheduled1)
+
+  event = event_registry.get_hydrator(event_name).hydrate({'name': 'hello', 'due_date': '2015-09-01T10:30:00Z'})
+
+  assert event.__class__ == DummyScheduled1
+  assert event.name == 'hello'
+  assert event.due_date == datetime.datetime(2015, 9, 1, 10, 30, tzinfo=event.due_date.tzinfo)
+
+
+def test_event_registry_skips_empty_dates():
+  event_name = event_registry.get_event_name(DummyScheduled1)
+
+  event = event_registry.get_hydrator(event_name).hydrate({'name': 'hello', 'due_date': None})
+
+  assert event.due_date is None
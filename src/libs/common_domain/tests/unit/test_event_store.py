@@ -2,7 +2,8 @@ from unittest.mock import MagicMock
 
 from django.dispatch import receiver
 
-from src.libs.common_domain import event_store, event_repository
+from src.libs.common_domain import event_store, event_repository, event_registry, checkpoint_repository, dispatcher
+from src.libs.common_domain.event_repository import EventRecord
 from src.libs.common_domain.models import Event
 from src.libs.common_domain.tests.event_test_obj import DummyChangedName1
 
@@ -24,3 +25,71 @@ def test_event_store_sends_event_in_order():
   event_store.save_events(event_id, expected_version, 'test', events, event_repo_mock)
 
   assert results == ['hello', 'world']
+
+
+def test_event_store_replays_events_in_position_order():
+  results = []
+
+  @receiver(DummyChangedName1.event_signal)
+  def side_effect(**kwargs):
+    results.append((kwargs['aggregate_id'], kwargs['event'].name))
+
+  event_name = event_registry.get_event_name(DummyChangedName1)
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_last_position = MagicMock(return_value=2)
+  event_repo_mock.get_event_records = MagicMock(return_value=[
+    EventRecord(1, 'abc', 'test', 0, event_name, {'name': 'hello'}),
+    EventRecord(2, 'def', 'test', 0, event_name, {'name': 'world'}),
+  ])
+
+  event_store.replay_events(_event_repository=event_repo_mock)
+
+  assert results == [('abc', 'hello'), ('def', 'world')]
+
+
+def test_event_store_replays_only_to_receivers_from_checkpoint():
+  results = []
+  skipped = []
+
+  def side_effect(**kwargs):
+    results.append(kwargs['event'].name)
+
+  def other_side_effect(**kwargs):
+    skipped.append(kwargs['event'].name)
+
+  DummyChangedName1.event_signal.connect(side_effect)
+  DummyChangedName1.event_signal.connect(other_side_effect)
+
+  event_name = event_registry.get_event_name(DummyChangedName1)
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_last_position = MagicMock(return_value=3)
+  event_repo_mock.get_event_records = MagicMock(return_value=[
+    EventRecord(2, 'abc', 'test', 1, event_name, {'name': 'hello'}),
+    EventRecord(3, 'abc', 'test', 2, event_name, {'name': 'world'}),
+  ])
+  checkpoint_repo_mock = MagicMock(spec=checkpoint_repository)
+  checkpoint_repo_mock.get_position = MagicMock(return_value=1)
+
+  count = event_store.replay_events([side_effect], 'test', 1, _event_repository=event_repo_mock,
+                                    _checkpoint_repository=checkpoint_repo_mock)
+
+  assert count == 2
+  assert results == ['hello', 'world']
+  assert skipped == []
+  assert event_repo_mock.get_event_records.call_args[0] == (1,)
+  assert event_name in event_repo_mock.get_event_records.call_args[1]['event_names']
+  checkpoint_repo_mock.save_position.assert_called_with('test', 3)
+  checkpoint_repo_mock.delete_checkpoint.assert_called_once_with('test')
+
+
+def test_event_store_writes_to_outbox_instead_of_publishing(settings):
+  settings.EVENT_OUTBOX_ENABLED = True
+
+  event_repo_mock = MagicMock(spec=event_repository)
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  events = [DummyChangedName1('hello')]
+
+  event_store.save_events('12345', -1, 'test', events, event_repo_mock, dispatcher_mock)
+
+  event_repo_mock.create_events.assert_called_once_with('12345', -1, 'test', events, outbox=True)
+  assert not dispatcher_mock.publish_event.called
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock, call
+
+from django.test.utils import override_settings
+
+from src.libs.common_domain import outbox_relay, outbox_repository, event_repository, event_service, dispatcher
+from src.libs.common_domain import advisory_lock
+from src.libs.common_domain.event_repository import EventRecord
+
+
+def test_outbox_relay_removes_only_the_published_events():
+  outbox_repo_mock = MagicMock(spec=outbox_repository)
+  outbox_repo_mock.get_pending_positions = MagicMock(return_value=[1, 2, 3])
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_event_records_at = MagicMock(return_value=[
+    EventRecord(1, 'abc', 'test', 0, 'event', {}),
+    EventRecord(2, 'abc', 'test', 1, 'event', {}),
+    EventRecord(3, 'def', 'test', 0, 'event', {}),
+  ])
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  dispatcher_mock.publish_event = MagicMock(side_effect=[None, Exception(), None])
+
+  count = outbox_relay.relay_batch(10, outbox_repo_mock, event_repo_mock, MagicMock(spec=event_service),
+                                   dispatcher_mock)
+
+  assert count == 1
+  outbox_repo_mock.get_pending_positions.assert_called_once_with(10)
+  outbox_repo_mock.delete_positions.assert_called_once_with([1])
+
+
+@override_settings(EVENT_OUTBOX_MAX_ATTEMPTS=3)
+def test_outbox_relay_moves_aside_an_event_that_keeps_failing():
+  outbox_repo_mock = MagicMock(spec=outbox_repository)
+  outbox_repo_mock.get_pending_positions = MagicMock(return_value=[1, 2])
+  outbox_repo_mock.record_failure = MagicMock(return_value=True)
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_event_records_at = MagicMock(return_value=[
+    EventRecord(1, 'abc', 'test', 0, 'event', {}),
+    EventRecord(2, 'abc', 'test', 1, 'event', {}),
+  ])
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  dispatcher_mock.publish_event = MagicMock(side_effect=Exception())
+
+  count = outbox_relay.relay_batch(10, outbox_repo_mock, event_repo_mock, MagicMock(spec=event_service),
+                                   dispatcher_mock)
+
+  assert count == 0
+  outbox_repo_mock.record_failure.assert_called_once_with(1, 3)
+  assert not outbox_repo_mock.delete_positions.called
+
+
+def test_outbox_relay_skips_the_batch_while_another_relay_publishes():
+  outbox_repo_mock = MagicMock(spec=outbox_repository)
+  lock_mock = MagicMock(spec=advisory_lock)
+  lock_mock.try_lock = MagicMock(return_value=MagicMock(__enter__=MagicMock(return_value=False)))
+
+  count = outbox_relay.relay_batch(10, outbox_repo_mock, MagicMock(spec=event_repository),
+                                   MagicMock(spec=event_service), MagicMock(spec=dispatcher),
+                                   _advisory_lock=lock_mock)
+
+  assert count == 0
+  lock_mock.try_lock.assert_called_once_with('outbox_relay')
+  assert not outbox_repo_mock.get_pending_positions.called
+
+
+@override_settings(EVENT_PROJECTION_RUNNER_ENABLED=True, EVENT_PROJECTION_RUNNER_CHUNK_SIZE=2)
+def test_outbox_relay_hands_the_batch_to_projection_runner_jobs_in_chunks():
+  outbox_repo_mock = MagicMock(spec=outbox_repository)
+  outbox_repo_mock.get_pending_positions = MagicMock(return_value=[1, 2, 3])
+  runner_mock = MagicMock()
+
+  count = outbox_relay.relay_batch(10, outbox_repo_mock, MagicMock(spec=event_repository),
+                                   MagicMock(spec=event_service), MagicMock(spec=dispatcher),
+                                   _projection_runner=runner_mock)
+
+  assert count == 3
+  assert runner_mock.run_projections_task.delay.call_args_list == [call([1, 2]), call([3])]
+  outbox_repo_mock.delete_positions.assert_called_once_with([1, 2, 3])
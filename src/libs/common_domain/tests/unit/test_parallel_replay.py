@@ -0,0 +1,60 @@
+import queue
+from unittest.mock import MagicMock
+
+from src.libs.common_domain import parallel_replay, dispatcher, event_service
+from src.libs.common_domain.event_repository import EventRecord
+
+
+def test_parallel_replay_partitions_streams_consistently():
+  assert parallel_replay.get_partition('abc', 4) == parallel_replay.get_partition('abc', 4)
+  assert {parallel_replay.get_partition(str(i), 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_parallel_replay_worker_reports_out_of_order_events():
+  work_queue = queue.Queue()
+  result_queue = queue.Queue()
+  work_queue.put([
+    EventRecord(1, 'abc', 'test', 0, 'event', {}),
+    EventRecord(2, 'abc', 'test', 2, 'event', {}),
+    EventRecord(3, 'def', 'test', 0, 'event', {}),
+  ])
+  work_queue.put(None)
+  dispatcher_mock = MagicMock(spec=dispatcher)
+
+  parallel_replay.replay_partition(0, work_queue, result_queue, None, False, MagicMock(spec=event_service),
+                                   dispatcher_mock)
+  report = result_queue.get()
+
+  assert dispatcher_mock.publish_event.call_count == 3
+  assert report['count'] == 3
+  assert report['streams'] == 2
+  assert report['out_of_order'] == 1
+
+
+def test_parallel_replay_worker_allows_gaps_when_events_are_filtered():
+  work_queue = queue.Queue()
+  result_queue = queue.Queue()
+  work_queue.put([
+    EventRecord(1, 'abc', 'test', 0, 'event', {}),
+    EventRecord(2, 'abc', 'test', 2, 'event', {}),
+    EventRecord(3, 'abc', 'test', 1, 'event', {}),
+  ])
+  work_queue.put(None)
+
+  parallel_replay.replay_partition(0, work_queue, result_queue, None, True, MagicMock(spec=event_service),
+                                   MagicMock(spec=dispatcher))
+  report = result_queue.get()
+
+  # the skipped sequence 1 is fine, going back to it isn't
+  assert report['out_of_order'] == 1
+
+
+def test_parallel_replay_stops_sending_to_a_dead_worker():
+  work_queue = MagicMock()
+  work_queue.put = MagicMock(side_effect=queue.Full())
+  worker = MagicMock()
+  worker.is_alive = MagicMock(side_effect=[True, True, False])
+
+  assert not parallel_replay._put(work_queue, worker, [], timeout=0)
+  assert work_queue.put.call_count == 2
+  assert work_queue.cancel_join_thread.called
@@ -0,0 +1,130 @@
+import datetime
+import decimal
+import json
+
+import pytest
+from django.test.utils import override_settings
+from pytz import UTC
+
+from src.libs.common_domain import payload_codec, event_service, event_registry, event_repository
+from src.libs.common_domain.domain_event import DomainEvent
+from src.libs.common_domain.event_repository import EventRecord
+from src.libs.common_domain.event_signal import EventSignal
+from src.libs.common_domain.tests.event_test_obj import DummyScheduled1
+
+
+class DummyNoted1(DomainEvent):
+  event_func_name = 'noted_1'
+  event_signal = EventSignal()
+
+  fields = ('note', 'due_date', 'tags')
+
+
+def _round_trip(data):
+  return payload_codec.decode(payload_codec.loads(json.dumps(payload_codec.encode(data), separators=(',', ':'))))
+
+
+def test_payload_codec_keeps_types_anywhere_in_the_payload():
+  data = {
+    'due_date': datetime.datetime(2015, 9, 1, 10, 30, 0, 123456, tzinfo=UTC),
+    'meta': {'seen': [datetime.datetime(2015, 9, 1, 10, 30), datetime.date(2015, 9, 2)]},
+    'amount': decimal.Decimal('10.50'),
+    'name': 'hello',
+  }
+
+  decoded, typed = _round_trip(data)
+
+  assert typed
+  assert decoded == data
+  assert decoded['meta']['seen'][0].tzinfo is None
+
+
+def test_payload_codec_writes_aware_dates_in_utc():
+  eastern = datetime.timezone(datetime.timedelta(hours=-5))
+  data = {'due_date': datetime.datetime(2015, 9, 1, 5, 30, tzinfo=eastern)}
+
+  decoded, _ = _round_trip(data)
+
+  assert decoded['due_date'] == datetime.datetime(2015, 9, 1, 10, 30, tzinfo=UTC)
+  assert decoded['due_date'].tzinfo == UTC
+
+
+def test_payload_codec_leaves_legacy_payloads_as_is():
+  data = {'name': 'hello', 'due_date': '2015-09-01T10:30:00Z', 'meta': {'$dt': 'not a date'}}
+
+  assert payload_codec.decode(payload_codec.loads(json.dumps(data))) == (data, False)
+
+
+def test_payload_codec_keeps_keys_that_look_like_tags():
+  data = {'meta': {'$dt': 'not a date'}, '$d': {'$dec': '1', 'other': 2}}
+
+  assert _round_trip(data) == (data, True)
+
+
+def test_payload_codec_reads_payloads_written_with_other_separators():
+  data = {'due_date': datetime.date(2015, 9, 1)}
+
+  assert payload_codec.decode(payload_codec.loads(json.dumps(payload_codec.encode(data), indent=2))) == (data, True)
+
+
+def test_payload_codec_rejects_unknown_versions():
+  with pytest.raises(ValueError):
+    payload_codec.decode({'_codec': 99, 'data': {}})
+
+
+def test_event_service_loads_codec_and_legacy_payloads():
+  event_name = event_registry.get_event_name(DummyScheduled1)
+  due_date = datetime.datetime(2015, 9, 1, 10, 30, tzinfo=UTC)
+
+  payloads = [
+    payload_codec.encode({'name': 'hello', 'due_date': due_date}),
+    {'name': 'hello', 'due_date': '2015-09-01T10:30:00Z'},
+  ]
+
+  for payload in payloads:
+    payload = payload_codec.loads(json.dumps(payload))
+    event = event_service.load_domain_event_from_event_record(
+      EventRecord(1, 'abcdefgh', 'Dummy', 0, event_name, payload)
+    )
+
+    assert (event.name, event.due_date) == ('hello', due_date)
+
+
+@pytest.mark.parametrize('note', ['short', 'long' * 200])
+def test_payload_codec_binary_round_trip(settings, note):
+  settings.EVENT_PAYLOAD_COMPRESS_MIN_BYTES = 256
+  data = {'note': note, 'due_date': datetime.datetime(2015, 9, 1, 10, 30, tzinfo=UTC), 'tags': ['a', 'b']}
+
+  value = payload_codec.encode_binary(DummyNoted1, data)
+
+  # the keys aren't written and the long payload is compressed
+  assert b'due_date' not in value
+  assert len(value) < 256
+
+  assert payload_codec.decode(payload_codec.decode_binary(DummyNoted1, value)) == (data, True)
+
+
+def test_payload_codec_binary_rejects_changed_fields(settings):
+  settings.EVENT_PAYLOAD_COMPRESS_MIN_BYTES = 256
+  value = payload_codec.encode_binary(DummyNoted1, {'note': 'hello', 'due_date': None, 'tags': []})
+
+  class DummyNoted2(DomainEvent):
+    event_signal = EventSignal()
+
+    fields = ('note', 'tags', 'due_date')
+
+  with pytest.raises(ValueError):
+    payload_codec.decode_binary(DummyNoted2, value)
+
+  with pytest.raises(ValueError):
+    payload_codec.encode_binary(DummyScheduled1, {'name': 'hello', 'due_date': None})
+
+
+def test_payload_codec_only_writes_payloads_once_enabled():
+  event = DummyNoted1(note='hello', due_date=datetime.date(2015, 9, 2), tags=[])
+
+  assert event_repository._get_payload(event) == {'event_data': event.data, 'event_data_bin': None}
+
+  with override_settings(EVENT_PAYLOAD_CODEC_ENABLED=True):
+    assert event_repository._get_payload(event) == {'event_data': payload_codec.encode(event.data),
+                                                    'event_data_bin': None}
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import django_rq
+import django_rq.decorators
+import pytest
+from django.core.exceptions import ObjectDoesNotExist
+from redis import StrictRedis
+from rq.job import Job
+
+from src.libs.common_domain import projection_runner, event_repository, event_service, event_registry
+from src.libs.common_domain.enqueue_buffer import job
+from src.libs.common_domain.event_repository import EventRecord
+from src.libs.common_domain.tests.event_test_obj import DummyCreated1
+
+
+def failing_handler(**kwargs):
+  raise ValueError()
+
+
+def test_projection_runner_runs_handlers_and_their_jobs_on_their_own(monkeypatch):
+  results = []
+  monkeypatch.setattr(django_rq.decorators, 'get_queue', MagicMock())
+  queue_mock = MagicMock(job_class=Job, connection=MagicMock(spec=StrictRedis), _async=False, _default_timeout=None)
+  monkeypatch.setattr(django_rq, 'get_queue', MagicMock(return_value=queue_mock))
+
+  @job('high')
+  def save_task(name):
+    results.append(name)
+
+  @job('high')
+  def failing_task(name):
+    raise ValueError(name)
+
+  def handler(**kwargs):
+    failing_task.delay(kwargs['event'].name)
+    save_task.delay(kwargs['event'].name)
+
+  def other_handler(**kwargs):
+    results.append(kwargs['aggregate_id'])
+
+  for receiver in (handler, failing_handler, other_handler):
+    DummyCreated1.event_signal.connect(receiver)
+
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_event_records_at = MagicMock(return_value=[
+    EventRecord(7, 'abc', 'test', 0, event_registry.get_event_name(DummyCreated1), {'id': 'abc', 'name': 'hello'}),
+    EventRecord(8, 'def', 'test', 0, event_registry.get_event_name(DummyCreated1), {'id': 'def', 'name': 'world'}),
+  ])
+
+  try:
+    count = projection_runner.run_projections_task([7, 8], _event_repository=event_repo_mock)
+  finally:
+    for receiver in (handler, failing_handler, other_handler):
+      DummyCreated1.event_signal.disconnect(receiver)
+
+  assert count == 6
+  event_repo_mock.get_event_records_at.assert_called_once_with([7, 8])
+  assert results == ['hello', 'abc', 'world', 'def']
+  # the failed jobs and handlers are enqueued to be retried on their own
+  handler_path = failing_handler.__module__ + '.failing_handler'
+  assert [c[0][0].args for c in queue_mock.enqueue_job.call_args_list] == [
+    ('hello',), ('world',), (7, handler_path), (8, handler_path)
+  ]
+
+
+def test_projection_runner_retries_a_single_handler():
+  results = []
+
+  def other_handler(**kwargs):
+    results.append(kwargs['aggregate_id'])
+
+  for receiver in (failing_handler, other_handler):
+    DummyCreated1.event_signal.connect(receiver)
+
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_event_records_at = MagicMock(return_value=[
+    EventRecord(7, 'abc', 'test', 0, event_registry.get_event_name(DummyCreated1), {'id': 'abc', 'name': 'hello'}),
+  ])
+
+  try:
+    with pytest.raises(ValueError):
+      projection_runner.run_projection_task(7, failing_handler.__module__ + '.failing_handler',
+                                            _event_repository=event_repo_mock)
+  finally:
+    for receiver in (failing_handler, other_handler):
+      DummyCreated1.event_signal.disconnect(receiver)
+
+  event_repo_mock.get_event_records_at.assert_called_once_with([7])
+  assert results == []
+
+
+def test_projection_runner_fails_when_an_event_is_missing():
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_event_records_at = MagicMock(return_value=[])
+
+  with pytest.raises(ObjectDoesNotExist):
+    projection_runner.run_projections_task([7], _event_repository=event_repo_mock)
@@ -0,0 +1,136 @@
+from unittest.mock import MagicMock, call
+
+import pytest
+from django.test import override_settings
+
+from src.libs.common_domain import subscriptions, event_repository, checkpoint_repository, dispatcher, event_service
+from src.libs.common_domain import event_registry
+from src.libs.common_domain.event_repository import EventRecord
+
+
+def test_subscription_catches_up_from_its_checkpoint():
+  receiver = MagicMock()
+  subscriptions._receivers['test'] = [receiver]
+
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_last_position = MagicMock(return_value=15)
+  event_repo_mock.get_event_records = MagicMock(return_value=[
+    EventRecord(11, 'abc', 'test', 0, 'event', {}),
+    EventRecord(12, 'abc', 'test', 1, 'event', {}),
+    EventRecord(14, 'def', 'test', 0, 'event', {}),
+  ])
+  checkpoint_repo_mock = MagicMock(spec=checkpoint_repository)
+  checkpoint_repo_mock.get_position = MagicMock(return_value=10)
+  checkpoint_repo_mock.save_position = MagicMock(side_effect=lambda name, position: MagicMock(position=position))
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  event_registry_mock = MagicMock(spec=event_registry)
+  event_registry_mock.get_event_names_for_receivers = MagicMock(return_value=['event'])
+
+  try:
+    count = subscriptions.catch_up('test', 2, event_repo_mock, MagicMock(spec=event_service), dispatcher_mock,
+                                   event_registry_mock, checkpoint_repo_mock)
+  finally:
+    del subscriptions._receivers['test']
+
+  assert count == 3
+  event_repo_mock.get_event_records.assert_called_once_with(10, 2, ['event'])
+  assert dispatcher_mock.publish_event.call_args[0][3] == [receiver]
+  assert checkpoint_repo_mock.save_position.call_args_list == [
+    call('subscription:test', 12), call('subscription:test', 15)
+  ]
+
+
+def _get_checkpoint_repo_mock(position):
+  checkpoint_repo_mock = MagicMock(spec=checkpoint_repository)
+  checkpoint_repo_mock.get_position = MagicMock(return_value=position)
+  checkpoint_repo_mock.save_position = MagicMock(side_effect=lambda name, position: MagicMock(position=position))
+  return checkpoint_repo_mock
+
+
+def test_subscription_stops_at_a_failing_event():
+  subscriptions._receivers['test'] = [MagicMock()]
+
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_last_position = MagicMock(return_value=15)
+  event_repo_mock.get_event_records = MagicMock(return_value=[
+    EventRecord(11, 'abc', 'test', 0, 'event', {}),
+    EventRecord(12, 'abc', 'test', 1, 'event', {}),
+    EventRecord(14, 'def', 'test', 0, 'event', {}),
+  ])
+  checkpoint_repo_mock = _get_checkpoint_repo_mock(10)
+  dispatcher_mock = MagicMock(spec=dispatcher)
+  dispatcher_mock.publish_event = MagicMock(side_effect=[None, Exception(), None])
+
+  try:
+    with pytest.raises(Exception):
+      subscriptions.catch_up('test', 10, event_repo_mock, MagicMock(spec=event_service), dispatcher_mock,
+                             MagicMock(spec=event_registry), checkpoint_repo_mock)
+  finally:
+    del subscriptions._receivers['test']
+
+  # the failing event is the first one sent on the next catch up
+  assert dispatcher_mock.publish_event.call_count == 2
+  checkpoint_repo_mock.save_position.assert_called_once_with('subscription:test', 11)
+
+
+def test_subscription_that_has_not_started_starts_from_the_last_event():
+  subscriptions._receivers['test'] = [MagicMock()]
+
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_last_position = MagicMock(return_value=15)
+  checkpoint_repo_mock = _get_checkpoint_repo_mock(None)
+
+  try:
+    count = subscriptions.catch_up('test', 10, event_repo_mock, MagicMock(spec=event_service),
+                                   MagicMock(spec=dispatcher), MagicMock(spec=event_registry), checkpoint_repo_mock)
+  finally:
+    del subscriptions._receivers['test']
+
+  assert count == 0
+  assert not event_repo_mock.get_event_records.called
+  assert checkpoint_repo_mock.save_position.call_args_list == [
+    call('subscription:test', 15), call('subscription-start:test', 15)
+  ]
+
+
+def test_reset_starts_a_subscription_that_has_not_started():
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_last_position = MagicMock(return_value=15)
+  checkpoint_repo_mock = _get_checkpoint_repo_mock(None)
+
+  subscriptions.reset('test', event_repo_mock, checkpoint_repo_mock)
+
+  # the next catch up rebuilds it from the first event instead of skipping to the last one
+  assert checkpoint_repo_mock.save_position.call_args_list == [
+    call('subscription:test', 0), call('subscription-start:test', 15)
+  ]
+
+
+@override_settings(EVENT_SUBSCRIPTIONS_ENABLED=True, EVENT_SUBSCRIPTIONS={'test': []})
+def test_live_dispatch_leaves_out_the_receivers_of_a_started_subscription():
+  receiver = MagicMock()
+  subscriptions._receivers['test'] = [receiver]
+  subscriptions._start_positions['test'] = 10
+
+  try:
+    assert subscriptions.get_live_excluded_receivers(10, MagicMock(spec=checkpoint_repository)) == []
+    assert subscriptions.get_live_excluded_receivers(11, MagicMock(spec=checkpoint_repository)) == [receiver]
+  finally:
+    del subscriptions._receivers['test']
+    del subscriptions._start_positions['test']
+
+
+@override_settings(EVENT_SUBSCRIPTIONS_ENABLED=True, EVENT_SUBSCRIPTIONS={'test': []})
+def test_live_dispatch_feeds_the_receivers_of_a_subscription_that_has_not_started():
+  subscriptions._receivers['test'] = [MagicMock()]
+  checkpoint_repo_mock = _get_checkpoint_repo_mock(None)
+
+  try:
+    assert subscriptions.get_live_excluded_receivers(11, checkpoint_repo_mock) == []
+    assert subscriptions.get_live_excluded_receivers(12, checkpoint_repo_mock) == []
+  finally:
+    del subscriptions._receivers['test']
+    subscriptions._start_positions_checked.pop('test', None)
+
+  # it's looked up again after the poll interval, not for every event
+  checkpoint_repo_mock.get_position.assert_called_once_with('subscription-start:test', None)
@@ -0,0 +1,126 @@
+import datetime
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from pytz import UTC
+
+from src.libs.common_domain import event_registry, event_repository, event_service, payload_codec, upcast_persister
+from src.libs.common_domain import payload_reencoder, upcaster_registry
+from src.libs.common_domain.domain_event import DomainEvent
+from src.libs.common_domain.event_repository import EventRecord
+from src.libs.common_domain.event_signal import EventSignal
+from src.libs.common_domain.tests.event_test_obj import DummyScheduled1
+
+SCHEDULED_0 = 'src.libs.common_domain.tests.event_test_obj.DummyScheduled0'
+SCHEDULED_1 = event_registry.get_event_name(DummyScheduled1)
+
+
+class DummyRescheduled2(DomainEvent):
+  event_func_name = 'rescheduled_2'
+  event_signal = EventSignal()
+
+  fields = ('name', 'due_date')
+
+
+@pytest.fixture(autouse=True)
+def upcasters(monkeypatch):
+  monkeypatch.setattr(upcaster_registry, '_upcasters', {})
+  monkeypatch.setattr(upcaster_registry, '_chains', {})
+
+  # a version 0 whose class is gone, the name was a title
+  @upcaster_registry.upcaster(SCHEDULED_0, SCHEDULED_1)
+  def upcast_scheduled_0(data):
+    assert isinstance(data['due_date'], datetime.datetime)
+    return {'name': data['title'], 'due_date': data['due_date']}
+
+
+def test_upcaster_registry_caches_chains_through_every_version():
+  upcaster_registry.register('events.Dummy1', SCHEDULED_0, lambda d: dict(d, due_date=d.pop('due_day_date')))
+
+  chain = upcaster_registry.get_chain('events.Dummy1')
+
+  assert chain.event_name == SCHEDULED_1
+  assert len(chain.upcasters) == 2
+  assert upcaster_registry.get_chain('events.Dummy1') is chain
+  assert upcaster_registry.get_chain(SCHEDULED_1) is None
+
+  due_date = datetime.datetime(2015, 9, 1, 10, 30)
+  assert upcaster_registry.upcast('events.Dummy1', {'title': 'hello', 'due_day_date': due_date}) == (
+    SCHEDULED_1, {'name': 'hello', 'due_date': due_date}
+  )
+
+
+def test_upcaster_registry_rejects_loops():
+  upcaster_registry.register(SCHEDULED_1, SCHEDULED_0, lambda d: d)
+
+  with pytest.raises(ValueError):
+    upcaster_registry.get_chain(SCHEDULED_0)
+
+  with pytest.raises(ValueError):
+    upcaster_registry.register(SCHEDULED_0, SCHEDULED_1, lambda d: d)
+
+
+def test_event_service_loads_upcast_events():
+  due_date = datetime.datetime(2015, 9, 1, 10, 30, tzinfo=UTC)
+
+  payloads = [
+    payload_codec.encode({'title': 'hello', 'due_date': due_date}),
+    # legacy dates are parsed before the upcaster gets them
+    {'title': 'hello', 'due_date': '2015-09-01T10:30:00Z'},
+  ]
+
+  for payload in payloads:
+    payload = payload_codec.loads(json.dumps(payload))
+    event = event_service.load_domain_event_from_event_record(EventRecord(1, 'abc', 'Dummy', 0, SCHEDULED_0, payload))
+
+    assert event.__class__ == DummyScheduled1
+    assert (event.name, event.due_date) == ('hello', due_date)
+
+
+def test_event_registry_reads_the_events_upcast_to_the_receivers_events():
+  receiver = MagicMock()
+  DummyScheduled1.event_signal.connect(receiver)
+
+  try:
+    event_registry.register(DummyScheduled1)
+    assert event_registry.get_event_names_for_receivers([receiver]) == [SCHEDULED_1, SCHEDULED_0]
+  finally:
+    DummyScheduled1.event_signal.disconnect(receiver)
+
+
+def test_upcast_persister_rewrites_upcast_events_in_batches():
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_event_records = MagicMock(return_value=[
+    EventRecord(i, 'abc', 'Dummy', i, SCHEDULED_0, {}) for i in range(1, 6)
+  ])
+  event_service_mock = MagicMock(spec=event_service)
+
+  count = upcast_persister.persist_upcast_events(2, event_repo_mock, event_service_mock)
+
+  assert count == 5
+  event_repo_mock.get_event_records.assert_called_once_with(batch_size=2, event_names=[SCHEDULED_0])
+  assert [[p for p, _ in c[0][0]] for c in event_repo_mock.save_upcast_events.call_args_list] == [[1, 2], [3, 4], [5]]
+
+
+def test_payload_reencoder_writes_upcast_events_with_their_name(settings):
+  settings.EVENT_PAYLOAD_COMPRESS_MIN_BYTES = 256
+  rescheduled_2 = event_registry.get_event_name(DummyRescheduled2)
+  upcaster_registry.register('events.DummyRescheduled1', rescheduled_2, lambda d: d)
+
+  due_date = datetime.datetime(2015, 9, 1, 10, 30, tzinfo=UTC)
+  payload = payload_codec.loads(json.dumps(payload_codec.encode({'name': 'hello', 'due_date': due_date})))
+  event_repo_mock = MagicMock(spec=event_repository)
+  event_repo_mock.get_json_payload_batches = MagicMock(return_value=[
+    [(EventRecord(1, 'abc', 'Dummy', 0, 'events.DummyRescheduled1', payload), 100)],
+  ])
+
+  report = payload_reencoder.reencode_payloads(10, _event_repository=event_repo_mock)
+
+  assert report['events'] == 1
+  [[(position, event_name, event_data_bin)]], _ = event_repo_mock.save_binary_payloads.call_args
+
+  # the row is read back with the class its payload was encoded with
+  assert (position, event_name) == (1, rescheduled_2)
+  data, _ = payload_codec.decode(payload_codec.decode_binary(DummyRescheduled2, event_data_bin))
+  assert data == {'name': 'hello', 'due_date': due_date}
@@ -0,0 +1,52 @@
+import logging
+
+from src.libs.common_domain import event_repository, event_service, upcaster_registry
+from src.libs.common_domain.enqueue_buffer import job
+
+logger = logging.getLogger(__name__)
+
+
+@job('default', timeout=3600)
+def persist_upcast_events_task(batch_size=1000):
+  # the rows rewritten until a timeout are kept, enqueue it again to carry on
+  count = persist_upcast_events(batch_size)
+  logger.info("Persisted %i upcast events", count)
+
+
+def persist_upcast_events(batch_size=1000, _event_repository=None, _event_service=None, _upcaster_registry=None):
+  """
+  Rewrites the rows of the events that are upcast as the events they're upcast to, so they're no longer upcast every
+  time they're loaded. Returns the number of events rewritten.
+
+  Rows are read in position order and rewritten a batch per transaction, it can be stopped and run again at any time.
+  A row is loaded the same way before and after it's rewritten so nothing reading the events has to wait for it.
+  """
+  if not _event_repository:    _event_repository = event_repository
+  if not _event_service:    _event_service = event_service
+  if not _upcaster_registry:    _upcaster_registry = upcaster_registry
+
+  event_names = _upcaster_registry.get_upcast_event_names()
+  if not event_names:
+    return 0
+
+  counter = 0
+  batch = []
+
+  for event in _event_repository.get_event_records(batch_size=batch_size, event_names=event_names):
+    batch.append((event.position, _event_service.load_domain_event_from_event_record(event)))
+
+    if len(batch) >= batch_size:
+      counter += _save_batch(batch, _event_repository)
+      batch = []
+
+  if batch:
+    counter += _save_batch(batch, _event_repository)
+
+  return counter
+
+
+def _save_batch(batch, _event_repository):
+  _event_repository.save_upcast_events(batch)
+  logger.debug("Persisted %i upcast events, up to position: %i", len(batch), batch[-1][0])
+
+  return len(batch)
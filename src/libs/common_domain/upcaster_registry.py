@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+_upcasters = {}
+_chains = {}
+
+# the upcasters an event's payload goes through, in order, and the name of the event it ends up as
+UpcastChain = namedtuple('UpcastChain', ['event_name', 'upcasters'])
+
+
+def upcaster(event_name, upcast_event_name):
+  """
+  Registers the decorated function as the upcaster of an event: it takes the data of an `event_name` and returns the
+  data of an `upcast_event_name`, ie: `...events.AgreementCreated1` to `...events.AgreementCreated2`. Events are
+  upcast as they're loaded, the rows keep their event until `upcast_persister` rewrites them.
+
+  The data's dates are always parsed, whichever payload it was read from. Upcasters are registered in the `upcasters`
+  module of an app. An event's class can be removed once its rows are rewritten, binary payloads are only read with it.
+  """
+
+  def decorator(func):
+    register(event_name, upcast_event_name, func)
+    return func
+
+  return decorator
+
+
+def register(event_name, upcast_event_name, func):
+  if event_name in _upcasters:
+    raise ValueError('An upcaster is already registered for: {0}'.format(event_name))
+
+  _upcasters[event_name] = (upcast_event_name, func)
+  _chains.clear()
+
+
+def get_chain(event_name):
+  # None when the event isn't upcast. chains are resolved the first time an event is loaded.
+  try:
+    return _chains[event_name]
+  except KeyError:
+    pass
+
+  chain = _chains[event_name] = _resolve_chain(event_name)
+
+  return chain
+
+
+def upcast(event_name, event_data):
+  """
+  Returns the name and data of the event that an event is upcast to, or the event as-is.
+  """
+  chain = get_chain(event_name)
+
+  if chain is None:
+    return event_name, event_data
+
+  for func in chain.upcasters:
+    event_data = func(event_data)
+
+  return chain.event_name, event_data
+
+
+def get_upcast_event_names():
+  # the events that are never loaded as themselves
+  return sorted(_upcasters)
+
+
+def get_source_event_names(event_names):
+  # the events that end up as any of the given events once they're upcast
+  event_names = set(event_names)
+  return sorted(n for n in _upcasters if get_chain(n).event_name in event_names)
+
+
+def _resolve_chain(event_name):
+  upcasters = []
+  seen = [event_name]
+
+  while event_name in _upcasters:
+    event_name, func = _upcasters[event_name]
+    upcasters.append(func)
+
+    if event_name in seen:
+      raise ValueError('The upcasters of {0} loop: {1}'.format(seen[0], ' -> '.join(seen + [event_name])))
+
+    seen.append(event_name)
+
+  if not upcasters:
+    return None
+
+  return UpcastChain(event_name, tuple(upcasters))
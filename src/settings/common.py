@@ -51,6 +51,9 @@ ROOT_URLCONF = '%s.urls' % SITE_NAME
 
 ########## AUTH CONFIGURATION
 AUTH_USER_MODEL = 'user.AuthUser'
+
+# The ids of the users allowed to call the internal endpoints, refer to `api.permissions.IsInternalUser`.
+INTERNAL_USER_IDS = []
 ########## END AUTH CONFIGURATION
 
 ########## CORS CONFIGURATION
@@ -183,6 +186,114 @@ RQ_QUEUES = {
 }
 ########## END REDIS QUEUE CONFIGURATION
 
+########## EVENT STORE CONFIGURATION
+# Write event payloads with `common_domain.payload_codec`, which keeps the type of dates. Payloads written either way
+# are read. Enable it once no process running the code from before the codec is left, it can't read them.
+EVENT_PAYLOAD_CODEC_ENABLED = False
+
+# Where new event payloads are written: 'json', or 'binary' for the compact, optionally compressed, encoding of
+# `payload_codec.encode_binary`. Both are read. Binary payloads can't be read by the code from before them, and only
+# events that declare their fields are written as binary. `reencode_event_payloads` converts the existing ones.
+EVENT_PAYLOAD_STORAGE = 'json'
+
+# Binary payloads at least this many bytes long are compressed with zlib.
+EVENT_PAYLOAD_COMPRESS_MIN_BYTES = 256
+
+# An aggregate snapshot is taken every time this many events have been appended to its stream. 0 disables snapshots.
+AGGREGATE_SNAPSHOT_INTERVAL = 50
+
+# Upper bound, in serialized bytes, of the per-process LRU cache of aggregates. 0 disables the cache.
+AGGREGATE_CACHE_MAX_BYTES = 1024 * 1024 * 16  # 16 MB
+
+# A second level aggregate cache, shared by all the web and rq processes, stored in the given CACHES entry.
+AGGREGATE_SHARED_CACHE_ENABLED = False
+AGGREGATE_SHARED_CACHE_ALIAS = 'default'
+AGGREGATE_SHARED_CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+
+# A per-process Bloom filter that answers `aggregate_repository.exists` without a query when the aggregate doesn't
+# exist. It's rebuilt every interval, streams created by other processes since then read as missing. refer to
+# `stream_filter`.
+AGGREGATE_EXISTENCE_FILTER_ENABLED = False
+AGGREGATE_EXISTENCE_FILTER_CAPACITY = 1000000
+AGGREGATE_EXISTENCE_FILTER_REFRESH_INTERVAL = 60 * 5  # seconds
+
+# The number of aggregates whose events `aggregate_repository.get_many` reads with a single query.
+AGGREGATE_GET_MANY_BATCH_SIZE = 500
+
+# Projections fed by the catch-up subscription workers (manage.py run_subscriptions), by name. Every subscription keeps
+# the position of the last event it processed and the worker feeds it the events appended since. With
+# EVENT_SUBSCRIPTIONS_ENABLED the workers are the only ones to feed these receivers once a subscription started,
+# refer to `subscriptions.get_live_excluded_receivers`. Without it the events are dispatched live and the workers are
+# only run to rebuild a projection (--reset).
+EVENT_SUBSCRIPTIONS_ENABLED = False
+EVENT_SUBSCRIPTIONS = {
+  'agreement_search': [
+    'src.domain.agreement.event_handlers.execute_save_agreement_search',
+  ],
+  'agreement_alert': [
+    'src.domain.agreement.event_handlers.execute_create_agreement_alerts',
+  ],
+  'agreement_renewal': [
+    'src.domain.agreement.event_handlers.execute_save_agreement_renewal',
+  ],
+  'agreement_type_lookup': [
+    'src.domain.agreement_type.event_handlers.create_agreement_type_lookup',
+  ],
+  'realtime_agreement': [
+    'src.apps.realtime.agreement.event_handlers.execute_save_agreement_edit_from_pa',
+    'src.apps.realtime.agreement.event_handlers.save_firebase_agreement',
+    'src.apps.realtime.agreement.event_handlers.agreement_alerts_callback',
+    'src.apps.realtime.agreement.event_handlers.agreement_delete_callback',
+    'src.apps.realtime.agreement.event_handlers.artifact_delete_callback',
+    'src.apps.realtime.agreement.event_handlers.artifact_create_callback',
+  ],
+  'realtime_agreement_type': [
+    'src.apps.realtime.agreement_type.event_handlers.execute_user_created_1',
+    'src.apps.realtime.agreement_type.event_handlers.agreement_type_created_callback',
+  ],
+  'realtime_counterparty': [
+    'src.apps.realtime.counterparty.event_handlers.execute_pa_created_1',
+  ],
+  'realtime_smart_view': [
+    'src.apps.realtime.smart_view.event_handlers.smart_view_created_callback',
+  ],
+  'realtime_user': [
+    'src.apps.realtime.user.event_handlers.execute_user_created_1',
+    'src.apps.realtime.user.event_handlers.execute_user_subscribed_1',
+  ],
+}
+EVENT_SUBSCRIPTION_BATCH_SIZE = 500
+EVENT_SUBSCRIPTION_POLL_INTERVAL = 5  # seconds
+
+# When enabled, appended events are written to an outbox in the same transaction and published by the outbox relay
+# (manage.py relay_outbox) instead of synchronously on the request.
+EVENT_OUTBOX_ENABLED = False
+EVENT_OUTBOX_BATCH_SIZE = 500
+EVENT_OUTBOX_POLL_INTERVAL = 1  # seconds
+# An event that fails to publish this many times is moved aside until `relay_outbox --retry-failed`.
+EVENT_OUTBOX_MAX_ATTEMPTS = 10
+
+# When enabled, the outbox relay enqueues a job per chunk of events that runs all of their handlers, and the jobs they
+# create, in the same work-horse instead of one job per handler task.
+EVENT_PROJECTION_RUNNER_ENABLED = False
+EVENT_PROJECTION_RUNNER_CHUNK_SIZE = 50
+########## END EVENT STORE CONFIGURATION
+
+########## AGREEMENT ALERT CONFIGURATION
+# The number of due agreements claimed, checked and saved together in a single transaction by an alert worker.
+AGREEMENT_ALERT_BATCH_SIZE = 200
+AGREEMENT_ALERT_MAX_WORKERS = 8
+
+# The defaults of the alert load forecast, refer to `agreement.alert_forecast`.
+AGREEMENT_ALERT_FORECAST_DAYS = 14
+AGREEMENT_ALERT_FORECAST_RESOLUTION = 'hour'
+########## END AGREEMENT ALERT CONFIGURATION
+
+########## AGREEMENT RENEWAL CONFIGURATION
+# The number of expired agreements renewed and saved together in a single transaction by `renew_agreements_task`.
+AGREEMENT_RENEWAL_BATCH_SIZE = 500
+########## END AGREEMENT RENEWAL CONFIGURATION
+
 ########## EMAIL CONFIGURATION
 DEV_EMAIL_ADDRESS = 'dev@startwillow.com'
 ########## END EMAIL CONFIGURATION
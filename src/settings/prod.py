@@ -81,6 +81,7 @@ SECRET_KEY = os.environ['SECRET_KEY']
 JWT_SECRET = os.environ['JWT_SECRET']
 JWT_SECRET = base64decode(JWT_SECRET)
 JWT_AUDIENCE = os.environ['JWT_AUDIENCE']
+INTERNAL_USER_IDS = [i for i in os.environ.get('INTERNAL_USER_IDS', '').split(',') if i]
 ########## END AUTH CONFIGURATION
 
 ########## DRF CONFIGURATION
@@ -100,6 +101,12 @@ AWS_SECRET_ACCESS_KEY = os.environ['AWS_SECRET_ACCESS_KEY']
 AWS_STORAGE_BUCKET_NAME = os.environ['AWS_STORAGE_BUCKET_NAME']
 ########## END AWS CONFIGURATION
 
+########## EVENT STORE CONFIGURATION
+EVENT_OUTBOX_ENABLED = True
+EVENT_PROJECTION_RUNNER_ENABLED = True
+EVENT_SUBSCRIPTIONS_ENABLED = True
+########## END EVENT STORE CONFIGURATION
+
 ########## PAYMENT CONFIGURATION
 STRIPE_SECRET_KEY = os.environ['STRIPE_SECRET_KEY']
 ########## END PAYMENT CONFIGURATION